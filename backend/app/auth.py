@@ -1,21 +1,27 @@
 """
 JWT 인증 + 비밀번호 해시 유틸리티
 """
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import Optional
-import os, hashlib, secrets
+import os, hashlib, secrets, time
 from jose import JWTError, jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from .database import get_db
+from .events import event_broker
 from .models import User
 
 SECRET_KEY  = os.environ.get("SECRET_KEY", "songwork-secret-key-2025-change-in-production")
 ALGORITHM   = "HS256"
 TOKEN_EXPIRE_HOURS = 24 * 7  # 7일
 
+# 인증된 사용자 캐시: 요청마다 users 조회를 하지 않도록 (수정/삭제/비밀번호 변경 시 모든 워커에서 즉시 무효화)
+USER_CACHE_TTL_SECONDS = float(os.environ.get("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_MAX_SIZE    = int(os.environ.get("USER_CACHE_MAX_SIZE", "1024"))
+
 bearer = HTTPBearer(auto_error=False)
 
 _SALT = "sw_salt_2025"
@@ -42,16 +48,115 @@ def decode_token(token: str) -> dict:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
 
+# ── 사용자 캐시 ─────────────────────────────────────
+class UserCache:
+    """
+    user_id → 세션에서 분리(expunge)한 User. TTL 이 지나면 다시 조회하고,
+    최대 크기를 넘으면 가장 오래 안 쓴 항목부터 제거 (LRU).
+    다른 워커/인스턴스의 변경은 이벤트 브로커 (pg_notify) 로 받아 바로 지우고,
+    LISTEN 연결이 끊겨 있을 때만 TTL 안에 반영된다.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size    = max_size
+        self._items: OrderedDict[str, tuple[float, User]] = OrderedDict()
+        self.generation = 0        # 무효화할 때마다 증가 → 조회 도중 무효화된 결과는 넣지 않음
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+
+    def get(self, user_id: str) -> User | None:
+        item = self._items.get(user_id)
+        if item is None or item[0] < time.monotonic():
+            if item is not None:
+                del self._items[user_id]
+            self.misses += 1
+            return None
+        self._items.move_to_end(user_id)
+        self.hits += 1
+        return item[1]
+
+    def put(self, user: User, generation: int) -> None:
+        if self.ttl_seconds <= 0 or generation != self.generation:
+            return
+        self._items[user.id] = (time.monotonic() + self.ttl_seconds, user)
+        self._items.move_to_end(user.id)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id: str) -> None:
+        self.generation += 1
+        self._items.pop(user_id, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._items.clear()
+
+    def on_events(self, events: list[dict]) -> None:
+        """이벤트 브로커 리스너: 어느 워커에서든 사용자가 바뀌면 / 데이터를 통째로 가져오면 무효화"""
+        for e in events:
+            if e["entity"] == "users":
+                self.invalidate(e["id"])
+            elif e["op"] == "reload":
+                self.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size"       : len(self._items),
+            "max_size"   : self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits"       : self.hits,
+            "misses"     : self.misses,
+            "evictions"  : self.evictions,
+            "hit_rate"   : round(self.hits / total, 3) if total else None,
+        }
+
+
+user_cache = UserCache(USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_SIZE)
+event_broker.listen(user_cache.on_events)
+
+
+def invalidate_user(user_id: str) -> None:
+    """사용자 정보가 바뀌었을 때 호출 (커밋 후). 이 워커는 바로, 다른 워커는 users 변경 이벤트로"""
+    user_cache.invalidate(user_id)
+
+
 async def get_current_user(
     creds: Optional[HTTPAuthorizationCredentials] = Depends(bearer),
     db   : AsyncSession = Depends(get_db),
 ) -> User:
     if not creds:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    payload = decode_token(creds.credentials)
+    return await _user_from_token(creds.credentials, db)
+
+
+async def get_stream_user(
+    token: Optional[str] = Query(None, description="EventSource 처럼 헤더를 못 보내는 클라이언트용"),
+    creds: Optional[HTTPAuthorizationCredentials] = Depends(bearer),
+    db   : AsyncSession = Depends(get_db),
+) -> User:
+    """Authorization 헤더 또는 ?token= 쿼리로 인증 (SSE 스트림 전용)"""
+    if creds:
+        return await _user_from_token(creds.credentials, db)
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return await _user_from_token(token, db)
+
+
+async def _user_from_token(token: str, db: AsyncSession) -> User:
+    payload = decode_token(token)
     user_id = payload.get("sub")
-    result  = await db.execute(select(User).where(User.id == user_id))
-    user    = result.scalar_one_or_none()
+    user    = user_cache.get(user_id) if user_id else None
+    if user is None:
+        generation = user_cache.generation
+        result = await db.execute(select(User).where(User.id == user_id))
+        user   = result.scalar_one_or_none()
+        if user is not None:
+            db.expunge(user)          # 여러 요청이 공유하므로 세션에서 분리
+            user_cache.put(user, generation)
     if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="User not found or inactive")
     return user
@@ -2,16 +2,30 @@
 데이터 영속성 관리 모듈
 - PostgreSQL(Supabase) 사용 시: DB 자체가 영구 저장 → backup.json은 비상용
 - SQLite 사용 시: backup.json으로 재배포 대비 (로컬/임시 환경)
+
+백업 구조
+- backup.json          : 기준 스냅샷 (journal_seq 까지 반영된 전체 데이터)
+- backup.journal.jsonl : 스냅샷 이후의 변경 기록 (한 줄 = insert/update/delete 1건)
+  → 평소에는 변경분만 journal 에 추가, 일정 개수가 쌓이면 새 스냅샷으로 합침(compaction)
 """
+import asyncio
 import json
 import os
 import logging
+import tempfile
+import time
+import enum
 from datetime import datetime
 from pathlib import Path
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, delete
 
-from .models import User, Department, Task, Report, UserRole, TaskStatus, TaskPriority
+from . import changes
+from .database import AsyncSessionLocal
+from .importer import import_payload, upsert_rows, MODELS
+from .search import unindex
+from .task_links import unlink
+from .tombstones import record_sync_reset
 
 logger = logging.getLogger(__name__)
 
@@ -22,210 +36,343 @@ def _get_backup_path() -> Path:
     code_data_dir.mkdir(parents=True, exist_ok=True)
     return code_data_dir / "backup.json"
 
-BACKUP_PATH = _get_backup_path()
+BACKUP_PATH  = _get_backup_path()
+JOURNAL_PATH = BACKUP_PATH.with_name("backup.journal.jsonl")
 
 
-def _dt(s):
-    """문자열 → datetime 안전 변환"""
-    if not s:
-        return None
+def _serialize(row) -> dict:
+    """컬럼 값 → JSON 직렬화 가능한 dict (datetime → ISO 문자열, Enum → 값)"""
+    out = {}
+    for k, v in row.items():
+        if isinstance(v, datetime):
+            v = v.isoformat()
+        elif isinstance(v, enum.Enum):
+            v = v.value
+        out[k] = v
+    return out
+
+
+async def _collect_payload(db: AsyncSession) -> dict:
+    """현재 DB 전체를 백업용 dict로 변환 (ORM 객체 생성 없이 컬럼 값만 조회)"""
+    payload = {"saved_at": datetime.utcnow().isoformat()}
+    for key in ("users", "departments", "tasks", "reports"):
+        table = MODELS[key].__table__
+        result = await db.execute(select(table).order_by(table.c.created_at))
+        payload[key] = [_serialize(r) for r in result.mappings()]
+    return payload
+
+
+def _atomic_write(path: Path, write) -> None:
+    """임시 파일에 먼저 쓴 뒤 rename → 쓰는 도중 죽어도 기존 파일은 온전히 남음"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}-", suffix=".tmp")
     try:
-        return datetime.fromisoformat(s.replace("Z", "+00:00").replace("+00:00", ""))
-    except Exception:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_base(payload: dict) -> None:
+    """새 기준 스냅샷 저장 후 journal 비우기 (워커 스레드에서 실행)"""
+    _atomic_write(BACKUP_PATH,
+                  lambda f: json.dump(payload, f, ensure_ascii=False, indent=2))
+    # 스냅샷에 journal_seq 가 기록되므로 여기서 죽어도 남은 journal 은 복원 시 건너뜀
+    _atomic_write(JOURNAL_PATH, lambda f: None)
+
+
+def _append_journal(records: list[dict]) -> None:
+    """journal 파일 끝에 변경 기록 추가 (워커 스레드에서 실행)"""
+    lines = "".join(
+        json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records
+    )
+    with open(JOURNAL_PATH, "a", encoding="utf-8") as f:
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _read_base() -> dict | None:
+    if not BACKUP_PATH.exists():
         return None
+    with open(BACKUP_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _read_journal() -> list[dict]:
+    """journal 전체 읽기 (쓰다 만 마지막 줄은 무시)"""
+    if not JOURNAL_PATH.exists():
+        return []
+    records = []
+    with open(JOURNAL_PATH, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning("⚠️ journal 의 손상된 줄을 건너뜀")
+    return records
 
 
 async def save_backup(db: AsyncSession) -> bool:
-    """현재 DB 전체를 JSON 파일로 저장"""
-    try:
-        users_r = await db.execute(select(User).order_by(User.created_at))
-        depts_r = await db.execute(select(Department).order_by(Department.created_at))
-        tasks_r = await db.execute(select(Task).order_by(Task.created_at))
-        reports_r = await db.execute(select(Report).order_by(Report.created_at))
-
-        def u2d(u: User):
-            return {
-                "id": u.id, "username": u.username, "password": u.password,
-                "display_name": u.display_name, "role": u.role.value,
-                "dept_id": u.dept_id, "is_active": u.is_active,
-                "created_at": u.created_at.isoformat() if u.created_at else None,
-            }
-
-        def d2d(d: Department):
-            return {
-                "id": d.id, "name": d.name, "emoji": d.emoji,
-                "description": d.description, "manager_name": d.manager_name,
-                "created_at": d.created_at.isoformat() if d.created_at else None,
-            }
-
-        def t2d(t: Task):
-            return {
-                "id": t.id, "title": t.title, "description": t.description,
-                "dept_id": t.dept_id, "department_ids": t.department_ids,
-                "status": t.status.value, "priority": t.priority.value,
-                "assignee_name": t.assignee_name, "assignee_ids": t.assignee_ids,
-                "start_date": t.start_date.isoformat() if t.start_date else None,
-                "due_date": t.due_date.isoformat() if t.due_date else None,
-                "is_hidden": t.is_hidden,
-                "hidden_at": t.hidden_at.isoformat() if t.hidden_at else None,
-                "created_at": t.created_at.isoformat() if t.created_at else None,
-                "updated_at": t.updated_at.isoformat() if t.updated_at else None,
-            }
-
-        def r2d(r: Report):
-            return {
-                "id": r.id, "task_id": r.task_id, "content": r.content,
-                "reporter_name": r.reporter_name,
-                "created_at": r.created_at.isoformat() if r.created_at else None,
-                "updated_at": r.updated_at.isoformat() if r.updated_at else None,
-            }
-
-        payload = {
-            "saved_at": datetime.utcnow().isoformat(),
-            "users": [u2d(u) for u in users_r.scalars()],
-            "departments": [d2d(d) for d in depts_r.scalars()],
-            "tasks": [t2d(t) for t in tasks_r.scalars()],
-            "reports": [r2d(r) for r in reports_r.scalars()],
+    """현재 DB 전체를 기준 스냅샷으로 즉시 저장 (journal 은 비워짐)"""
+    return await backup_service.compact(db)
+
+
+# ── 백그라운드 백업 서비스 ─────────────────────────────
+class BackupService:
+    """
+    커밋된 변경은 changes 리스너를 통해 메모리 버퍼에 쌓이고,
+    debounce 창(BACKUP_DEBOUNCE_SECONDS) 동안 모인 변경을 journal 에 한 번에 추가한다.
+    journal 이 BACKUP_COMPACT_EVERY 건을 넘거나 mark_dirty() 로 전체 저장이
+    요청되면 새 기준 스냅샷으로 합친다.
+    """
+
+    def __init__(self, debounce_seconds: float, compact_every: int):
+        self.debounce_seconds = debounce_seconds
+        self.compact_every    = compact_every
+        self._event: asyncio.Event | None = None
+        self._task : asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self._buffer: list[dict] = []              # 아직 journal 에 안 쓴 변경
+        self._full_requested = False               # 다음 저장은 전체 스냅샷
+        self._dirty_since: float | None = None     # 저장 안 된 첫 변경 시각 (monotonic)
+        self._seq = 0                              # 마지막으로 기록한 journal 번호
+        self._journal_records = 0                  # 현재 journal 파일의 기록 수
+        self.last_success_at   : datetime | None = None
+        self.last_compaction_at: datetime | None = None
+        self.last_error        : str | None = None
+        self.last_duration_ms  : float | None = None
+        self.snapshots_written = 0
+        self.journal_appends   = 0
+
+    # ── 변경 신호 ──────────────────────────────────
+    def _signal(self) -> None:
+        if self._dirty_since is None:
+            self._dirty_since = time.monotonic()
+        if self._event is not None:
+            self._event.set()
+
+    def on_changes(self, batch: list["changes.Change"]) -> None:
+        """커밋된 변경을 journal 버퍼에 추가 (changes 리스너)"""
+        now = datetime.utcnow().isoformat()
+        added = False
+        for c in batch:
+            if c.entity not in MODELS:
+                continue
+            self._buffer.append({
+                "ts"    : now,
+                "op"    : "delete" if c.op == "delete" else "upsert",
+                "entity": c.entity,
+                "id"    : c.id,
+                "data"  : None if c.op == "delete" else _serialize(c.row),
+            })
+            added = True
+        if added:
+            self._signal()
+
+    def mark_dirty(self) -> None:
+        """행 단위로 기록할 수 없는 변경 (일괄 가져오기 등) → 다음 저장은 전체 스냅샷"""
+        self._full_requested = True
+        self._signal()
+
+    @property
+    def pending(self) -> bool:
+        return self._dirty_since is not None
+
+    def status(self) -> dict:
+        lag = time.monotonic() - self._dirty_since if self._dirty_since else 0.0
+        return {
+            "running"           : self._task is not None and not self._task.done(),
+            "pending"           : self.pending,
+            "pending_changes"   : len(self._buffer),
+            "full_requested"    : self._full_requested,
+            "lag_seconds"       : round(lag, 3),
+            "debounce_seconds"  : self.debounce_seconds,
+            "journal_seq"       : self._seq,
+            "journal_records"   : self._journal_records,
+            "compact_every"     : self.compact_every,
+            "last_success_at"   : self.last_success_at.isoformat() if self.last_success_at else None,
+            "last_compaction_at": self.last_compaction_at.isoformat() if self.last_compaction_at else None,
+            "last_error"        : self.last_error,
+            "last_duration_ms"  : self.last_duration_ms,
+            "snapshots_written" : self.snapshots_written,
+            "journal_appends"   : self.journal_appends,
         }
 
-        with open(BACKUP_PATH, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+    # ── 수명 주기 ──────────────────────────────────
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        base    = await asyncio.to_thread(_read_base)
+        journal = await asyncio.to_thread(_read_journal)
+        base_seq = (base or {}).get("journal_seq", 0)
+        self._seq = max([base_seq] + [r.get("seq", 0) for r in journal])
+        self._journal_records = sum(1 for r in journal if r.get("seq", 0) > base_seq)
+        if base is None:
+            self._full_requested = True   # 기준 스냅샷이 없으면 먼저 하나 만든다
+        self._event = asyncio.Event()
+        if self.pending or self._full_requested:
+            self._signal()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """루프 종료 + 남은 변경을 journal 에 기록 (전체 스냅샷은 만들지 않음)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.pending:
+            await self.flush()
+
+    # ── 저장 ───────────────────────────────────────
+    async def flush(self) -> bool:
+        """대기 중인 변경 저장 (journal 추가 또는 필요 시 compaction)"""
+        async with self._lock:
+            if (self._full_requested or
+                    self._journal_records + len(self._buffer) >= self.compact_every):
+                return await self._compact_locked()
+            return await self._append_locked()
+
+    async def compact(self, db: AsyncSession | None = None) -> bool:
+        """journal 을 새 기준 스냅샷으로 합침"""
+        async with self._lock:
+            return await self._compact_locked(db)
 
+    async def _append_locked(self) -> bool:
+        records, self._buffer = self._buffer, []
+        self._dirty_since = None
+        if not records:
+            return True
+        started = time.monotonic()
+        seq = self._seq
+        for r in records:
+            seq += 1
+            r["seq"] = seq
+        try:
+            await asyncio.to_thread(_append_journal, records)
+        except Exception as e:
+            logger.error(f"❌ journal 기록 실패: {e}")
+            self.last_error = str(e)
+            for r in records:
+                r.pop("seq", None)
+            self._buffer = records + self._buffer
+            self._signal()
+            return False
+        self._seq = seq
+        self._journal_records += len(records)
+        self.journal_appends += 1
+        self.last_success_at  = datetime.utcnow()
+        self.last_error       = None
+        self.last_duration_ms = round((time.monotonic() - started) * 1000, 1)
+        return True
+
+    async def _compact_locked(self, db: AsyncSession | None = None) -> bool:
+        # 버퍼의 변경은 이미 커밋됨 → 지금 읽는 스냅샷에 포함되므로 버림
+        dropped, self._buffer = self._buffer, []
+        self._full_requested = False
+        self._dirty_since = None
+        started = time.monotonic()
+        try:
+            if db is None:
+                async with AsyncSessionLocal() as own_db:
+                    payload = await _collect_payload(own_db)
+            else:
+                payload = await _collect_payload(db)
+            payload["journal_seq"] = self._seq
+            await asyncio.to_thread(_write_base, payload)
+        except Exception as e:
+            logger.error(f"❌ 백업 저장 실패: {e}")
+            self.last_error = str(e)
+            self._buffer = dropped + self._buffer
+            self._full_requested = True
+            self._signal()
+            return False
+
+        self._journal_records = 0
+        self.snapshots_written += 1
+        self.last_success_at = self.last_compaction_at = datetime.utcnow()
+        self.last_error = None
+        self.last_duration_ms = round((time.monotonic() - started) * 1000, 1)
         logger.info(f"✅ 백업 저장 완료: {BACKUP_PATH} "
                     f"(사용자:{len(payload['users'])}, "
                     f"부서:{len(payload['departments'])}, "
-                    f"업무:{len(payload['tasks'])})")
+                    f"업무:{len(payload['tasks'])}, journal_seq:{self._seq})")
         return True
 
-    except Exception as e:
-        logger.error(f"❌ 백업 저장 실패: {e}")
-        return False
+    async def _run(self) -> None:
+        while True:
+            await self._event.wait()
+            # debounce 창 동안 들어오는 변경을 모음
+            await asyncio.sleep(self.debounce_seconds)
+            self._event.clear()
+            if not self.pending:
+                continue
+            if not await self.flush():
+                await asyncio.sleep(self.debounce_seconds)   # 실패 시 잠시 후 재시도
+
+
+backup_service = BackupService(
+    debounce_seconds=float(os.environ.get("BACKUP_DEBOUNCE_SECONDS", "5")),
+    compact_every=int(os.environ.get("BACKUP_COMPACT_EVERY", "500")),
+)
+changes.subscribe(backup_service.on_changes)
 
 
+# ── 복원 ───────────────────────────────────────────────
 async def restore_from_backup(db: AsyncSession) -> bool:
     """
-    백업 파일이 있으면 DB에 복원 (upsert 방식 - 기존 데이터 덮어쓰기)
+    기준 스냅샷을 DB에 복원한 뒤 (upsert 방식 - 기존 데이터 덮어쓰기)
+    스냅샷 이후의 journal 기록만 순서대로 재적용합니다.
     시드 데이터보다 우선 적용됩니다.
     """
-    if not BACKUP_PATH.exists():
-        logger.info("📂 백업 파일 없음 - 시드 데이터 사용")
-        return False
-
     try:
-        with open(BACKUP_PATH, "r", encoding="utf-8") as f:
-            payload = json.load(f)
-
-        saved_at = payload.get("saved_at", "알 수 없음")
-        logger.info(f"📥 백업 복원 시작 (저장 시각: {saved_at})")
+        payload = await asyncio.to_thread(_read_base)
+        base_seq = (payload or {}).get("journal_seq", 0)
+        journal = [r for r in await asyncio.to_thread(_read_journal)
+                   if r.get("seq", 0) > base_seq]
+        if payload is None and not journal:
+            logger.info("📂 백업 파일 없음 - 시드 데이터 사용")
+            return False
 
+        # 복원으로 생기는 변경은 다시 journal 에 기록하지 않음
+        db.info[changes.SKIP] = True
         stats = {"users": 0, "departments": 0, "tasks": 0, "reports": 0}
 
-        # 부서 복원
-        for d in payload.get("departments", []):
-            existing = await db.get(Department, d["id"])
-            if existing:
-                existing.name = d["name"]
-                existing.emoji = d.get("emoji", "📁")
-                existing.description = d.get("description", "")
-                existing.manager_name = d.get("manager_name")
-            else:
-                db.add(Department(
-                    id=d["id"], name=d["name"],
-                    emoji=d.get("emoji", "📁"),
-                    description=d.get("description", ""),
-                    manager_name=d.get("manager_name"),
-                    created_at=_dt(d.get("created_at")) or datetime.utcnow(),
-                ))
-            stats["departments"] += 1
-
-        await db.flush()
-
-        # 사용자 복원
-        for u in payload.get("users", []):
-            existing = await db.get(User, u["id"])
-            role = UserRole(u.get("role", "user"))
-            if existing:
-                existing.username = u["username"]
-                existing.password = u["password"]
-                existing.display_name = u["display_name"]
-                existing.role = role
-                existing.dept_id = u.get("dept_id")
-                existing.is_active = u.get("is_active", True)
-            else:
-                db.add(User(
-                    id=u["id"], username=u["username"],
-                    password=u["password"],
-                    display_name=u["display_name"],
-                    role=role,
-                    dept_id=u.get("dept_id"),
-                    is_active=u.get("is_active", True),
-                    created_at=_dt(u.get("created_at")) or datetime.utcnow(),
-                ))
-            stats["users"] += 1
-
-        await db.flush()
-
-        # 업무 복원
-        for t in payload.get("tasks", []):
-            existing = await db.get(Task, t["id"])
-            status = TaskStatus(t.get("status", "notStarted"))
-            priority = TaskPriority(t.get("priority", "medium"))
-            if existing:
-                existing.title = t["title"]
-                existing.description = t.get("description", "")
-                existing.dept_id = t["dept_id"]
-                existing.department_ids = t.get("department_ids")
-                existing.status = status
-                existing.priority = priority
-                existing.assignee_name = t.get("assignee_name")
-                existing.assignee_ids = t.get("assignee_ids")
-                existing.start_date = _dt(t.get("start_date"))
-                existing.due_date = _dt(t.get("due_date"))
-                existing.is_hidden = t.get("is_hidden", False)
-                existing.hidden_at = _dt(t.get("hidden_at"))
-                existing.updated_at = _dt(t.get("updated_at")) or datetime.utcnow()
-            else:
-                db.add(Task(
-                    id=t["id"], title=t["title"],
-                    description=t.get("description", ""),
-                    dept_id=t["dept_id"],
-                    department_ids=t.get("department_ids"),
-                    status=status, priority=priority,
-                    assignee_name=t.get("assignee_name"),
-                    assignee_ids=t.get("assignee_ids"),
-                    start_date=_dt(t.get("start_date")),
-                    due_date=_dt(t.get("due_date")),
-                    is_hidden=t.get("is_hidden", False),
-                    hidden_at=_dt(t.get("hidden_at")),
-                    created_at=_dt(t.get("created_at")) or datetime.utcnow(),
-                    updated_at=_dt(t.get("updated_at")) or datetime.utcnow(),
-                ))
-            stats["tasks"] += 1
-
-        await db.flush()
-
-        # 보고 복원
-        for r in payload.get("reports", []):
-            existing = await db.get(Report, r["id"])
-            if existing:
-                existing.content = r["content"]
-                existing.reporter_name = r.get("reporter_name")
-                existing.updated_at = _dt(r.get("updated_at")) or datetime.utcnow()
+        if payload is not None:
+            saved_at = payload.get("saved_at", "알 수 없음")
+            logger.info(f"📥 백업 복원 시작 (저장 시각: {saved_at})")
+            result = await import_payload(db, payload)
+            stats  = result["restored"]
+
+        # journal 꼬리 재적용 (스냅샷 이후 변경분만, 기록 순서대로)
+        for rec in journal:
+            model = MODELS.get(rec.get("entity"))
+            if model is None:
+                continue
+            if rec["op"] == "delete":
+                if rec["entity"] == "tasks":
+                    await unlink(db, [rec["id"]])
+                await db.execute(delete(model).where(model.id == rec["id"]))
+                await unindex(db, [rec["id"]])
             else:
-                db.add(Report(
-                    id=r["id"], task_id=r["task_id"],
-                    content=r["content"],
-                    reporter_name=r.get("reporter_name"),
-                    created_at=_dt(r.get("created_at")) or datetime.utcnow(),
-                    updated_at=_dt(r.get("updated_at")) or datetime.utcnow(),
-                ))
-            stats["reports"] += 1
+                await upsert_rows(db, rec["entity"], [rec["data"]])
 
+        await record_sync_reset(db, "restore")
         await db.commit()
 
         logger.info(f"✅ 백업 복원 완료: 사용자={stats['users']}, "
                     f"부서={stats['departments']}, 업무={stats['tasks']}, "
-                    f"보고={stats['reports']}")
+                    f"보고={stats['reports']}, journal={len(journal)}건")
         return True
 
     except Exception as e:
@@ -233,3 +380,5 @@ async def restore_from_backup(db: AsyncSession) -> bool:
         import traceback
         traceback.print_exc()
         return False
+    finally:
+        db.info.pop(changes.SKIP, None)
@@ -0,0 +1,108 @@
+"""
+커밋 단위 변경 수집기
+- ORM flush 때 추적 대상 테이블의 insert / update / delete 를 세션별로 모아 두었다가
+- 커밋이 끝나면 등록된 리스너에게 한 번에 전달 (롤백되면 버림)
+- ORM 을 거치지 않는 일괄 UPDATE / DELETE 는 record() 로 직접 등록
+"""
+import logging
+from dataclasses import dataclass
+from typing import Callable
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# 추적 대상 테이블 (FK 순서: 부모 → 자식)
+TRACKED = ("departments", "users", "tasks", "reports", "daily_records")
+
+# session.info 에 이 키가 True 면 수집하지 않음 (백업 복원 등)
+SKIP = "changes_skip"
+
+_PENDING = "changes_pending"
+
+
+@dataclass
+class Change:
+    entity: str            # 테이블 이름
+    op    : str            # "insert" / "update" / "delete"
+    id    : str
+    row   : dict           # flush 시점의 컬럼 값 (delete 는 삭제 직전 값)
+
+
+_listeners: list[Callable[[list[Change]], None]] = []
+
+
+def subscribe(fn: Callable[[list[Change]], None]) -> None:
+    """커밋된 변경 목록을 받을 리스너 등록 (동기 함수, 빠르게 반환해야 함)"""
+    _listeners.append(fn)
+
+
+def _merge(pending: dict, ch: Change) -> None:
+    key  = (ch.entity, ch.id)
+    prev = pending.get(key)
+    if prev is None:
+        pending[key] = ch
+    elif ch.op == "delete":
+        if prev.op == "insert":
+            del pending[key]      # 같은 트랜잭션에서 생성 후 삭제 → 흔적 없음
+        else:
+            pending[key] = ch
+    elif prev.op == "insert":
+        pending[key] = Change(ch.entity, "insert", ch.id, ch.row)
+    else:
+        pending[key] = ch
+
+
+def record(db, entity: str, op: str, rows: list[dict]) -> None:
+    """ORM flush 를 거치지 않은 변경 (Core UPDATE/DELETE 등) 직접 등록"""
+    if db.info.get(SKIP) or entity not in TRACKED:
+        return
+    pending = db.info.setdefault(_PENDING, {})
+    for row in rows:
+        _merge(pending, Change(entity, op, row["id"], dict(row)))
+
+
+def _row_of(obj) -> dict:
+    return {a.key: getattr(obj, a.key) for a in sa_inspect(obj).mapper.column_attrs}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect(session: Session, flush_context) -> None:
+    if session.info.get(SKIP):
+        return
+    pending = session.info.setdefault(_PENDING, {})
+    for op, objs in (("insert", session.new), ("update", session.dirty),
+                     ("delete", session.deleted)):
+        for obj in objs:
+            entity = getattr(obj, "__tablename__", None)
+            if entity not in TRACKED:
+                continue
+            if op == "update" and not session.is_modified(obj, include_collections=False):
+                continue
+            _merge(pending, Change(entity, op, obj.id, _row_of(obj)))
+
+
+def _ordered(changes: list[Change]) -> list[Change]:
+    """부모 → 자식 순서로 insert/update, 그 다음 자식 → 부모 순서로 delete"""
+    rank = {name: i for i, name in enumerate(TRACKED)}
+    upserts = sorted((c for c in changes if c.op != "delete"), key=lambda c: rank[c.entity])
+    deletes = sorted((c for c in changes if c.op == "delete"), key=lambda c: -rank[c.entity])
+    return upserts + deletes
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    changes = _ordered(list(pending.values()))
+    for fn in _listeners:
+        try:
+            fn(changes)
+        except Exception as e:
+            logger.error(f"❌ 변경 리스너 오류 ({getattr(fn, '__name__', fn)}): {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop(_PENDING, None)
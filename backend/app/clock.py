@@ -0,0 +1,43 @@
+"""
+기관 기준 날짜 계산
+- DB 의 시각은 모두 UTC (naive) 로 저장됨
+- "하루" 는 기관 시간대 (ORG_TIMEZONE, 기본 Asia/Seoul) 의 00:00 ~ 다음 날 00:00
+  → UTC 반열린 구간 [start, end) 로 바꿔 SQL 에 그대로 넘김 (created_at 등의 인덱스 범위 조회)
+- 일광 절약 시간이 있는 시간대도 각 날짜의 자정을 따로 변환하므로 23 / 25 시간짜리 날도 정확함
+"""
+import os
+from datetime import datetime, date as dt_date, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+ORG_TIMEZONE = os.environ.get("ORG_TIMEZONE", "Asia/Seoul")
+ORG_TZ = ZoneInfo(ORG_TIMEZONE)
+
+
+def to_utc(local: datetime) -> datetime:
+    """기관 시간대의 시각 (naive) → DB 에 저장된 형식의 UTC 시각 (naive)"""
+    return local.replace(tzinfo=ORG_TZ).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def local_date(utc: datetime) -> dt_date:
+    """DB 의 UTC 시각 (naive) → 기관 시간대 기준 날짜"""
+    return utc.replace(tzinfo=timezone.utc).astimezone(ORG_TZ).date()
+
+
+def today() -> dt_date:
+    return datetime.now(ORG_TZ).date()
+
+
+def day_start(day: dt_date) -> datetime:
+    """그 날 00:00 (기관 시간대) 의 UTC 시각"""
+    return to_utc(datetime.combine(day, time.min))
+
+
+def day_range(first: dt_date, last: dt_date | None = None) -> tuple[datetime, datetime]:
+    """first ~ last (포함, 없으면 first 하루) 를 덮는 UTC [start, end)"""
+    return day_start(first), day_start((last or first) + timedelta(days=1))
+
+
+def next_midnight(now: datetime | None = None) -> datetime:
+    """다음 자정 (기관 시간대) 의 UTC 시각"""
+    now = now or datetime.utcnow()
+    return day_start(local_date(now) + timedelta(days=1))
@@ -0,0 +1,225 @@
+"""
+오늘의 일일 보관함 증분 갱신
+- changes 허브에서 커밋된 업무 / 보고 / 부서 변경을 받아 바뀐 업무 id 만 모아 두었다가
+  잠깐 기다린 뒤 (debounce) 오늘 기록의 해당 업무 항목과 합계만 고쳐 씀
+- 하루의 첫 기록은 전날 기록에서 보고를 비우고 완료 업무만 남겨 만듦
+  (전날 기록이 없거나 서버 재시작 / 백업 가져오기 직후에는 한 번만 전체 계산)
+- 자정 작업은 밀린 변경을 반영하고 saved_by 를 "auto" 로 바꿔 봉인만 함
+"""
+import asyncio
+import copy
+import logging
+import os
+from datetime import datetime, date as dt_date, timedelta
+from sqlalchemy import select, and_
+from sqlalchemy.orm import selectinload
+
+from . import changes, clock
+from .database import AsyncSessionLocal
+from .models import Task, Department, Report, DailyRecord, TaskStatus
+from .routers.daily_records import (
+    _build_record_data, _save_record_data, _task_entry, _dept_entry, _count_record,
+)
+
+logger = logging.getLogger(__name__)
+
+# 변경 후 이만큼 더 모아서 한 번에 반영 (초)
+DAILY_RECORD_DEBOUNCE_SECONDS = float(os.environ.get("DAILY_RECORD_DEBOUNCE_SECONDS", "2"))
+
+# 증분 갱신으로 만든 기록의 saved_by (자정 봉인 때 "auto", 수동 저장 때 "manual")
+_LIVE = "live"
+
+
+def _is_current(data: dict) -> bool:
+    """증분 갱신에 필요한 필드(업무 created_at)가 있는 형식인지"""
+    return all("created_at" in t for d in data.get("departments", []) for t in d["tasks"])
+
+
+def _carry_over(prev: dict, day: dt_date) -> dict:
+    """전날 기록 → 그 날 아침 상태 (완료 업무만, 보고 없음)"""
+    depts = []
+    for d in prev["departments"]:
+        tasks = [{**t, "reports": []} for t in d["tasks"] if t["status"] == TaskStatus.done.value]
+        if tasks:
+            depts.append({**d, "tasks": tasks})
+    return _count_record({"date": day.isoformat(), "departments": depts})
+
+
+class DailyRecorder:
+    """
+    changes 리스너는 동기 함수이므로 날짜별 바뀐 업무 id 만 모으고,
+    조회 / 저장은 백그라운드 태스크에서 처리. 같은 날 행은 FOR UPDATE 로 잠가
+    여러 워커가 동시에 고쳐 써도 서로의 반영분을 덮지 않음.
+    """
+
+    def __init__(self):
+        self._pending: dict[dt_date, set[str]] = {}
+        self._stale  : set[dt_date] = set()      # 다음 반영 때 전체 다시 계산
+        self._wake   : asyncio.Event | None = None
+        self._lock   : asyncio.Lock | None = None
+        self._task   : asyncio.Task | None = None
+        self.started_at: datetime | None = None   # 이 시각 이전 변경은 이 프로세스가 못 봤을 수 있음
+        self.patched = 0
+        self.rebuilt = 0
+
+    # ── 변경 수신 (changes 리스너) ─────────────────
+    def on_changes(self, batch: list["changes.Change"]) -> None:
+        ids, touched = set(), False
+        for c in batch:
+            if c.entity == "tasks":
+                ids.add(c.id)
+            elif c.entity == "reports" and c.row.get("task_id"):
+                ids.add(c.row["task_id"])
+            elif c.entity != "departments":      # 부서는 이름 등만 다시 읽으면 됨
+                continue
+            touched = True
+        if not touched or self._wake is None:
+            return
+        self._pending.setdefault(clock.today(), set()).update(ids)
+        self._wake.set()
+
+    def mark_stale(self, day: dt_date | None = None) -> None:
+        """변경 허브를 거치지 않고 데이터가 바뀌었을 때 (백업 가져오기 등)"""
+        day = day or clock.today()
+        self._stale.add(day)
+        self._pending.setdefault(day, set())
+        if self._wake is not None:
+            self._wake.set()
+
+    def status(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "pending": sum(len(v) for v in self._pending.values()),
+            "patched": self.patched,
+            "rebuilt": self.rebuilt,
+        }
+
+    # ── 반영 ───────────────────────────────────────
+    async def _base(self, db, day: dt_date, record: DailyRecord | None) -> tuple[dict, bool]:
+        """고쳐 쓸 기록 (기존 → 전날에서 이월 → 전체 계산 순). 두 번째 값: 전체 계산 여부"""
+        if record is not None and day not in self._stale:
+            # 같은 dict 를 고쳐 다시 넣으면 변경으로 감지되지 않으므로 복사본을 고침
+            data = copy.deepcopy(record.summary_json)
+            if _is_current(data):
+                return data, False
+        if record is None and day not in self._stale:
+            prev = (await db.execute(
+                select(DailyRecord.summary_json)
+                .where(DailyRecord.date == (day - timedelta(days=1)).isoformat())
+            )).scalar_one_or_none()
+            if prev is not None and _is_current(prev):
+                return _carry_over(prev, day), False
+        self._stale.discard(day)
+        self.rebuilt += 1
+        return await _build_record_data(day, db), True
+
+    async def _patch(self, db, day: dt_date, task_ids: set[str]) -> DailyRecord:
+        record = (await db.execute(
+            select(DailyRecord).where(DailyRecord.date == day.isoformat()).with_for_update()
+        )).scalar_one_or_none()
+        data, rebuilt = await self._base(db, day, record)
+
+        if task_ids and not rebuilt:
+            day_start, day_end = clock.day_range(day)
+            in_day = and_(Report.created_at >= day_start, Report.created_at < day_end)
+            rows = (await db.execute(
+                select(Task, Department)
+                .join(Department, Task.dept_id == Department.id)
+                .where(Task.id.in_(task_ids))
+                .options(selectinload(Task.reports.and_(in_day)))
+            )).all()
+            for d in data["departments"]:
+                d["tasks"] = [t for t in d["tasks"] if t["id"] not in task_ids]
+            by_dept = {d["dept_id"]: d for d in data["departments"]}
+            for task, dept in rows:
+                if task.status != TaskStatus.done and not task.reports:
+                    continue                     # 그 날 기록 대상 아님
+                entry = by_dept.get(dept.id)
+                if entry is None:
+                    entry = by_dept[dept.id] = _dept_entry(dept)
+                    data["departments"].append(entry)
+                entry["tasks"].append(_task_entry(task))
+                entry["tasks"].sort(key=lambda t: (t["created_at"], t["id"]))
+            self.patched += len(task_ids)
+
+        # 부서 정보 / 순서는 부서 표에서 다시 읽음 (작은 표, 지워진 부서는 제외)
+        depts = {d.id: d for d in (await db.execute(
+            select(Department).where(Department.id.in_([d["dept_id"] for d in data["departments"]]))
+        )).scalars()}
+        merged = []
+        for d in data["departments"]:
+            dept = depts.get(d["dept_id"])
+            if dept is not None and d["tasks"]:
+                merged.append({**_dept_entry(dept), "tasks": d["tasks"]})
+        merged.sort(key=lambda d: (depts[d["dept_id"]].created_at, d["dept_id"]))
+        data["departments"] = merged
+
+        saved_by = record.saved_by if record is not None else _LIVE
+        return await _save_record_data(_count_record(data), saved_by, db, record, lookup=False)
+
+    async def flush(self) -> None:
+        """모아 둔 변경을 지금 반영"""
+        async with self._lock:
+            pending, self._pending = self._pending, {}
+            for day, ids in sorted(pending.items()):
+                try:
+                    async with AsyncSessionLocal() as db:
+                        await self._patch(db, day, ids)
+                        await db.commit()
+                except Exception as e:
+                    logger.error(f"❌ [daily] {day} 보관함 갱신 실패 - 다음 반영 때 전체 계산: {e}")
+                    self._stale.add(day)
+                    self._pending.setdefault(day, set())
+
+    def covers(self, day: dt_date) -> bool:
+        """그 날 하루 동안 계속 증분 갱신해 왔는지 (아니면 봉인 전에 전체 계산이 안전)"""
+        return self.started_at is not None and self.started_at <= clock.day_start(day)
+
+    async def save(self, day: dt_date, saved_by: str) -> DailyRecord:
+        """밀린 변경을 반영한 뒤 그 날 기록을 saved_by 로 저장 (수동 저장 / 자정 봉인)"""
+        await self.flush()
+        async with self._lock:
+            async with AsyncSessionLocal() as db:
+                record = await self._patch(db, day, set())
+                record.saved_by = saved_by
+                await db.commit()
+                await db.refresh(record)
+                return record
+
+    # ── 수명 주기 ──────────────────────────────────
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self.started_at = datetime.utcnow()
+        # 서버가 멈춰 있던 동안 / 직전 종료 때 못 반영한 변경이 있을 수 있음
+        self._stale.add(clock.today())
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if any(self._pending.values()):
+            await self.flush()
+        self._wake = None
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            await asyncio.sleep(DAILY_RECORD_DEBOUNCE_SECONDS)
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"❌ [daily] 보관함 갱신 오류: {e}")
+
+
+daily_recorder = DailyRecorder()
+changes.subscribe(daily_recorder.on_changes)
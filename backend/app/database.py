@@ -2,14 +2,61 @@
 PostgreSQL (Supabase) + SQLAlchemy 비동기 DB 설정
 - Supabase Session Pooler (포트 5432) 사용 - prepared statement 문제 없음
 - Transaction Pooler (포트 6543)은 asyncpg와 호환 안 됨 → Session Pooler로 변경
+- 엔진 레지스트리: 기본(primary) 엔진 + 선택적인 읽기 복제본(DATABASE_REPLICA_URLS)
+  * get_db      : 항상 primary (쓰기 / 방금 쓴 값을 다시 읽는 요청)
+  * get_read_db : 조회 전용 라우트. 복제 지연이 허용 범위 안인 복제본으로 분산하고,
+                  없거나 이 프로세스의 마지막 쓰기를 아직 못 받았으면 primary 로
+- 풀 크기는 역할(primary / replica)별로 환경변수로 조정
+- SQLite 로컬 모드: DATABASE_URL=sqlite:///data/songwork.db (단일 서버 / 테스트 / 벤치마크)
+  * 연결마다 WAL / synchronous=NORMAL / mmap / cache / busy_timeout PRAGMA 적용
+  * 쓰기는 한 번에 하나만 (get_db 의 쓰기 요청은 프로세스 안에서 차례로) → "database is locked" 방지
+    백그라운드 작업 (보관함 갱신 / 예약 작업) 의 쓰기는 busy_timeout 만큼 기다림
+  * 읽기는 WAL 덕분에 쓰기와 동시에 여러 연결로
 """
+import asyncio
 import os
 import logging
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+import time
+from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from pathlib import Path
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+
+from . import changes
 
 logger = logging.getLogger(__name__)
 
+# 풀 크기 (역할별)
+DB_POOL_SIZE            = int(os.environ.get("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW         = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+DB_REPLICA_POOL_SIZE    = int(os.environ.get("DB_REPLICA_POOL_SIZE", "5"))
+DB_REPLICA_MAX_OVERFLOW = int(os.environ.get("DB_REPLICA_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT         = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE         = int(os.environ.get("DB_POOL_RECYCLE", "1800"))
+
+# 읽기 복제본: 쉼표로 구분한 URL 목록 (없으면 모든 조회가 primary)
+DATABASE_REPLICA_URLS = os.environ.get("DATABASE_REPLICA_URLS", "")
+DB_REPLICA_MAX_LAG_SECONDS = float(os.environ.get("DB_REPLICA_MAX_LAG_SECONDS", "5"))   # 이보다 밀린 복제본은 제외
+DB_REPLICA_CHECK_SECONDS   = float(os.environ.get("DB_REPLICA_CHECK_SECONDS", "10"))    # 복제 지연 점검 주기
+DB_REPLICA_CHECK_TIMEOUT   = float(os.environ.get("DB_REPLICA_CHECK_TIMEOUT", "2"))
+
+# SQLite 로컬 모드
+SQLITE_POOL_SIZE       = int(os.environ.get("SQLITE_POOL_SIZE", "5"))           # 동시에 읽을 연결 수
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))  # 다른 연결이 쓰는 중이면 기다릴 시간
+SQLITE_MMAP_SIZE       = int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_KB        = int(os.environ.get("SQLITE_CACHE_KB", "65536"))       # 연결별 페이지 캐시
+
+# 쓰기 직후 복제본을 다시 점검하는 최소 간격 (초)
+_RECHECK_AFTER_WRITE = 0.5
+
+# 쓰기 요청으로 보는 HTTP 메서드
+_READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
 
 def _build_database_url() -> str:
     """
@@ -21,6 +68,9 @@ def _build_database_url() -> str:
     """
     raw_url = os.environ.get("DATABASE_URL", "").strip()
 
+    if raw_url.startswith("sqlite"):
+        logger.info("✅ SQLite - 로컬 모드 (DATABASE_URL)")
+        return _aiosqlite_url(raw_url)
     if raw_url:
         logger.info("✅ PostgreSQL - 환경변수 DATABASE_URL 사용")
     else:
@@ -32,50 +82,287 @@ def _build_database_url() -> str:
         )
         logger.info("✅ PostgreSQL - Supabase Session Pooler URL 사용 (포트 5432)")
 
-    # scheme 변환: asyncpg 드라이버용
+    return _asyncpg_url(raw_url)
+
+
+def _aiosqlite_url(raw_url: str) -> str:
+    """sqlite:///경로 → sqlite+aiosqlite:///경로 (파일이 들어갈 폴더도 만듦)"""
+    rest = raw_url.split("://", 1)[-1]          # "/상대경로", "//절대경로" 또는 "" (메모리)
+    path = rest[1:] if rest.startswith("/") else rest
+    if path and path != ":memory:" and not path.startswith("file:"):
+        Path(path.split("?", 1)[0]).parent.mkdir(parents=True, exist_ok=True)
+    return f"sqlite+aiosqlite:///{path}"
+
+
+def _asyncpg_url(raw_url: str) -> str:
+    """scheme 변환: asyncpg 드라이버용"""
     if raw_url.startswith("postgres://"):
         raw_url = raw_url.replace("postgres://", "postgresql+asyncpg://", 1)
     elif raw_url.startswith("postgresql://"):
         raw_url = raw_url.replace("postgresql://", "postgresql+asyncpg://", 1)
     elif not raw_url.startswith("postgresql+asyncpg://"):
         raw_url = "postgresql+asyncpg://" + raw_url.split("://", 1)[-1]
-
     return raw_url
 
 
 DATABASE_URL = _build_database_url()
 
-# Session Pooler는 prepared statement 지원 → statement_cache_size=0 불필요
-# 하지만 안전을 위해 connect_args에 설정
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=False,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_recycle=1800,
-    pool_pre_ping=True,
-    connect_args={
-        "statement_cache_size": 0,  # 혹시 모를 Pooler 충돌 방지
-        "server_settings": {
-            "application_name": "songwork-api"
+
+def _sqlite_pragmas(dbapi_conn, _record) -> None:
+    """새 연결마다 적용 (journal_mode=WAL 은 파일에 남지만 나머지는 연결 단위)"""
+    cur = dbapi_conn.cursor()
+    for pragma in (
+        "journal_mode=WAL",              # 읽기가 쓰기를 막지 않음
+        "synchronous=NORMAL",            # WAL 에서는 커밋마다 fsync 하지 않아도 손상되지 않음
+        f"busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+        f"mmap_size={SQLITE_MMAP_SIZE}",
+        f"cache_size=-{SQLITE_CACHE_KB}",
+        "temp_store=MEMORY",
+    ):
+        cur.execute(f"PRAGMA {pragma}")
+    cur.close()
+
+
+def _make_sqlite_engine(url: str) -> AsyncEngine:
+    if ":memory:" in url or url.endswith(":///"):
+        # 메모리 DB 는 연결마다 따로 생기므로 연결 하나를 계속 씀
+        eng = create_async_engine(url, echo=False, poolclass=StaticPool,
+                                  connect_args={"check_same_thread": False})
+    else:
+        # aiosqlite 기본값(NullPool)은 요청마다 연결 + 스레드 + PRAGMA 를 새로 만듦 →
+        # 적은 수의 연결을 계속 재사용 (네트워크가 없어 pre_ping / recycle 불필요)
+        eng = create_async_engine(
+            url,
+            echo=False,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=SQLITE_POOL_SIZE,
+            max_overflow=0,
+            pool_timeout=DB_POOL_TIMEOUT,
+            connect_args={"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+        )
+    event.listen(eng.sync_engine, "connect", _sqlite_pragmas)
+    return eng
+
+
+def _make_engine(url: str, role: str, pool_size: int, max_overflow: int) -> AsyncEngine:
+    if url.startswith("sqlite"):
+        return _make_sqlite_engine(url)
+    # Session Pooler는 prepared statement 지원 → statement_cache_size=0 불필요
+    # 하지만 안전을 위해 connect_args에 설정
+    return create_async_engine(
+        url,
+        echo=False,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        connect_args={
+            "statement_cache_size": 0,  # 혹시 모를 Pooler 충돌 방지
+            "server_settings": {
+                "application_name": "songwork-api" if role == "primary" else f"songwork-api-{role}"
+            }
         }
-    }
-)
+    )
+
+
+engine = _make_engine(DATABASE_URL, "primary", DB_POOL_SIZE, DB_MAX_OVERFLOW)
+IS_SQLITE = engine.dialect.name == "sqlite"
 
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
+# SQLite 쓰기 직렬화 (PostgreSQL 에서는 쓰지 않음)
+_write_lock = asyncio.Lock()
+sqlite_writes = {"waited": 0, "wait_ms_total": 0.0}
+
+
+@asynccontextmanager
+async def write_turn():
+    """SQLite 에서 쓰기 차례를 기다림 (한 프로세스 안에서 한 번에 한 쓰기 트랜잭션)"""
+    if not IS_SQLITE:
+        yield
+        return
+    if _write_lock.locked():
+        sqlite_writes["waited"] += 1
+    t0 = time.perf_counter()
+    async with _write_lock:
+        sqlite_writes["wait_ms_total"] += (time.perf_counter() - t0) * 1000
+        yield
+
+
+# ── 읽기 복제본 ─────────────────────────────────────────
+# 복제 지연 (초): 받은 WAL 을 모두 재생했으면 0, 아니면 마지막 재생 트랜잭션 이후 경과 시간
+_LAG_SQL = text("""
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+""")
+
+
+@dataclass
+class _Replica:
+    name      : str
+    engine    : AsyncEngine
+    sessions  : async_sessionmaker
+    ok        : bool = False
+    lag       : float | None = None
+    synced_at : float = 0.0      # 이 시각(time.time)까지의 쓰기는 반영됨 (점검 시각 - 지연)
+    checked_at: float = 0.0      # time.monotonic
+    served    : int = 0
+    failures  : int = 0
+    error     : str | None = None
+
+
+class EngineRegistry:
+    """
+    primary 와 읽기 복제본 엔진 모음.
+    복제 지연은 요청 중에 주기적으로 (DB_REPLICA_CHECK_SECONDS) 한 번씩만 점검하고,
+    이 프로세스가 그보다 나중에 쓴 적이 있으면 그 복제본은 다시 점검하거나 건너뛴다
+    (다른 워커 / 인스턴스의 쓰기는 DB_REPLICA_MAX_LAG_SECONDS 만큼 늦게 보일 수 있음).
+    """
+
+    def __init__(self, primary: async_sessionmaker, urls: list[str]):
+        self.primary  = primary
+        self.replicas: list[_Replica] = []
+        for i, url in enumerate(urls):
+            name = f"replica{i + 1}"
+            e = _make_engine(url, name, DB_REPLICA_POOL_SIZE, DB_REPLICA_MAX_OVERFLOW)
+            self.replicas.append(_Replica(name, e, async_sessionmaker(e, expire_on_commit=False)))
+        self.last_write = 0.0            # 이 프로세스의 마지막 커밋 시각 (time.time)
+        self.primary_reads = 0
+        self._next  = 0
+        self._locks = {r.name: asyncio.Lock() for r in self.replicas}
+
+    def note_write(self, batch=None) -> None:
+        """changes 리스너 겸용 (변경 허브를 거치지 않는 가져오기 등에서도 직접 호출)"""
+        self.last_write = time.time()
+
+    async def _check(self, r: _Replica) -> None:
+        lock = self._locks[r.name]
+        if lock.locked():
+            return                       # 다른 요청이 점검 중 → 직전 결과 사용
+        async with lock:
+            started = time.time()
+            try:
+                async with r.engine.connect() as conn:
+                    lag = await asyncio.wait_for(
+                        conn.scalar(_LAG_SQL), timeout=DB_REPLICA_CHECK_TIMEOUT
+                    )
+                r.lag, r.ok, r.error = float(lag or 0), True, None
+                r.synced_at = started - r.lag
+            except Exception as e:
+                if r.ok:
+                    logger.warning(f"⚠️ [db] {r.name} 점검 실패 - primary 로 읽음: {e}")
+                r.ok, r.error = False, str(e)[:200]
+                r.failures += 1
+            r.checked_at = time.monotonic()
+
+    def mark_down(self, r: _Replica, error: Exception) -> None:
+        """요청 도중 연결 오류 → 다음 점검 때까지 제외"""
+        logger.warning(f"⚠️ [db] {r.name} 연결 오류 - primary 로 읽음: {error}")
+        r.ok, r.error = False, str(error)[:200]
+        r.failures += 1
+        r.checked_at = time.monotonic()
+
+    def _usable(self, r: _Replica) -> bool:
+        return r.ok and r.lag <= DB_REPLICA_MAX_LAG_SECONDS and r.synced_at >= self.last_write
+
+    async def pick(self) -> _Replica | None:
+        """조회에 쓸 복제본 (돌아가며). 쓸 수 있는 복제본이 없으면 None (= primary)"""
+        if not self.replicas:
+            return None
+        now = time.monotonic()
+        for r in self.replicas:
+            due = now - r.checked_at >= DB_REPLICA_CHECK_SECONDS
+            behind = r.ok and r.synced_at < self.last_write and now - r.checked_at >= _RECHECK_AFTER_WRITE
+            if due or behind:
+                await self._check(r)
+        usable = [r for r in self.replicas if self._usable(r)]
+        if not usable:
+            self.primary_reads += 1
+            return None
+        r = usable[self._next % len(usable)]
+        self._next += 1
+        r.served += 1
+        return r
+
+    def sessions(self, r: _Replica | None) -> async_sessionmaker:
+        return r.sessions if r is not None else self.primary
+
+    def status(self) -> dict:
+        return {
+            "replicas"     : [
+                {"name": r.name, "ok": r.ok, "lag": r.lag, "served": r.served,
+                 "failures": r.failures, "error": r.error}
+                for r in self.replicas
+            ],
+            "primary_reads": self.primary_reads,
+            "max_lag"      : DB_REPLICA_MAX_LAG_SECONDS,
+            **({"sqlite_writes": {**sqlite_writes, "wait_ms_total": round(sqlite_writes["wait_ms_total"], 1)}}
+               if IS_SQLITE else {}),
+            "pool"         : {"primary": engine.pool.status(),
+                              **{r.name: r.engine.pool.status() for r in self.replicas}},
+        }
+
+    async def dispose(self) -> None:
+        for r in self.replicas:
+            await r.engine.dispose()
+        await engine.dispose()
+
+
+def _replica_urls() -> list[str]:
+    urls = [_asyncpg_url(u.strip()) for u in DATABASE_REPLICA_URLS.split(",") if u.strip()]
+    if urls and engine.dialect.name != "postgresql":
+        logger.warning("⚠️ PostgreSQL 이 아니면 읽기 복제본을 쓰지 않음 (DATABASE_REPLICA_URLS 무시)")
+        return []
+    if urls:
+        logger.info(f"✅ 읽기 복제본 {len(urls)}개 사용 (허용 지연 {DB_REPLICA_MAX_LAG_SECONDS:g}초)")
+    return urls
+
+
+db_registry = EngineRegistry(AsyncSessionLocal, _replica_urls())
+changes.subscribe(db_registry.note_write)
+
 
 class Base(DeclarativeBase):
     pass
 
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
+async def get_db(request: Request):
+    """
+    요청 세션 (primary). SQLite 에서는 쓰기 메서드 요청을 차례로 처리해
+    읽고 나서 쓰는 트랜잭션끼리 잠금을 다투다 실패하지 않게 함
+    """
+    if request.method in _READ_METHODS:
+        async with AsyncSessionLocal() as session:
+            yield session
+        return
+    async with write_turn():
+        async with AsyncSessionLocal() as session:
+            yield session
+
+
+async def get_read_db():
+    """조회 전용 라우트용 세션 (복제본 또는 primary). 이 세션으로 쓰지 말 것"""
+    replica = await db_registry.pick()
+    async with db_registry.sessions(replica)() as session:
+        try:
+            yield session
+        except DBAPIError as e:
+            if replica is not None and e.connection_invalidated:
+                db_registry.mark_down(replica, e)
+            raise
+        except OSError as e:
+            if replica is not None:
+                db_registry.mark_down(replica, e)
+            raise
 
 
 async def init_db():
+    from .migrations import run_migrations
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-    logger.info("✅ DB 테이블 초기화 완료")
+    applied = await run_migrations(engine)
+    logger.info(f"✅ DB 테이블 초기화 완료 (새로 적용한 마이그레이션: {applied or '없음'})")
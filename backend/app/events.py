@@ -0,0 +1,285 @@
+"""
+실시간 변경 알림 브로커 (SSE 용)
+- changes 허브에서 커밋된 변경을 받아 {entity, op, id, version, dept_ids} 이벤트로 변환
+- PostgreSQL: pg_notify 로 발행하고 LISTEN 으로 받은 것만 전달
+  → 여러 워커 / 인스턴스가 같은 이벤트를 받음 (자기 자신이 보낸 것도 LISTEN 으로 돌아옴)
+- SQLite 또는 LISTEN 연결이 없을 때: 같은 프로세스 구독자에게 바로 전달
+- 백업 가져오기 / 복원은 변경 허브를 거치지 않으므로 reload() 로 "전체 다시 읽기" 이벤트 하나만 발행
+- listen() 으로 등록한 프로세스 내부 리스너는 모든 워커의 이벤트 (사용자 변경 포함) 를 받음
+"""
+import asyncio
+import json
+import logging
+import os
+from sqlalchemy import select
+
+from . import changes
+from .database import engine, AsyncSessionLocal
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL     = os.environ.get("EVENTS_CHANNEL", "songwork_changes")
+EVENTS_QUEUE_SIZE  = int(os.environ.get("EVENTS_QUEUE_SIZE", "1000"))   # 구독자별 대기 이벤트 상한
+
+# 이벤트를 보낼 테이블
+EVENT_ENTITIES = ("departments", "tasks", "reports", "daily_records")
+
+# 워커끼리만 주고받는 (SSE 구독자에게는 보내지 않는) 테이블 - 사용자 캐시 무효화용
+INTERNAL_ENTITIES = ("users",)
+
+# pg_notify payload 상한은 8000 바이트 → 여유를 두고 나눠 보냄
+_NOTIFY_LIMIT = 7000
+
+# LISTEN 연결 점검 주기 (초)
+_WATCHDOG_SECONDS = 30
+
+
+def _dept_ids_of(entity: str, row: dict) -> list[str]:
+    """이벤트를 받을 부서 목록 (빈 목록 = 모든 구독자)"""
+    if entity == "departments":
+        return [row["id"]]
+    if entity != "tasks":
+        return []
+    ids = [row["dept_id"]] if row.get("dept_id") else []
+    try:
+        shared = json.loads(row.get("department_ids") or "[]")
+    except (TypeError, ValueError):
+        shared = []
+    if "__ALL__" in shared:
+        return []                        # 전체 공유 업무
+    return ids + [d for d in shared if d not in ids]
+
+
+def _version_of(row: dict) -> int | str | None:
+    """업무 / 보고는 version 컬럼, 그 밖에는 updated_at"""
+    if row.get("version") is not None:
+        return row["version"]
+    ts = row.get("updated_at")
+    return ts.isoformat() if ts else None
+
+
+class _Subscriber:
+    def __init__(self, dept_id: str | None):
+        self.dept_id  = dept_id
+        self.queue    : asyncio.Queue = asyncio.Queue(maxsize=EVENTS_QUEUE_SIZE)
+        self.overflow = False            # 너무 밀려서 이벤트를 버림 → 클라이언트 재동기화 필요
+
+    def wants(self, event: dict) -> bool:
+        depts = event.get("dept_ids")
+        return self.dept_id is None or not depts or self.dept_id in depts
+
+
+class EventBroker:
+    """
+    커밋 이후 변경을 구독자(SSE 연결)별 큐로 나눠 준다.
+    changes 리스너는 동기 함수이므로 outbox 큐에 넣기만 하고,
+    보고의 부서 조회 / pg_notify 발행은 백그라운드 태스크에서 처리.
+    """
+
+    def __init__(self):
+        self._subs  : set[_Subscriber] = set()
+        self._listeners: list = []
+        self._outbox: asyncio.Queue | None = None
+        self._task  : asyncio.Task | None = None
+        self._conn  = None               # LISTEN 용 SQLAlchemy 연결 (PostgreSQL)
+        self._pg    = None               # 그 안의 asyncpg 연결
+        self.published = 0
+        self.delivered = 0
+        self.dropped   = 0
+
+    # ── 구독 ───────────────────────────────────────
+    def subscribe(self, dept_id: str | None = None) -> _Subscriber:
+        sub = _Subscriber(dept_id)
+        self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: _Subscriber) -> None:
+        self._subs.discard(sub)
+
+    def listen(self, fn) -> None:
+        """모든 워커에서 온 이벤트 목록을 받을 내부 리스너 (동기 함수, 캐시 무효화 등)"""
+        self._listeners.append(fn)
+
+    def status(self) -> dict:
+        return {
+            "running"    : self._task is not None and not self._task.done(),
+            "mode"       : "pg_notify" if self._pg is not None else "local",
+            "subscribers": len(self._subs),
+            "published"  : self.published,
+            "delivered"  : self.delivered,
+            "dropped"    : self.dropped,
+        }
+
+    # ── 변경 수신 (changes 리스너) ─────────────────
+    def on_changes(self, batch: list["changes.Change"]) -> None:
+        if self._outbox is None:
+            return
+        events = [
+            {
+                "entity"  : c.entity,
+                "op"      : c.op,
+                "id"      : c.id,
+                "version" : _version_of(c.row),
+                "dept_ids": _dept_ids_of(c.entity, c.row),
+                **({"task_id": c.row.get("task_id")} if c.entity == "reports" else {}),
+            }
+            for c in batch if c.entity in EVENT_ENTITIES or c.entity in INTERNAL_ENTITIES
+        ]
+        if events:
+            self._outbox.put_nowait(events)
+
+    def reload(self, reason: str) -> None:
+        """모든 구독자에게 전체 다시 읽기 요청 (행 단위 이벤트 없이 데이터가 통째로 바뀌었을 때)"""
+        if self._outbox is None:
+            return
+        self._outbox.put_nowait([{"entity": "*", "op": "reload", "id": None, "version": None,
+                                  "dept_ids": [], "reason": reason}])
+
+    async def _resolve_report_depts(self, events: list[dict]) -> None:
+        """보고 이벤트에 상위 업무의 부서를 채움 (같은 배치의 업무 이벤트 → DB 순)"""
+        reports = [e for e in events if e["entity"] == "reports"]
+        if not reports:
+            return
+        known = {e["id"]: e["dept_ids"] for e in events if e["entity"] == "tasks"}
+        missing = {e["task_id"] for e in reports} - known.keys()
+        if missing:
+            async with AsyncSessionLocal() as db:
+                rows = await db.execute(
+                    select(Task.id, Task.dept_id, Task.department_ids).where(Task.id.in_(missing))
+                )
+                for tid, dept_id, shared in rows.all():
+                    known[tid] = _dept_ids_of("tasks", {"dept_id": dept_id, "department_ids": shared})
+        for e in reports:
+            e["dept_ids"] = known.get(e["task_id"], [])
+
+    # ── 전달 ───────────────────────────────────────
+    def _deliver(self, events: list[dict]) -> None:
+        for fn in self._listeners:
+            try:
+                fn(events)
+            except Exception as e:
+                logger.error(f"❌ 이벤트 리스너 오류: {e}")
+        events = [e for e in events if e["entity"] not in INTERNAL_ENTITIES]
+        if not events:
+            return
+        for sub in list(self._subs):
+            if sub.overflow:
+                continue
+            for event in events:
+                if not sub.wants(event):
+                    continue
+                try:
+                    sub.queue.put_nowait(event)
+                    self.delivered += 1
+                except asyncio.QueueFull:
+                    sub.overflow = True
+                    self.dropped += 1
+                    break
+
+    def _on_notify(self, conn, pid, channel, payload: str) -> None:
+        try:
+            self._deliver(json.loads(payload))
+        except ValueError:
+            logger.warning(f"⚠️ 알 수 없는 알림 payload 무시: {payload[:100]}")
+
+    async def _notify(self, events: list[dict]) -> None:
+        chunk: list[str] = []
+        size = 2
+        for e in events:
+            s = json.dumps(e, ensure_ascii=False, separators=(",", ":"))
+            n = len(s.encode()) + 1
+            if chunk and size + n > _NOTIFY_LIMIT:
+                await self._pg.execute("SELECT pg_notify($1, $2)", EVENTS_CHANNEL, f"[{','.join(chunk)}]")
+                chunk, size = [], 2
+            chunk.append(s)
+            size += n
+        if chunk:
+            await self._pg.execute("SELECT pg_notify($1, $2)", EVENTS_CHANNEL, f"[{','.join(chunk)}]")
+
+    async def _publish(self, events: list[dict]) -> None:
+        try:
+            await self._resolve_report_depts(events)
+        except Exception as e:
+            logger.error(f"❌ 보고 이벤트 부서 조회 실패: {e}")
+        self.published += len(events)
+        if self._pg is not None:
+            try:
+                await self._notify(events)
+                return
+            except Exception as e:
+                logger.error(f"❌ pg_notify 실패 - 이 프로세스에만 전달: {e}")
+                await self._disconnect_pg()
+        self._deliver(events)
+
+    # ── PostgreSQL LISTEN 연결 ─────────────────────
+    async def _connect_pg(self) -> None:
+        if engine.dialect.name != "postgresql" or self._pg is not None:
+            return
+        try:
+            self._conn = await engine.connect()
+            raw = await self._conn.get_raw_connection()
+            self._pg = raw.driver_connection
+            await self._pg.add_listener(EVENTS_CHANNEL, self._on_notify)
+            logger.info(f"✅ 실시간 알림: LISTEN {EVENTS_CHANNEL}")
+        except Exception as e:
+            logger.error(f"❌ LISTEN 연결 실패 - 이 프로세스 안에서만 전달: {e}")
+            await self._disconnect_pg()
+
+    async def _disconnect_pg(self) -> None:
+        pg, conn = self._pg, self._conn
+        self._pg = self._conn = None
+        try:
+            if pg is not None and not pg.is_closed():
+                await pg.remove_listener(EVENTS_CHANNEL, self._on_notify)
+        except Exception:
+            pass
+        if conn is not None:
+            try:
+                await conn.invalidate()    # LISTEN 상태가 남은 연결은 풀에 돌려보내지 않음
+                await conn.close()
+            except Exception:
+                pass
+
+    # ── 수명 주기 ──────────────────────────────────
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._outbox = asyncio.Queue()
+        await self._connect_pg()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._outbox = None
+        await self._disconnect_pg()
+        # 열려 있는 스트림 종료 신호 (None)
+        for sub in list(self._subs):
+            try:
+                sub.queue.put_nowait(None)
+            except asyncio.QueueFull:
+                sub.overflow = True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                events = await asyncio.wait_for(self._outbox.get(), timeout=_WATCHDOG_SECONDS)
+            except asyncio.TimeoutError:
+                if self._pg is not None and self._pg.is_closed():
+                    await self._disconnect_pg()
+                await self._connect_pg()   # 끊겼으면 다시 LISTEN
+                continue
+            try:
+                await self._publish(events)
+            except Exception as e:
+                logger.error(f"❌ 이벤트 발행 오류: {e}")
+
+
+event_broker = EventBroker()
+changes.subscribe(event_broker.on_changes)
@@ -0,0 +1,263 @@
+"""
+백업 데이터 일괄 가져오기 엔진
+- POST /backup/import 와 시작 시 backup.json 복원이 함께 사용
+- 행마다 db.get() 으로 조회하지 않고 청크 단위 INSERT ... ON CONFLICT DO UPDATE
+  (PostgreSQL / SQLite 공용)
+- 순서: 부서 → 사용자 → 업무 → 보고 (FK 의존 순서)
+- 업무 / 보고는 검색 색인(search_docs), 업무는 담당자 / 공유 부서 표도 함께 갱신
+- NdjsonImporter: /backup/export?format=ndjson 형식을 받는 대로 조금씩 반영 (스트리밍)
+"""
+import codecs
+import json
+import os
+import time
+import zlib
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .models import User, Department, Task, Report, UserRole, TaskStatus, TaskPriority
+from .search import index_rows
+from .task_links import sync_links
+
+IMPORT_CHUNK_SIZE = int(os.environ.get("IMPORT_CHUNK_SIZE", "500"))
+
+# 한 문장에 넣을 수 있는 바인드 파라미터 상한 (asyncpg 32767, SQLite 32766)
+_MAX_PARAMS = 30000
+
+ORDER = ("departments", "users", "tasks", "reports")
+
+# 백업 대상 테이블 → 모델
+MODELS = {
+    "departments": Department,
+    "users"      : User,
+    "tasks"      : Task,
+    "reports"    : Report,
+}
+
+# 이미 있는 행일 때 덮어쓸 컬럼 (created_at 은 최초 값 유지)
+_UPDATE_COLUMNS = {
+    "departments": ("name", "emoji", "description", "manager_name", "updated_at"),
+    "users"      : ("username", "password", "display_name", "role", "dept_id", "is_active",
+                    "updated_at"),
+    "tasks"      : ("title", "description", "dept_id", "department_ids", "status", "priority",
+                    "assignee_name", "assignee_ids", "start_date", "due_date",
+                    "is_hidden", "hidden_at", "completed_at", "version", "updated_at"),
+    "reports"    : ("content", "reporter_name", "version", "updated_at"),
+}
+
+
+def _dt(s):
+    """문자열 → datetime 안전 변환"""
+    if not s:
+        return None
+    try:
+        return datetime.fromisoformat(s.replace("Z", "+00:00").replace("+00:00", ""))
+    except Exception:
+        return None
+
+
+def _department_values(d: dict) -> dict:
+    return {
+        "id": d["id"], "name": d["name"],
+        "emoji": d.get("emoji", "📁"),
+        "description": d.get("description", ""),
+        "manager_name": d.get("manager_name"),
+        "created_at": _dt(d.get("created_at")) or datetime.utcnow(),
+        "updated_at": _dt(d.get("updated_at")) or datetime.utcnow(),
+    }
+
+
+def _user_values(u: dict) -> dict:
+    return {
+        "id": u["id"], "username": u["username"],
+        "password": u["password"],   # 해시 그대로 보존
+        "display_name": u["display_name"],
+        "role": UserRole(u.get("role", "user")),
+        "dept_id": u.get("dept_id"),
+        "is_active": u.get("is_active", True),
+        "created_at": _dt(u.get("created_at")) or datetime.utcnow(),
+        "updated_at": _dt(u.get("updated_at")) or datetime.utcnow(),
+    }
+
+
+def _task_values(t: dict) -> dict:
+    return {
+        "id": t["id"], "title": t["title"],
+        "description": t.get("description", ""),
+        "dept_id": t["dept_id"],
+        "department_ids": t.get("department_ids"),
+        "status": TaskStatus(t.get("status", "notStarted")),
+        "priority": TaskPriority(t.get("priority", "medium")),
+        "assignee_name": t.get("assignee_name"),
+        "assignee_ids": t.get("assignee_ids"),
+        "start_date": _dt(t.get("start_date")),
+        "due_date": _dt(t.get("due_date")),
+        "is_hidden": t.get("is_hidden", False),
+        "hidden_at": _dt(t.get("hidden_at")),
+        "completed_at": _dt(t.get("completed_at")),
+        "version": t.get("version") or 1,
+        "created_at": _dt(t.get("created_at")) or datetime.utcnow(),
+        "updated_at": _dt(t.get("updated_at")) or datetime.utcnow(),
+    }
+
+
+def _report_values(r: dict) -> dict:
+    return {
+        "id": r["id"], "task_id": r["task_id"],
+        "content": r["content"],
+        "reporter_name": r.get("reporter_name"),
+        "version": r.get("version") or 1,
+        "created_at": _dt(r.get("created_at")) or datetime.utcnow(),
+        "updated_at": _dt(r.get("updated_at")) or datetime.utcnow(),
+    }
+
+
+_VALUES = {
+    "departments": _department_values,
+    "users"      : _user_values,
+    "tasks"      : _task_values,
+    "reports"    : _report_values,
+}
+
+
+def _insert_for(db: AsyncSession):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert
+    if dialect == "sqlite":
+        return sqlite.insert
+    raise RuntimeError(f"지원하지 않는 DB 입니다: {dialect}")
+
+
+async def upsert_rows(
+    db: AsyncSession,
+    entity: str,
+    rows: list[dict],
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> int:
+    """백업 형식의 행 목록을 청크 단위로 upsert (커밋은 호출한 쪽에서)"""
+    if not rows:
+        return 0
+    table   = MODELS[entity].__table__
+    insert  = _insert_for(db)
+    to_vals = _VALUES[entity]
+    size    = max(1, min(chunk_size, _MAX_PARAMS // len(table.columns)))
+
+    for i in range(0, len(rows), size):
+        chunk = [to_vals(r) for r in rows[i:i + size]]
+        stmt  = insert(table).values(chunk)
+        stmt  = stmt.on_conflict_do_update(
+            index_elements=[table.c.id],
+            set_={c: stmt.excluded[c] for c in _UPDATE_COLUMNS[entity]},
+        )
+        await db.execute(stmt)
+        await index_rows(db, entity, chunk)   # 검색 색인도 같은 트랜잭션에서
+        if entity == "tasks":
+            await sync_links(db, chunk)
+    return len(rows)
+
+
+async def import_payload(
+    db: AsyncSession,
+    payload: dict,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> dict:
+    """
+    백업 payload 전체를 순서대로 upsert.
+    반환: {"restored": 엔티티별 건수, "phases": 단계별 소요 시간 / 처리 속도}
+    """
+    stats  = {"users": 0, "departments": 0, "tasks": 0, "reports": 0}
+    phases = {}
+    for entity in ORDER:
+        started = time.perf_counter()
+        stats[entity] = await upsert_rows(db, entity, payload.get(entity, []), chunk_size)
+        elapsed = time.perf_counter() - started
+        phases[entity] = {
+            "rows"        : stats[entity],
+            "elapsed_ms"  : round(elapsed * 1000, 1),
+            "rows_per_sec": round(stats[entity] / elapsed, 1) if elapsed > 0 else None,
+        }
+    return {"restored": stats, "phases": phases}
+
+
+# ── NDJSON 스트리밍 가져오기 ───────────────────────────
+class NdjsonImporter:
+    """
+    NDJSON 내보내기 형식을 바이트 조각 단위로 받아서 청크마다 upsert.
+    한 줄 = {"entity": "tasks", "data": {...}} (첫 줄 {"entity": "meta", ...} 는 무시)
+    gzip 압축 여부는 첫 바이트로 자동 판별. 메모리에는 청크 1개 분량만 유지.
+    """
+
+    def __init__(self, db: AsyncSession, chunk_size: int = IMPORT_CHUNK_SIZE):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.stats  = {"users": 0, "departments": 0, "tasks": 0, "reports": 0}
+        self.phases = {e: {"rows": 0, "elapsed_ms": 0.0, "rows_per_sec": None} for e in ORDER}
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._inflater = None          # gzip 이면 zlib.decompressobj
+        self._sniffed  = False
+        self._tail     = ""
+        self._entity: str | None = None
+        self._rows: list[dict] = []
+        self._line_no = 0
+
+    async def feed(self, data: bytes) -> None:
+        if not data:
+            return
+        if not self._sniffed:
+            self._sniffed = True
+            if data[:2] == b"\x1f\x8b":
+                self._inflater = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        if self._inflater is not None:
+            data = self._inflater.decompress(data)
+        await self._feed_text(self._decoder.decode(data))
+
+    async def finish(self) -> dict:
+        if self._inflater is not None:
+            await self._feed_text(self._decoder.decode(self._inflater.flush()))
+        await self._feed_text(self._decoder.decode(b"", final=True))
+        if self._tail.strip():
+            await self._handle_line(self._tail)
+        self._tail = ""
+        await self._flush()
+        for p in self.phases.values():
+            secs = p["elapsed_ms"] / 1000
+            p["elapsed_ms"] = round(p["elapsed_ms"], 1)
+            p["rows_per_sec"] = round(p["rows"] / secs, 1) if secs > 0 else None
+        return {"restored": self.stats, "phases": self.phases}
+
+    async def _feed_text(self, text: str) -> None:
+        if not text:
+            return
+        lines = (self._tail + text).split("\n")
+        self._tail = lines.pop()
+        for line in lines:
+            if line.strip():
+                await self._handle_line(line)
+
+    async def _handle_line(self, line: str) -> None:
+        self._line_no += 1
+        try:
+            rec = json.loads(line)
+            entity = rec["entity"]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            raise ValueError(f"{self._line_no}번째 줄이 NDJSON 내보내기 형식이 아닙니다.")
+        if entity not in MODELS:
+            return                      # meta 등
+        if entity != self._entity:
+            await self._flush()
+            self._entity = entity
+        self._rows.append(rec["data"])
+        if len(self._rows) >= self.chunk_size:
+            await self._flush()
+
+    async def _flush(self) -> None:
+        if not self._rows:
+            return
+        started = time.perf_counter()
+        n = await upsert_rows(self.db, self._entity, self._rows, self.chunk_size)
+        self.phases[self._entity]["elapsed_ms"] += (time.perf_counter() - started) * 1000
+        self.phases[self._entity]["rows"] += n
+        self.stats[self._entity] += n
+        self._rows = []
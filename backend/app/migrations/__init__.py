@@ -0,0 +1,104 @@
+"""
+스키마 마이그레이션 실행기
+- schema_version 테이블에 적용된 버전을 기록
+- 이 패키지의 vNNN_*.py 를 번호 순서대로 한 번씩 적용
+  (각 파일: VERSION, DESCRIPTION, async def upgrade(conn))
+- 여러 워커/인스턴스가 동시에 시작해도 한 번만 적용되도록 PostgreSQL advisory lock 사용
+- 새 DB 는 create_all 이 최신 스키마를 만들므로, 마이그레이션은 반드시 재실행해도 안전하게 작성
+"""
+import importlib
+import logging
+import pkgutil
+from datetime import datetime
+from sqlalchemy import (
+    MetaData, Table, Column, Integer, String, DateTime,
+    select, insert, inspect, text,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_lock 키 (임의의 고정 정수)
+_LOCK_KEY = 72_410_001
+
+_metadata = MetaData()
+schema_version = Table(
+    "schema_version", _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _discover() -> list:
+    modules = []
+    for info in pkgutil.iter_modules(__path__):
+        if info.name.startswith("v"):
+            modules.append(importlib.import_module(f"{__name__}.{info.name}"))
+    modules.sort(key=lambda m: m.VERSION)
+    versions = [m.VERSION for m in modules]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"마이그레이션 버전 중복: {versions}")
+    return modules
+
+
+async def run_migrations(engine: AsyncEngine) -> list[int]:
+    """아직 적용되지 않은 마이그레이션을 순서대로 적용하고 적용한 버전 목록 반환"""
+    migrations = _discover()
+    applied_now = []
+    async with engine.connect() as conn:
+        is_pg = conn.dialect.name == "postgresql"
+        if is_pg:
+            await conn.execute(text("SELECT pg_advisory_lock(:k)"), {"k": _LOCK_KEY})
+            await conn.commit()
+        try:
+            await conn.run_sync(_metadata.create_all)
+            await conn.commit()
+            done = set((await conn.execute(select(schema_version.c.version))).scalars())
+            await conn.commit()
+            for m in migrations:
+                if m.VERSION in done:
+                    continue
+                logger.info(f"🛠️ 마이그레이션 v{m.VERSION:03d} 적용: {m.DESCRIPTION}")
+                await m.upgrade(conn)
+                await conn.execute(insert(schema_version).values(
+                    version=m.VERSION,
+                    description=m.DESCRIPTION,
+                    applied_at=datetime.utcnow(),
+                ))
+                await conn.commit()
+                applied_now.append(m.VERSION)
+        except Exception:
+            await conn.rollback()
+            raise
+        finally:
+            if is_pg:
+                await conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": _LOCK_KEY})
+                await conn.commit()
+    return applied_now
+
+
+# ── 마이그레이션 작성용 도우미 ─────────────────────────
+async def create_index(
+    conn: AsyncConnection,
+    name: str,
+    table: str,
+    columns: str,
+    where: str | None = None,
+) -> None:
+    """CREATE INDEX IF NOT EXISTS (PostgreSQL / SQLite 공용, 부분 인덱스 지원)"""
+    sql = f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"
+    if where:
+        sql += f" WHERE {where}"
+    await conn.execute(text(sql))
+
+
+async def column_exists(conn: AsyncConnection, table: str, column: str) -> bool:
+    cols = await conn.run_sync(lambda c: inspect(c).get_columns(table))
+    return any(c["name"] == column for c in cols)
+
+
+async def add_column(conn: AsyncConnection, table: str, column: str, ddl: str) -> None:
+    """컬럼이 없을 때만 ALTER TABLE ... ADD COLUMN"""
+    if not await column_exists(conn, table, column):
+        await conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
@@ -0,0 +1,19 @@
+"""
+자주 쓰는 조회 경로용 복합 인덱스
+- 보드 목록     : tasks(dept_id, is_hidden, created_at)
+- 완료/보관함   : tasks(status, updated_at)
+- 업무별 보고   : reports(task_id, created_at)
+- 날짜별 보고   : reports(created_at)
+daily_records(date) 는 UNIQUE 제약이 이미 인덱스 역할을 하므로 따로 만들지 않음
+"""
+from . import create_index
+
+VERSION = 1
+DESCRIPTION = "hot query composite indexes"
+
+
+async def upgrade(conn) -> None:
+    await create_index(conn, "ix_tasks_dept_hidden_created", "tasks", "dept_id, is_hidden, created_at")
+    await create_index(conn, "ix_tasks_status_updated", "tasks", "status, updated_at")
+    await create_index(conn, "ix_reports_task_created", "reports", "task_id, created_at")
+    await create_index(conn, "ix_reports_created", "reports", "created_at")
@@ -0,0 +1,12 @@
+"""
+부서 필터 없는 보드 목록의 keyset 페이지용 인덱스
+- WHERE is_hidden = false ORDER BY created_at DESC, id DESC LIMIT n
+"""
+from . import create_index
+
+VERSION = 2
+DESCRIPTION = "tasks board keyset index"
+
+
+async def upgrade(conn) -> None:
+    await create_index(conn, "ix_tasks_hidden_created", "tasks", "is_hidden, created_at, id")
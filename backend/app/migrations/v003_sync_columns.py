@@ -0,0 +1,22 @@
+"""
+증분 동기화(/sync/changes) 지원
+- users / departments 에 updated_at 추가 (기존 행은 created_at 으로 채움)
+- 모든 동기화 대상 테이블의 updated_at 인덱스
+- tombstones 테이블 자체는 create_all 이 생성, 인덱스만 보장
+"""
+from sqlalchemy import text
+from . import add_column, create_index
+
+VERSION = 3
+DESCRIPTION = "updated_at columns and indexes for delta sync"
+
+
+async def upgrade(conn) -> None:
+    for table in ("users", "departments"):
+        await add_column(conn, table, "updated_at", "TIMESTAMP")
+        await conn.execute(text(
+            f"UPDATE {table} SET updated_at = created_at WHERE updated_at IS NULL"
+        ))
+    for table in ("users", "departments", "tasks", "reports"):
+        await create_index(conn, f"ix_{table}_updated_at", table, "updated_at")
+    await create_index(conn, "ix_tombstones_deleted_at", "tombstones", "deleted_at")
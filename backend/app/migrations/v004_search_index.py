@@ -0,0 +1,60 @@
+"""
+업무 / 보고 전문 검색 (GET /search)
+- search_docs 표 자체는 create_all 이 생성
+- PostgreSQL: 토큰 문자열의 tsvector 식 GIN 인덱스
+- SQLite: search_docs 를 외부 content 로 쓰는 FTS5 가상 테이블 + 동기화 트리거
+- 기존 업무 / 보고를 한 번 색인
+"""
+from sqlalchemy import select, text
+
+from ..models import Task, Report
+from ..search import PG_VECTOR, doc_values, upsert_stmt
+
+VERSION = 4
+DESCRIPTION = "full-text search documents for tasks and reports"
+
+_BATCH = 500
+
+_SQLITE_DDL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+           title_tokens, body_tokens,
+           content='search_docs', content_rowid='rowid', tokenize='unicode61'
+       )""",
+    """CREATE TRIGGER IF NOT EXISTS search_docs_ai AFTER INSERT ON search_docs BEGIN
+           INSERT INTO search_fts(rowid, title_tokens, body_tokens)
+           VALUES (new.rowid, new.title_tokens, new.body_tokens);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS search_docs_ad AFTER DELETE ON search_docs BEGIN
+           INSERT INTO search_fts(search_fts, rowid, title_tokens, body_tokens)
+           VALUES ('delete', old.rowid, old.title_tokens, old.body_tokens);
+       END""",
+    """CREATE TRIGGER IF NOT EXISTS search_docs_au AFTER UPDATE ON search_docs BEGIN
+           INSERT INTO search_fts(search_fts, rowid, title_tokens, body_tokens)
+           VALUES ('delete', old.rowid, old.title_tokens, old.body_tokens);
+           INSERT INTO search_fts(rowid, title_tokens, body_tokens)
+           VALUES (new.rowid, new.title_tokens, new.body_tokens);
+       END""",
+)
+
+
+async def upgrade(conn) -> None:
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        await conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_search_docs_fts ON search_docs USING GIN ({PG_VECTOR})"
+        ))
+    else:
+        for ddl in _SQLITE_DDL:
+            await conn.execute(text(ddl))
+
+    for entity, q in (
+        ("tasks", select(Task.id, Task.title, Task.description)),
+        ("reports", select(Report.id, Report.task_id, Report.content)),
+    ):
+        rows = (await conn.execute(q)).mappings().all()
+        for i in range(0, len(rows), _BATCH):
+            docs = [doc_values(entity, dict(r)) for r in rows[i:i + _BATCH]]
+            await conn.execute(upsert_stmt(dialect, docs))
+
+    if dialect != "postgresql":
+        await conn.execute(text("INSERT INTO search_fts(search_fts) VALUES ('rebuild')"))
@@ -0,0 +1,22 @@
+"""
+완료 업무 보관함 (GET /tasks/archive) keyset 페이지용
+- status = 'done' 부분 인덱스: (updated_at, id), (dept_id, updated_at, id)
+- 상태 변경 버그로 completed_at 이 비어 있던 완료 업무는 updated_at 으로 채움
+  (기간 필터가 completed_at 기준이므로)
+"""
+from sqlalchemy import text
+from . import create_index
+
+VERSION = 5
+DESCRIPTION = "partial indexes for the done-task archive"
+
+
+async def upgrade(conn) -> None:
+    await create_index(conn, "ix_tasks_done_updated", "tasks", "updated_at, id",
+                       where="status = 'done'")
+    await create_index(conn, "ix_tasks_done_dept_updated", "tasks", "dept_id, updated_at, id",
+                       where="status = 'done'")
+    await conn.execute(text(
+        "UPDATE tasks SET completed_at = updated_at "
+        "WHERE status = 'done' AND completed_at IS NULL"
+    ))
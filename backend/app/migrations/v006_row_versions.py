@@ -0,0 +1,13 @@
+"""
+업무 / 보고 낙관적 잠금용 version 컬럼
+- 수정할 때마다 +1, If-Match 헤더의 버전과 다르면 409
+"""
+from . import add_column
+
+VERSION = 6
+DESCRIPTION = "version columns on tasks and reports"
+
+
+async def upgrade(conn) -> None:
+    for table in ("tasks", "reports"):
+        await add_column(conn, table, "version", "INTEGER NOT NULL DEFAULT 1")
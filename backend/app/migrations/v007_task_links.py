@@ -0,0 +1,25 @@
+"""
+업무 담당자 / 공유 부서 연결 표 (task_assignees, task_departments)
+- 표와 인덱스는 create_all 이 생성
+- 기존 업무의 assignee_ids / department_ids JSON 을 풀어 채움 (재실행 시 지우고 다시 채움)
+"""
+from sqlalchemy import select, delete
+
+from ..models import Task, TaskAssignee, TaskDepartment
+from ..task_links import sync_links
+
+VERSION = 7
+DESCRIPTION = "task_assignees / task_departments backfilled from JSON columns"
+
+_BATCH = 500
+
+
+async def upgrade(conn) -> None:
+    await conn.execute(delete(TaskAssignee))
+    await conn.execute(delete(TaskDepartment))
+    rows = (await conn.execute(
+        select(Task.id, Task.assignee_ids, Task.department_ids)
+        .where((Task.assignee_ids.is_not(None)) | (Task.department_ids.is_not(None)))
+    )).mappings().all()
+    for i in range(0, len(rows), _BATCH):
+        await sync_links(conn, [dict(r) for r in rows[i:i + _BATCH]])
@@ -0,0 +1,40 @@
+"""
+일일 보관함 summary_json 저장 형식 변경 (models.SummaryJSON)
+- PostgreSQL: Text → JSONB (부서 / 업무 일부만 DB 안에서 꺼내기 위해)
+- SQLite: 평문 JSON 문자열 → zlib 압축 바이트 (컬럼 선언은 그대로, 값만 다시 씀)
+"""
+import json
+from sqlalchemy import update, text, inspect
+from sqlalchemy.dialects.postgresql import JSONB
+
+from ..models import DailyRecord
+
+VERSION = 8
+DESCRIPTION = "daily_records.summary_json as JSONB / compressed"
+
+_BATCH = 200
+
+
+async def upgrade(conn) -> None:
+    if conn.dialect.name == "postgresql":
+        cols = await conn.run_sync(lambda c: inspect(c).get_columns("daily_records"))
+        col = next(c for c in cols if c["name"] == "summary_json")
+        if not isinstance(col["type"], JSONB):
+            await conn.execute(text(
+                "ALTER TABLE daily_records ALTER COLUMN summary_json TYPE JSONB "
+                "USING summary_json::jsonb"
+            ))
+        return
+
+    table = DailyRecord.__table__
+    while True:
+        rows = (await conn.execute(text(
+            "SELECT id, summary_json FROM daily_records "
+            "WHERE typeof(summary_json) = 'text' LIMIT :n"
+        ), {"n": _BATCH})).all()
+        if not rows:
+            break
+        for rid, raw in rows:
+            await conn.execute(
+                update(table).where(table.c.id == rid).values(summary_json=json.loads(raw))
+            )
@@ -0,0 +1,88 @@
+"""
+일일 보관함 부서별 건수 (daily_record_depts) - 추세 조회용
+- 표가 없으면 여기서 생성 (create_all 과 상관없이 이 버전 시점의 구조로)
+- 기존 보관함은 여기서 한 번만 summary_json 을 풀어 채움 (이후에는 저장할 때 같이 기록)
+- 표 / 컬럼 / 저장 형식 해석 / 건수 계산은 모두 이 버전 시점의 것을 고정해 둠
+  (모델이나 라우터 코드가 바뀌어도 마이그레이션 결과는 그대로)
+"""
+import json
+import zlib
+from sqlalchemy import table, column, select, delete, insert, text
+
+VERSION = 9
+DESCRIPTION = "per-department daily record counters"
+
+_BATCH = 100
+
+# ── 이 버전 시점의 표 (ORM 모델을 쓰지 않음) ───────────
+_daily_records = table(
+    "daily_records",
+    column("date"),
+    column("summary_json"),
+)
+_daily_record_depts = table(
+    "daily_record_depts",
+    column("date"),
+    column("dept_id"),
+    column("total"),
+    column("done"),
+    column("in_progress"),
+    column("not_started"),
+)
+
+_CREATE = """
+CREATE TABLE IF NOT EXISTS daily_record_depts (
+    date        VARCHAR(10) NOT NULL,
+    dept_id     VARCHAR(36) NOT NULL,
+    total       INTEGER,
+    done        INTEGER,
+    in_progress INTEGER,
+    not_started INTEGER,
+    PRIMARY KEY (date, dept_id)
+)
+"""
+
+
+def _decode(raw) -> dict:
+    """
+    저장된 summary_json → dict
+    - PostgreSQL JSONB: 드라이버가 dict 또는 JSON 문자열로 돌려줌
+    - SQLite: zlib 압축 바이트 (v008 이후) 또는 평문 JSON 문자열 (v008 이전)
+    """
+    if isinstance(raw, dict):
+        return raw
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        return json.loads(zlib.decompress(bytes(raw)))
+    return json.loads(raw)
+
+
+def _dept_counts(data: dict) -> list[dict]:
+    """보관함 JSON → daily_record_depts 행 (부서별 건수)"""
+    rows = []
+    for d in data["departments"]:
+        statuses = [t["status"] for t in d["tasks"]]
+        done, in_progress = statuses.count("done"), statuses.count("inProgress")
+        rows.append({
+            "date"       : data["date"],
+            "dept_id"    : d["dept_id"],
+            "total"      : len(statuses),
+            "done"       : done,
+            "in_progress": in_progress,
+            "not_started": len(statuses) - done - in_progress,
+        })
+    return rows
+
+
+async def upgrade(conn) -> None:
+    await conn.execute(text(_CREATE))
+    await conn.execute(delete(_daily_record_depts))
+    dates = (await conn.execute(
+        select(_daily_records.c.date).order_by(_daily_records.c.date)
+    )).scalars().all()
+    for i in range(0, len(dates), _BATCH):
+        rows = (await conn.execute(
+            select(_daily_records.c.summary_json).where(_daily_records.c.date.in_(dates[i:i + _BATCH]))
+        )).scalars().all()
+        counts = [c for raw in rows for c in _dept_counts(_decode(raw))]
+        if counts:
+            await conn.execute(insert(_daily_record_depts), counts)
@@ -0,0 +1,14 @@
+"""
+완료일 기간 조회용 인덱스
+- 보관함 from / to 는 기관 시간대 날짜를 UTC [start, end) 로 바꿔 completed_at 범위로 조회
+- status = 'done' 부분 인덱스 (completed_at)
+"""
+from . import create_index
+
+VERSION = 10
+DESCRIPTION = "partial index on completed_at for day-range archive filters"
+
+
+async def upgrade(conn) -> None:
+    await create_index(conn, "ix_tasks_done_completed", "tasks", "completed_at",
+                       where="status = 'done'")
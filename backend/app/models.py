@@ -2,11 +2,15 @@
 SQLAlchemy ORM 모델 (테이블 정의)
 """
 from datetime import datetime
+import json
+import zlib
 from sqlalchemy import (
-    String, Integer, Boolean, DateTime, Text,
-    ForeignKey, Enum as SAEnum
+    String, Integer, Boolean, DateTime, Text, LargeBinary,
+    ForeignKey, Index, Enum as SAEnum, text
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.types import TypeDecorator
 import enum
 from .database import Base
 
@@ -17,6 +21,33 @@ class UserRole(str, enum.Enum):
     user   = "user"
 
 
+class SummaryJSON(TypeDecorator):
+    """
+    보관함 요약 JSON (파이썬 쪽 값은 dict)
+    - PostgreSQL: JSONB → 부서 / 업무 일부만 DB 안에서 꺼낼 수 있음
+    - SQLite: zlib 압축 바이트 (예전에 저장한 평문 JSON 문자열도 그대로 읽음)
+    """
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        return zlib.compress(json.dumps(value, ensure_ascii=False).encode(), 6)
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name == "postgresql":
+            return value
+        if isinstance(value, str):
+            return json.loads(value)
+        return json.loads(zlib.decompress(value))
+
+
 class TaskStatus(str, enum.Enum):
     notStarted = "notStarted"
     inProgress = "inProgress"
@@ -41,6 +72,7 @@ class User(Base):
     dept_id     : Mapped[str | None] = mapped_column(String(36), ForeignKey("departments.id"), nullable=True)
     is_active   : Mapped[bool] = mapped_column(Boolean, default=True)
     created_at  : Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at  : Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
 
 # ── 부서 ───────────────────────────────────────────────
@@ -53,14 +85,30 @@ class Department(Base):
     description : Mapped[str]  = mapped_column(Text, default="")
     manager_name: Mapped[str | None] = mapped_column(String(100), nullable=True)
     created_at  : Mapped[datetime]   = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at  : Mapped[datetime]   = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     tasks: Mapped[list["Task"]] = relationship("Task", back_populates="department",
                                                cascade="all, delete-orphan")
 
 
 # ── 업무 ───────────────────────────────────────────────
+# 완료 업무 보관함용 부분 인덱스 조건
+_DONE = text("status = 'done'")
+
+
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_dept_hidden_created", "dept_id", "is_hidden", "created_at"),
+        Index("ix_tasks_status_updated", "status", "updated_at"),
+        Index("ix_tasks_hidden_created", "is_hidden", "created_at", "id"),
+        Index("ix_tasks_done_updated", "updated_at", "id",
+              postgresql_where=_DONE, sqlite_where=_DONE),
+        Index("ix_tasks_done_dept_updated", "dept_id", "updated_at", "id",
+              postgresql_where=_DONE, sqlite_where=_DONE),
+        Index("ix_tasks_done_completed", "completed_at",
+              postgresql_where=_DONE, sqlite_where=_DONE),
+    )
 
     id           : Mapped[str]  = mapped_column(String(36), primary_key=True)
     title        : Mapped[str]  = mapped_column(String(200), nullable=False)
@@ -76,8 +124,9 @@ class Task(Base):
     is_hidden    : Mapped[bool] = mapped_column(Boolean, default=False)  # 완료 후 보드에서 숨김 (보관함엔 유지)
     hidden_at    : Mapped[datetime | None] = mapped_column(DateTime, nullable=True)  # 숨긴 일시
     completed_at : Mapped[datetime | None] = mapped_column(DateTime, nullable=True)  # 완료 처리 일시
+    version      : Mapped[int]  = mapped_column(Integer, default=1, server_default="1")  # 수정마다 +1 (낙관적 잠금)
     created_at   : Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at   : Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at   : Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     department: Mapped["Department"] = relationship("Department", back_populates="tasks")
     reports   : Mapped[list["Report"]] = relationship("Report", back_populates="task",
@@ -87,13 +136,18 @@ class Task(Base):
 # ── 중간보고 ───────────────────────────────────────────
 class Report(Base):
     __tablename__ = "reports"
+    __table_args__ = (
+        Index("ix_reports_task_created", "task_id", "created_at"),
+        Index("ix_reports_created", "created_at"),
+    )
 
     id           : Mapped[str]  = mapped_column(String(36), primary_key=True)
     task_id      : Mapped[str]  = mapped_column(String(36), ForeignKey("tasks.id"), nullable=False)
     content      : Mapped[str]  = mapped_column(Text, nullable=False)
     reporter_name: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    version      : Mapped[int]        = mapped_column(Integer, default=1, server_default="1")  # 수정마다 +1
     created_at   : Mapped[datetime]   = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at   : Mapped[datetime]   = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at   : Mapped[datetime]   = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     task: Mapped["Task"] = relationship("Task", back_populates="reports")
 
@@ -102,13 +156,13 @@ class Report(Base):
 class DailyRecord(Base):
     """
     매일 자정 or 수동 저장 시 그날의 업무 현황을 별도 보관함에 영구 저장.
-    summary_json: 부서별 완료/진행 업무 목록 + 보고 내용 전체 (JSON)
+    summary_json: 부서별 완료/진행 업무 목록 + 보고 내용 전체 (dict, SummaryJSON 참고)
     """
     __tablename__ = "daily_records"
 
     id           : Mapped[str]  = mapped_column(String(36), primary_key=True)
     date         : Mapped[str]  = mapped_column(String(10), unique=True, nullable=False)  # "YYYY-MM-DD"
-    summary_json : Mapped[str]  = mapped_column(Text, nullable=False)   # 전체 내용 JSON
+    summary_json : Mapped[dict] = mapped_column(SummaryJSON, nullable=False)   # 전체 내용
     total_tasks  : Mapped[int]  = mapped_column(Integer, default=0)
     done_count   : Mapped[int]  = mapped_column(Integer, default=0)
     in_progress  : Mapped[int]  = mapped_column(Integer, default=0)
@@ -117,3 +171,110 @@ class DailyRecord(Base):
     saved_by     : Mapped[str]  = mapped_column(String(20), default="auto")  # "auto" or "manual"
     created_at   : Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at   : Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class DailyRecordDept(Base):
+    """
+    일일 보관함의 부서별 건수 (summary_json 을 풀지 않고 추세를 계산하기 위한 사본).
+    보관함을 저장할 때 같은 트랜잭션에서 그 날짜 행을 통째로 다시 씀
+    """
+    __tablename__ = "daily_record_depts"
+
+    date       : Mapped[str] = mapped_column(String(10), primary_key=True)   # "YYYY-MM-DD"
+    dept_id    : Mapped[str] = mapped_column(String(36), primary_key=True)
+    total      : Mapped[int] = mapped_column(Integer, default=0)
+    done       : Mapped[int] = mapped_column(Integer, default=0)
+    in_progress: Mapped[int] = mapped_column(Integer, default=0)
+    not_started: Mapped[int] = mapped_column(Integer, default=0)
+
+
+# ── 예약 작업 실행 기록 (app/scheduler.py) ─────────────
+class JobRun(Base):
+    """
+    작업별 마지막으로 처리한 날짜 + 실행 임대(lease) + 누적 지표.
+    서버가 멈춰 있던 날은 last_run_for 이후부터 다시 처리 (catch-up)
+    """
+    __tablename__ = "job_runs"
+
+    name            : Mapped[str]  = mapped_column(String(50), primary_key=True)
+    last_run_for    : Mapped[str]  = mapped_column(String(10), nullable=False)   # "YYYY-MM-DD"
+    lease_owner     : Mapped[str | None]      = mapped_column(String(64), nullable=True)
+    lease_until     : Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_status     : Mapped[str | None]      = mapped_column(String(20), nullable=True)   # ok / failed / timeout
+    last_error      : Mapped[str | None]      = mapped_column(Text, nullable=True)
+    last_started_at : Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_duration_ms: Mapped[int | None]      = mapped_column(Integer, nullable=True)
+    runs            : Mapped[int]  = mapped_column(Integer, default=0)
+    failures        : Mapped[int]  = mapped_column(Integer, default=0)
+
+
+# ── 동기화 초기화 시점 (가져오기 / 복원) ────────────────
+class SyncReset(Base):
+    """
+    백업 가져오기 / 복원은 updated_at 을 백업 값 그대로 두고 변경 허브도 거치지 않으므로
+    그 시점을 기록해 두고, 이보다 오래된 /sync/changes 토큰은 전체 재동기화(reset)로 처리
+    """
+    __tablename__ = "sync_resets"
+
+    id        : Mapped[str]      = mapped_column(String(36), primary_key=True)
+    reason    : Mapped[str]      = mapped_column(String(30), nullable=False)   # import / import_stream / restore
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+
+# ── 삭제 기록 (동기화용 tombstone) ─────────────────────
+class Tombstone(Base):
+    """
+    업무 / 보고 / 부서 / 사용자가 삭제되면 같은 트랜잭션에서 한 줄 기록.
+    /sync/changes 가 "since 이후 삭제된 항목" 을 알려줄 때 사용 (보존 기간 후 정리)
+    """
+    __tablename__ = "tombstones"
+
+    id         : Mapped[str]  = mapped_column(String(36), primary_key=True)
+    entity     : Mapped[str]  = mapped_column(String(20), nullable=False)   # tasks / reports / departments / users
+    entity_id  : Mapped[str]  = mapped_column(String(36), nullable=False)
+    dept_id    : Mapped[str | None] = mapped_column(String(36), nullable=True)
+    deleted_at : Mapped[datetime]   = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+
+# ── 검색 문서 (업무 / 보고 전문 검색용) ─────────────────
+class SearchDoc(Base):
+    """
+    업무 제목·내용, 보고 내용을 한국어 2-gram 토큰으로 미리 쪼개 둔 문서.
+    PostgreSQL: tsvector GIN 인덱스 / SQLite: FTS5 가상 테이블(search_fts) 이 이 표를 따라감.
+    (app/search.py 가 flush 때 자동 갱신)
+    """
+    __tablename__ = "search_docs"
+
+    id           : Mapped[str]  = mapped_column(String(36), primary_key=True)   # 업무 또는 보고 id
+    entity       : Mapped[str]  = mapped_column(String(10), nullable=False)     # tasks / reports
+    task_id      : Mapped[str]  = mapped_column(String(36), nullable=False, index=True)
+    title_tokens : Mapped[str]  = mapped_column(Text, default="")
+    body_tokens  : Mapped[str]  = mapped_column(Text, default="")
+    updated_at   : Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# ── 업무 담당자 / 공유 부서 (assignee_ids, department_ids JSON 의 색인용 사본) ─
+class TaskAssignee(Base):
+    """
+    Task.assignee_ids JSON 배열의 항목 하나당 한 줄 (app/task_links.py 가 자동 동기화).
+    현재 클라이언트는 사용자 id 대신 표시 이름을 넣기도 하므로 문자열 그대로 저장.
+    """
+    __tablename__ = "task_assignees"
+    __table_args__ = (
+        Index("ix_task_assignees_assignee", "assignee_id", "task_id"),
+    )
+
+    task_id    : Mapped[str] = mapped_column(String(36), ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    assignee_id: Mapped[str] = mapped_column(String(100), primary_key=True)
+
+
+class TaskDepartment(Base):
+    """Task.department_ids JSON 배열의 항목 하나당 한 줄 ("__ALL__" = 전체 공유)"""
+    __tablename__ = "task_departments"
+    __table_args__ = (
+        Index("ix_task_departments_dept", "dept_id", "task_id"),
+    )
+
+    task_id: Mapped[str] = mapped_column(String(36), ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    dept_id: Mapped[str] = mapped_column(String(36), primary_key=True)
@@ -0,0 +1,34 @@
+"""
+keyset(커서) 페이지네이션 도우미
+- 정렬 키 (시각, id) 의 마지막 값을 base64 로 감싼 불투명 커서 사용
+- 다음 페이지 커서는 응답 헤더 X-Next-Cursor 로 전달 (응답 본문은 기존 목록 형식 유지)
+"""
+import base64
+import json
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(ts: datetime, row_id: str) -> str:
+    raw = json.dumps([ts.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        ts, row_id = json.loads(raw)
+        return datetime.fromisoformat(ts), str(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+
+def after_cursor(ts_col, id_col, token: str, descending: bool = True):
+    """(ts_col, id_col) 정렬에서 커서 다음 행들만 고르는 WHERE 조건"""
+    ts, row_id = decode_cursor(token)
+    if descending:
+        return or_(ts_col < ts, and_(ts_col == ts, id_col < row_id))
+    return or_(ts_col > ts, and_(ts_col == ts, id_col > row_id))
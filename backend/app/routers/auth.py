@@ -7,7 +7,7 @@ from sqlalchemy import select
 from ..database import get_db
 from ..models import User
 from ..schemas import LoginRequest, TokenResponse, UserOut, ChangePasswordRequest
-from ..auth import verify_password, hash_password, create_token, get_current_user
+from ..auth import verify_password, hash_password, create_token, get_current_user, invalidate_user
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -49,4 +49,5 @@ async def change_password(
         raise HTTPException(status_code=400, detail="새 비밀번호를 입력하세요.")
     user.password = hash_password(body.new_password.strip())
     await db.commit()
+    invalidate_user(user.id)
     return {"ok": True}
@@ -1,90 +1,115 @@
 """
 데이터 백업 / 복원 라우터
-- GET  /backup/export  : 전체 데이터를 JSON으로 다운로드 (master 전용)
+- GET  /backup/export  : 전체 데이터를 JSON / NDJSON 스트리밍으로 다운로드 (master 전용, gzip 선택)
 - POST /backup/import  : JSON 데이터를 서버에 복원 (master 전용)
   * 기존 데이터는 삭제하지 않고 없는 것만 추가 (upsert)
+- POST /backup/import/stream : NDJSON(.gz) 본문을 읽는 대로 복원 (master 전용)
+- GET  /backup/status  : 백그라운드 백업 서비스 상태 (지연 시간, 마지막 성공 시각)
 """
 import json
+import os
+import zlib
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
-from ..database import get_db
-from ..models import User, Department, Task, Report, UserRole, TaskStatus, TaskPriority
-from ..auth import get_current_user, require_master
-from ..backup_manager import save_backup
+from sqlalchemy import select
+from ..database import get_db, db_registry
+from ..models import User
+from ..auth import require_master, user_cache
+from ..stats import stats_cache
+from ..daily_recorder import daily_recorder
+from ..events import event_broker
+from ..backup_manager import save_backup, backup_service, BACKUP_PATH, _serialize
+from ..importer import import_payload, NdjsonImporter, ORDER, MODELS
+from ..tombstones import record_sync_reset
 
 router = APIRouter(prefix="/backup", tags=["backup"])
 
 
-def _dt(s):
-    """문자열을 datetime으로 안전하게 변환"""
-    if not s:
-        return None
-    try:
-        return datetime.fromisoformat(s.replace("Z", "+00:00").replace("+00:00", ""))
-    except Exception:
-        return None
+# ── 전체 데이터 내보내기 (스트리밍) ───────────────────
+EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "1000"))
+
+
+async def _export_chunks(fmt: str):
+    """
+    테이블별로 서버 측 커서에서 EXPORT_BATCH_SIZE 행씩 읽어 문자열 조각을 생성.
+    - json  : 기존과 같은 {"exported_at":..., "departments":[...], ...} 모양
+    - ndjson: 한 줄 = {"entity": "tasks", "data": {...}} (첫 줄은 meta)
+    요청 세션은 응답 전송 전에 닫히므로 별도 세션 사용 (읽기 복제본이 있으면 복제본).
+    """
+    exported_at = datetime.utcnow().isoformat()
+    if fmt == "ndjson":
+        yield json.dumps({"entity": "meta", "exported_at": exported_at, "version": 1}) + "\n"
+    else:
+        yield "{" + f'"exported_at":{json.dumps(exported_at)}'
+
+    replica = await db_registry.pick()
+    async with db_registry.sessions(replica)() as db:
+        for entity in ORDER:
+            table = MODELS[entity].__table__
+            result = await db.stream(
+                select(table)
+                .order_by(table.c.created_at)
+                .execution_options(yield_per=EXPORT_BATCH_SIZE)
+            )
+            if fmt == "json":
+                yield f',"{entity}":['
+            first = True
+            async for rows in result.mappings().partitions():
+                if fmt == "ndjson":
+                    yield "".join(
+                        json.dumps({"entity": entity, "data": _serialize(r)},
+                                   ensure_ascii=False) + "\n"
+                        for r in rows
+                    )
+                else:
+                    part = ",".join(json.dumps(_serialize(r), ensure_ascii=False) for r in rows)
+                    yield part if first else "," + part
+                    first = False
+            if fmt == "json":
+                yield "]"
+
+    if fmt == "json":
+        yield "}"
+
+
+async def _gzip_chunks(chunks):
+    """문자열 조각을 받는 대로 gzip 압축해서 내보냄"""
+    z = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    async for chunk in chunks:
+        out = z.compress(chunk.encode("utf-8"))
+        if out:
+            yield out
+    yield z.flush()
+
+
+async def _encode_chunks(chunks):
+    async for chunk in chunks:
+        yield chunk.encode("utf-8")
 
 
-# ── 전체 데이터 내보내기 ─────────────────────────────
 @router.get("/export")
 async def export_all(
+    format : str  = Query("json", pattern="^(json|ndjson)$", description="json | ndjson"),
+    gzip   : bool = Query(False, description="True면 gzip 압축해서 전송"),
     _master: User = Depends(require_master),
-    db: AsyncSession = Depends(get_db),
 ):
-    """전체 DB 데이터를 JSON으로 반환 (master 전용)"""
-    users_r = await db.execute(select(User).order_by(User.created_at))
-    depts_r = await db.execute(select(Department).order_by(Department.created_at))
-    tasks_r = await db.execute(select(Task).order_by(Task.created_at))
-    reports_r = await db.execute(select(Report).order_by(Report.created_at))
-
-    def u2d(u: User):
-        return {
-            "id": u.id, "username": u.username, "password": u.password,
-            "display_name": u.display_name, "role": u.role.value,
-            "dept_id": u.dept_id, "is_active": u.is_active,
-            "created_at": u.created_at.isoformat() if u.created_at else None,
-        }
-
-    def d2d(d: Department):
-        return {
-            "id": d.id, "name": d.name, "emoji": d.emoji,
-            "description": d.description, "manager_name": d.manager_name,
-            "created_at": d.created_at.isoformat() if d.created_at else None,
-        }
-
-    def t2d(t: Task):
-        return {
-            "id": t.id, "title": t.title, "description": t.description,
-            "dept_id": t.dept_id, "department_ids": t.department_ids,
-            "status": t.status.value, "priority": t.priority.value,
-            "assignee_name": t.assignee_name, "assignee_ids": t.assignee_ids,
-            "start_date": t.start_date.isoformat() if t.start_date else None,
-            "due_date": t.due_date.isoformat() if t.due_date else None,
-            "is_hidden": t.is_hidden,
-            "hidden_at": t.hidden_at.isoformat() if t.hidden_at else None,
-            "created_at": t.created_at.isoformat() if t.created_at else None,
-            "updated_at": t.updated_at.isoformat() if t.updated_at else None,
-        }
-
-    def r2d(r: Report):
-        return {
-            "id": r.id, "task_id": r.task_id, "content": r.content,
-            "reporter_name": r.reporter_name,
-            "created_at": r.created_at.isoformat() if r.created_at else None,
-            "updated_at": r.updated_at.isoformat() if r.updated_at else None,
-        }
-
-    payload = {
-        "exported_at": datetime.utcnow().isoformat(),
-        "users": [u2d(u) for u in users_r.scalars()],
-        "departments": [d2d(d) for d in depts_r.scalars()],
-        "tasks": [t2d(t) for t in tasks_r.scalars()],
-        "reports": [r2d(r) for r in reports_r.scalars()],
-    }
-    return JSONResponse(content=payload)
+    """전체 DB 데이터를 스트리밍으로 반환 (master 전용, 메모리 사용량은 배치 크기만큼)"""
+    stamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+    filename = f"songwork-export-{stamp}.{format}"
+    chunks = _export_chunks(format)
+    if gzip:
+        body, media_type = _gzip_chunks(chunks), "application/gzip"
+        filename += ".gz"
+    else:
+        body = _encode_chunks(chunks)
+        media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 # ── 데이터 복원 (upsert) ────────────────────────────
@@ -96,115 +121,49 @@ async def import_all(
 ):
     """
     JSON 데이터를 DB에 복원합니다.
-    기존 ID와 같은 항목은 업데이트, 없는 항목은 새로 추가합니다.
+    기존 ID와 같은 항목은 업데이트, 없는 항목은 새로 추가합니다. (청크 단위 일괄 upsert)
     """
-    stats = {"users": 0, "departments": 0, "tasks": 0, "reports": 0}
-
-    # ── 부서 복원
-    for d in payload.get("departments", []):
-        existing = await db.get(Department, d["id"])
-        if existing:
-            existing.name = d["name"]
-            existing.emoji = d.get("emoji", "📁")
-            existing.description = d.get("description", "")
-            existing.manager_name = d.get("manager_name")
-        else:
-            db.add(Department(
-                id=d["id"], name=d["name"],
-                emoji=d.get("emoji", "📁"),
-                description=d.get("description", ""),
-                manager_name=d.get("manager_name"),
-                created_at=_dt(d.get("created_at")) or datetime.utcnow(),
-            ))
-        stats["departments"] += 1
-
-    await db.flush()
-
-    # ── 사용자 복원
-    for u in payload.get("users", []):
-        existing = await db.get(User, u["id"])
-        role = UserRole(u.get("role", "user"))
-        if existing:
-            existing.username = u["username"]
-            existing.password = u["password"]   # 해시 그대로 보존
-            existing.display_name = u["display_name"]
-            existing.role = role
-            existing.dept_id = u.get("dept_id")
-            existing.is_active = u.get("is_active", True)
-        else:
-            db.add(User(
-                id=u["id"], username=u["username"],
-                password=u["password"],
-                display_name=u["display_name"],
-                role=role,
-                dept_id=u.get("dept_id"),
-                is_active=u.get("is_active", True),
-                created_at=_dt(u.get("created_at")) or datetime.utcnow(),
-            ))
-        stats["users"] += 1
-
-    await db.flush()
-
-    # ── 업무 복원
-    for t in payload.get("tasks", []):
-        existing = await db.get(Task, t["id"])
-        status   = TaskStatus(t.get("status", "notStarted"))
-        priority = TaskPriority(t.get("priority", "medium"))
-        if existing:
-            existing.title          = t["title"]
-            existing.description    = t.get("description", "")
-            existing.dept_id        = t["dept_id"]
-            existing.department_ids = t.get("department_ids")
-            existing.status         = status
-            existing.priority       = priority
-            existing.assignee_name  = t.get("assignee_name")
-            existing.assignee_ids   = t.get("assignee_ids")
-            existing.start_date     = _dt(t.get("start_date"))
-            existing.due_date       = _dt(t.get("due_date"))
-            existing.is_hidden      = t.get("is_hidden", False)
-            existing.hidden_at      = _dt(t.get("hidden_at"))
-            existing.updated_at     = _dt(t.get("updated_at")) or datetime.utcnow()
-        else:
-            db.add(Task(
-                id=t["id"], title=t["title"],
-                description=t.get("description", ""),
-                dept_id=t["dept_id"],
-                department_ids=t.get("department_ids"),
-                status=status, priority=priority,
-                assignee_name=t.get("assignee_name"),
-                assignee_ids=t.get("assignee_ids"),
-                start_date=_dt(t.get("start_date")),
-                due_date=_dt(t.get("due_date")),
-                is_hidden=t.get("is_hidden", False),
-                hidden_at=_dt(t.get("hidden_at")),
-                created_at=_dt(t.get("created_at")) or datetime.utcnow(),
-                updated_at=_dt(t.get("updated_at")) or datetime.utcnow(),
-            ))
-        stats["tasks"] += 1
-
-    await db.flush()
-
-    # ── 보고 복원
-    for r in payload.get("reports", []):
-        existing = await db.get(Report, r["id"])
-        if existing:
-            existing.content       = r["content"]
-            existing.reporter_name = r.get("reporter_name")
-            existing.updated_at    = _dt(r.get("updated_at")) or datetime.utcnow()
-        else:
-            db.add(Report(
-                id=r["id"], task_id=r["task_id"],
-                content=r["content"],
-                reporter_name=r.get("reporter_name"),
-                created_at=_dt(r.get("created_at")) or datetime.utcnow(),
-                updated_at=_dt(r.get("updated_at")) or datetime.utcnow(),
-            ))
-        stats["reports"] += 1
-
+    result = await import_payload(db, payload)
+    await record_sync_reset(db, "import")
     await db.commit()
-    # 복원 후 즉시 백업 파일 갱신
-    await save_backup(db)
-    return {"ok": True, "restored": stats}
+    event_broker.reload("import")  # 연결된 클라이언트는 전체 다시 읽기
+    # 행 단위 journal 대신 전체 스냅샷 갱신 예약
+    backup_service.mark_dirty()
+    user_cache.clear()             # 가져온 사용자 정보로 다시 인증
+    stats_cache.clear()            # 가져오기는 변경 허브를 거치지 않음
+    db_registry.note_write()       # 복제본이 따라잡을 때까지 primary 에서 읽음
+    daily_recorder.mark_stale()
+    return {"ok": True, **result}
+
+
+# ── 스트리밍 복원 (NDJSON, gzip 자동 판별) ────────────
+@router.post("/import/stream")
+async def import_stream(
+    request: Request,
+    _master: User = Depends(require_master),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    /backup/export?format=ndjson 결과(또는 .gz)를 요청 본문으로 받아
+    읽는 대로 청크 단위 upsert 합니다. 전체를 메모리에 올리지 않습니다.
+    """
+    importer = NdjsonImporter(db)
+    try:
+        async for data in request.stream():
+            await importer.feed(data)
+        result = await importer.finish()
+    except (ValueError, zlib.error) as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    await record_sync_reset(db, "import_stream")
+    await db.commit()
+    event_broker.reload("import")
+    backup_service.mark_dirty()
+    user_cache.clear()             # 가져온 사용자 정보로 다시 인증
+    stats_cache.clear()            # 가져오기는 변경 허브를 거치지 않음
+    db_registry.note_write()       # 복제본이 따라잡을 때까지 primary 에서 읽음
+    daily_recorder.mark_stale()
+    return {"ok": True, **result}
 
 
 # ── 현재 DB를 파일로 즉시 저장 ────────────────────────
@@ -213,8 +172,7 @@ async def save_now(
     _master: User = Depends(require_master),
     db: AsyncSession = Depends(get_db),
 ):
-    """현재 DB 상태를 backup.json 파일로 즉시 저장 (master 전용)"""
-    from ..backup_manager import BACKUP_PATH
+    """현재 DB 상태를 backup.json 기준 스냅샷으로 즉시 저장 + journal 정리 (master 전용)"""
     ok = await save_backup(db)
     return {
         "ok": ok,
@@ -222,3 +180,16 @@ async def save_now(
         "backup_exists": BACKUP_PATH.exists(),
         "backup_size_bytes": BACKUP_PATH.stat().st_size if BACKUP_PATH.exists() else 0,
     }
+
+
+# ── 백그라운드 백업 상태 ──────────────────────────────
+@router.get("/status")
+async def backup_status(
+    _master: User = Depends(require_master),
+):
+    """debounce 백업 서비스의 대기 여부 / 지연 / 마지막 성공 시각 (master 전용)"""
+    return {
+        **backup_service.status(),
+        "backup_file": str(BACKUP_PATH),
+        "backup_exists": BACKUP_PATH.exists(),
+    }
@@ -1,28 +1,157 @@
 """
 일일 보관함 라우터
+- 오늘 기록은 변경될 때마다 증분 갱신 (app/daily_recorder.py), 자정에는 봉인만
 - 매일 자정 자동 저장 (scheduler)
+- 날짜는 기관 시간대 (ORG_TIMEZONE) 기준, 조회는 UTC [start, end) 구간 (app/clock.py)
 - 수동 저장 (POST /daily-records/save)
 - 목록 조회 (GET /daily-records/)
 - 상세 조회 (GET /daily-records/{date})
 - 삭제     (DELETE /daily-records/{date})
+- 기간 일괄 재생성 (POST /daily-records/backfill, GET /daily-records/backfill/{job_id})
+- 추세 (GET /daily-records/trends)
 """
-import json
-from datetime import datetime, date as dt_date
+import asyncio
+import logging
+import os
+import time as _time
+from collections import OrderedDict
+from datetime import datetime, date as dt_date, timedelta
+from itertools import groupby
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, delete, insert, and_, or_, exists, text, bindparam, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import selectinload, noload, defer
 from uuid import uuid4
 
-from ..database import get_db
-from ..models import User, Task, Department, Report, DailyRecord, TaskStatus
-from ..schemas import DailyRecordOut, DailyRecordListItem
-from ..auth import get_current_user
+from .. import clock
+from ..database import get_db, get_read_db, AsyncSessionLocal
+from ..models import User, Task, Department, Report, DailyRecord, DailyRecordDept, TaskStatus
+from ..schemas import DailyRecordOut, DailyRecordListItem, BackfillJobOut, TrendsOut
+from ..auth import get_current_user, require_master
+from ..trends import compute_trends
+
+logger = logging.getLogger(__name__)
+
+# 기간 재생성: 한 번에 받을 최대 일수 / 동시에 저장할 세션 수 / 세션 하나가 저장할 일수
+BACKFILL_MAX_DAYS    = int(os.environ.get("BACKFILL_MAX_DAYS", "1100"))
+BACKFILL_CONCURRENCY = int(os.environ.get("BACKFILL_CONCURRENCY", "4"))
+BACKFILL_CHUNK_DAYS  = int(os.environ.get("BACKFILL_CHUNK_DAYS", "31"))
 
 router = APIRouter(prefix="/daily-records", tags=["daily-records"])
 
 
+# ── 하루치 대상 업무 조회 (단일 쿼리) ────────────────
+async def _load_day_tasks(
+    db: AsyncSession,
+    day_start: datetime,
+    day_end: datetime,
+) -> list[tuple[Department, list[Task]]]:
+    """
+    [day_start, day_end) 구간 기준으로
+      - 완료된 모든 업무
+      - 해당 구간에 보고가 있는 업무
+    를 한 번의 쿼리로 가져와 부서 순서대로 묶어 반환.
+    각 업무의 reports 에는 해당 구간의 보고만 로드됨.
+    """
+    in_day = and_(Report.created_at >= day_start, Report.created_at < day_end)
+    q = (
+        select(Task, Department)
+        .join(Department, Task.dept_id == Department.id)
+        .where(or_(
+            Task.status == TaskStatus.done,
+            exists().where(Report.task_id == Task.id, in_day),
+        ))
+        .options(selectinload(Task.reports.and_(in_day)))
+        .order_by(Department.created_at, Department.id, Task.created_at, Task.id)
+    )
+    rows = (await db.execute(q)).all()
+    return [
+        (dept, [t for t, _ in group])
+        for dept, group in groupby(rows, key=lambda row: row[1])
+    ]
+
+
 # ── 핵심: 특정 날짜의 업무 현황을 JSON으로 빌드 ────────
+def _report_entry(r: Report) -> dict:
+    return {
+        "id": r.id,
+        "content": r.content,
+        "reporter_name": r.reporter_name,
+        "created_at": r.created_at.isoformat(),
+    }
+
+
+def _task_entry(t: Task, reports: list[Report] | None = None) -> dict:
+    """업무 한 건 (reports 생략 시 t.reports = 그 날 보고만). created_at 은 증분 갱신 때 정렬용"""
+    reports = t.reports if reports is None else reports
+    return {
+        "id"           : t.id,
+        "title"        : t.title,
+        "description"  : t.description,
+        "status"       : t.status.value,
+        "priority"     : t.priority.value,
+        "assignee_name": t.assignee_name,
+        "due_date"     : t.due_date.isoformat() if t.due_date else None,
+        "created_at"   : t.created_at.isoformat(),
+        "reports"      : [_report_entry(r) for r in sorted(reports, key=lambda r: r.created_at)],
+    }
+
+
+def _dept_entry(dept: Department) -> dict:
+    return {
+        "dept_id"     : dept.id,
+        "dept_name"   : dept.name,
+        "dept_emoji"  : dept.emoji,
+        "manager_name": dept.manager_name,
+        "tasks"       : [],
+    }
+
+
+def _count_record(data: dict) -> dict:
+    """부서 / 업무 목록으로 합계 필드를 다시 채움 (DB 조회 없음)"""
+    counts = {"done": 0, "inProgress": 0, "notStarted": 0}
+    for d in data["departments"]:
+        for t in d["tasks"]:
+            counts[t["status"]] = counts.get(t["status"], 0) + 1
+    data["total_tasks"] = sum(counts.values())
+    data["done_count"]  = counts["done"]
+    data["in_progress"] = counts["inProgress"]
+    data["not_started"] = data["total_tasks"] - counts["done"] - counts["inProgress"]
+    data["dept_count"]  = len(data["departments"])
+    return data
+
+
+def _dept_counts(data: dict) -> list[dict]:
+    """보관함 JSON → daily_record_depts 행 (부서별 건수)"""
+    rows = []
+    for d in data["departments"]:
+        statuses = [t["status"] for t in d["tasks"]]
+        done, in_progress = statuses.count("done"), statuses.count("inProgress")
+        rows.append({
+            "date"       : data["date"],
+            "dept_id"    : d["dept_id"],
+            "total"      : len(statuses),
+            "done"       : done,
+            "in_progress": in_progress,
+            "not_started": len(statuses) - done - in_progress,
+        })
+    return rows
+
+
+def _assemble_record(
+    target_date: dt_date,
+    groups: list[tuple[Department, list[Task]]],
+) -> dict:
+    """부서별로 묶인 업무 (reports = 그 날 보고만) → 보관함 JSON 구조"""
+    dept_list = []
+    for dept, day_tasks in groups:
+        entry = _dept_entry(dept)
+        entry["tasks"] = [_task_entry(t) for t in day_tasks]
+        dept_list.append(entry)
+    return _count_record({"date": target_date.isoformat(), "departments": dept_list})
+
+
 async def _build_record_data(target_date: dt_date, db: AsyncSession) -> dict:
     """
     target_date 기준으로
@@ -30,104 +159,30 @@ async def _build_record_data(target_date: dt_date, db: AsyncSession) -> dict:
       - 해당 날짜에 보고가 있는 진행 중 업무
     를 부서별로 묶어 JSON 구조를 반환
     """
-    depts_result = await db.execute(select(Department).order_by(Department.created_at))
-    depts = depts_result.scalars().all()
-
-    dept_list = []
-    total_tasks = 0
-    done_count = 0
-    in_progress_count = 0
-    not_started_count = 0
-
-    for dept in depts:
-        q = (
-            select(Task)
-            .options(selectinload(Task.reports))
-            .where(Task.dept_id == dept.id)
-        )
-        tasks_result = await db.execute(q)
-        all_tasks = tasks_result.scalars().all()
-
-        day_tasks = []
-        for t in all_tasks:
-            is_done = t.status == TaskStatus.done
-            has_report_today = any(
-                r.created_at.year  == target_date.year  and
-                r.created_at.month == target_date.month and
-                r.created_at.day   == target_date.day
-                for r in t.reports
-            )
-            if is_done or has_report_today:
-                day_tasks.append(t)
-
-        if day_tasks:
-            tasks_json = []
-            for t in day_tasks:
-                today_reports = [
-                    {
-                        "id": r.id,
-                        "content": r.content,
-                        "reporter_name": r.reporter_name,
-                        "created_at": r.created_at.isoformat(),
-                    }
-                    for r in t.reports
-                    if r.created_at.year  == target_date.year  and
-                       r.created_at.month == target_date.month and
-                       r.created_at.day   == target_date.day
-                ]
-                tasks_json.append({
-                    "id"           : t.id,
-                    "title"        : t.title,
-                    "description"  : t.description,
-                    "status"       : t.status.value,
-                    "priority"     : t.priority.value,
-                    "assignee_name": t.assignee_name,
-                    "due_date"     : t.due_date.isoformat() if t.due_date else None,
-                    "reports"      : today_reports,
-                })
-                total_tasks += 1
-                if t.status.value == "done":
-                    done_count += 1
-                elif t.status.value == "inProgress":
-                    in_progress_count += 1
-                else:
-                    not_started_count += 1
-
-            dept_list.append({
-                "dept_id"     : dept.id,
-                "dept_name"   : dept.name,
-                "dept_emoji"  : dept.emoji,
-                "manager_name": dept.manager_name,
-                "tasks"       : tasks_json,
-            })
-
-    return {
-        "date"        : target_date.isoformat(),
-        "departments" : dept_list,
-        "total_tasks" : total_tasks,
-        "done_count"  : done_count,
-        "in_progress" : in_progress_count,
-        "not_started" : not_started_count,
-        "dept_count"  : len(dept_list),
-    }
+    groups = await _load_day_tasks(db, *clock.day_range(target_date))
+    return _assemble_record(target_date, groups)
 
 
 # ── 내부 저장 함수 (자동/수동 공용) ──────────────────
-async def _upsert_record(
-    target_date: dt_date,
+async def _save_record_data(
+    data: dict,
     saved_by: str,
     db: AsyncSession,
+    record: DailyRecord | None = None,
+    lookup: bool = True,
 ) -> DailyRecord:
-    data = await _build_record_data(target_date, db)
-
-    # 이미 있으면 덮어쓰기
-    result = await db.execute(
-        select(DailyRecord).where(DailyRecord.date == data["date"])
-    )
-    record = result.scalar_one_or_none()
+    """
+    보관함 JSON 을 그 날짜 행에 덮어쓰기 (없으면 생성). 커밋은 호출한 쪽에서.
+    이미 조회한 행(또는 없음을 확인했으면 lookup=False)을 넘기면 다시 조회하지 않음
+    """
+    if record is None and lookup:
+        result = await db.execute(
+            select(DailyRecord).where(DailyRecord.date == data["date"])
+        )
+        record = result.scalar_one_or_none()
 
     if record:
-        record.summary_json = json.dumps(data, ensure_ascii=False)
+        record.summary_json = data
         record.total_tasks  = data["total_tasks"]
         record.done_count   = data["done_count"]
         record.in_progress  = data["in_progress"]
@@ -139,7 +194,7 @@ async def _upsert_record(
         record = DailyRecord(
             id           = str(uuid4()),
             date         = data["date"],
-            summary_json = json.dumps(data, ensure_ascii=False),
+            summary_json = data,
             total_tasks  = data["total_tasks"],
             done_count   = data["done_count"],
             in_progress  = data["in_progress"],
@@ -151,6 +206,22 @@ async def _upsert_record(
         )
         db.add(record)
 
+    # 부서별 건수 사본 (추세 계산용)
+    await db.execute(delete(DailyRecordDept).where(DailyRecordDept.date == data["date"]))
+    counts = _dept_counts(data)
+    if counts:
+        await db.execute(insert(DailyRecordDept), counts)
+    return record
+
+
+async def _upsert_record(
+    target_date: dt_date,
+    saved_by: str,
+    db: AsyncSession,
+) -> DailyRecord:
+    """그 날짜 보관함을 처음부터 다시 만들어 저장 (전체 재계산)"""
+    data = await _build_record_data(target_date, db)
+    record = await _save_record_data(data, saved_by, db)
     await db.commit()
     await db.refresh(record)
     return record
@@ -160,33 +231,206 @@ async def _upsert_record(
 @router.post("/save", response_model=DailyRecordOut)
 async def save_record(
     target_date: str | None = Query(None, description="YYYY-MM-DD (기본값: 오늘)"),
+    rebuild    : bool = Query(False, description="True면 오늘 기록도 처음부터 다시 계산"),
     current    : User = Depends(get_current_user),
     db         : AsyncSession = Depends(get_db),
 ):
-    """오늘(또는 지정 날짜)의 업무 현황을 보관함에 저장"""
+    """
+    오늘(또는 지정 날짜)의 업무 현황을 보관함에 저장.
+    오늘 기록은 변경될 때마다 증분 갱신되고 있으므로 밀린 변경만 반영해 저장하고,
+    지난 날짜나 rebuild=true 일 때만 전체를 다시 계산한다.
+    """
     if target_date:
         try:
             parsed = datetime.strptime(target_date, "%Y-%m-%d").date()
         except ValueError:
             raise HTTPException(status_code=400, detail="날짜 형식은 YYYY-MM-DD 입니다.")
     else:
-        parsed = datetime.utcnow().date()
+        parsed = clock.today()
 
-    record = await _upsert_record(parsed, "manual", db)
+    from ..daily_recorder import daily_recorder
+    if parsed == clock.today() and not rebuild:
+        record = await daily_recorder.save(parsed, "manual")
+    else:
+        record = await _upsert_record(parsed, "manual", db)
     return DailyRecordOut.model_validate(record)
 
 
+# ── 기간 일괄 재생성 (backfill) ───────────────────────
+# job_id → 진행 상태 (이 프로세스 메모리, 최근 작업만 보관)
+_backfill_jobs : OrderedDict[str, dict] = OrderedDict()
+_backfill_tasks: set[asyncio.Task] = set()
+_BACKFILL_KEEP = 20
+
+
+async def _load_range(
+    db: AsyncSession,
+    start: datetime,
+    end: datetime,
+) -> tuple[list[tuple[Department, list[Task]]], dict[dt_date, dict[str, list[Report]]]]:
+    """
+    기간 전체를 한 번에 조회 (날짜마다 다시 훑지 않음)
+      - 완료 업무 + 기간 안에 보고가 있는 업무 (부서 순서대로 묶음, 보고는 따로)
+      - 기간 안의 보고 → 날짜 → 업무 id 별 목록
+    """
+    in_range = and_(Report.created_at >= start, Report.created_at < end)
+    rows = (await db.execute(
+        select(Task, Department)
+        .join(Department, Task.dept_id == Department.id)
+        .where(or_(
+            Task.status == TaskStatus.done,
+            exists().where(Report.task_id == Task.id, in_range),
+        ))
+        .options(noload(Task.reports))
+        .order_by(Department.created_at, Department.id, Task.created_at, Task.id)
+    )).all()
+    groups = [
+        (dept, [t for t, _ in group])
+        for dept, group in groupby(rows, key=lambda row: row[1])
+    ]
+    by_day: dict[dt_date, dict[str, list[Report]]] = {}
+    for r in (await db.execute(select(Report).where(in_range))).scalars():
+        by_day.setdefault(clock.local_date(r.created_at), {}).setdefault(r.task_id, []).append(r)
+    return groups, by_day
+
+
+def _record_for_day(
+    day: dt_date,
+    groups: list[tuple[Department, list[Task]]],
+    day_reports: dict[str, list[Report]],
+) -> dict:
+    """_load_range 결과에서 하루치 보관함 JSON (_build_record_data 와 같은 내용)"""
+    dept_list = []
+    for dept, tasks in groups:
+        entry = _dept_entry(dept)
+        entry["tasks"] = [
+            _task_entry(t, day_reports.get(t.id, []))
+            for t in tasks
+            if t.status == TaskStatus.done or t.id in day_reports
+        ]
+        if entry["tasks"]:
+            dept_list.append(entry)
+    return _count_record({"date": day.isoformat(), "departments": dept_list})
+
+
+async def _save_days(
+    days: list[dt_date],
+    groups: list[tuple[Department, list[Task]]],
+    by_day: dict[dt_date, dict[str, list[Report]]],
+    job: dict,
+) -> None:
+    """날짜 묶음 하나를 별도 세션 / 트랜잭션으로 저장"""
+    async with AsyncSessionLocal() as db:
+        existing = {r.date: r for r in (await db.execute(
+            select(DailyRecord).where(DailyRecord.date.in_([d.isoformat() for d in days]))
+        )).scalars()}
+        for day in days:
+            data = _record_for_day(day, groups, by_day.get(day, {}))
+            await _save_record_data(data, "backfill", db, existing.get(data["date"]), lookup=False)
+            await asyncio.sleep(0)       # 긴 기간도 다른 요청을 막지 않게
+        await db.commit()
+    job["done_days"] += len(days)
+
+
+async def _run_backfill(job: dict, first: dt_date, last: dt_date) -> None:
+    started = _time.perf_counter()
+    try:
+        start, end = clock.day_range(first, last)
+        async with AsyncSessionLocal() as db:
+            groups, by_day = await _load_range(db, start, end)
+            # SQLite 는 쓰기 연결이 하나뿐이므로 나눠 저장하되 차례로
+            sqlite = db.get_bind().dialect.name == "sqlite"
+
+        days = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+        chunks = [days[i:i + BACKFILL_CHUNK_DAYS] for i in range(0, len(days), BACKFILL_CHUNK_DAYS)]
+        limit = asyncio.Semaphore(1 if sqlite else max(1, BACKFILL_CONCURRENCY))
+        errors = []
+
+        async def save(chunk: list[dt_date]) -> None:
+            async with limit:
+                try:
+                    await _save_days(chunk, groups, by_day, job)
+                except Exception as e:
+                    job["failed_days"] += len(chunk)
+                    errors.append(f"{chunk[0]}~{chunk[-1]}: {e}")
+
+        await asyncio.gather(*(save(c) for c in chunks))
+        job["status"] = "failed" if errors else "done"
+        job["error"]  = "; ".join(errors)[:1000] or None
+    except Exception as e:
+        job["status"] = "failed"
+        job["error"]  = str(e)[:1000]
+    job["finished_at"] = datetime.utcnow()
+    job["elapsed_ms"]  = round((_time.perf_counter() - started) * 1000, 1)
+    icon = "✅" if job["status"] == "done" else "❌"
+    logger.info(f"{icon} [daily] 보관함 재생성 {first}~{last}: "
+                f"{job['done_days']}/{job['days']}일, {job['elapsed_ms']}ms")
+
+
+@router.post("/backfill", response_model=BackfillJobOut, status_code=202)
+async def start_backfill(
+    date_from: dt_date = Query(..., alias="from", description="시작 날짜 (포함, YYYY-MM-DD)"),
+    date_to  : dt_date = Query(..., alias="to",   description="끝 날짜 (포함, YYYY-MM-DD)"),
+    _master  : User = Depends(require_master),
+):
+    """
+    기간의 모든 날짜 보관함을 다시 만드는 작업 시작 (master 전용).
+    업무 / 보고는 기간 전체를 한 번만 조회해 날짜별로 나누고, 저장은 여러 세션으로 나눠 병렬 처리.
+    진행 상황은 GET /daily-records/backfill/{job_id} 로 확인
+    """
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="시작 날짜가 끝 날짜보다 늦습니다.")
+    days = (date_to - date_from).days + 1
+    if days > BACKFILL_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {BACKFILL_MAX_DAYS}일까지 재생성할 수 있습니다.")
+    if any(j["status"] == "running" for j in _backfill_jobs.values()):
+        raise HTTPException(status_code=409, detail="이미 진행 중인 재생성 작업이 있습니다.")
+
+    job = {
+        "job_id"     : str(uuid4()),
+        "status"     : "running",
+        "date_from"  : date_from.isoformat(),
+        "date_to"    : date_to.isoformat(),
+        "days"       : days,
+        "done_days"  : 0,
+        "failed_days": 0,
+        "started_at" : datetime.utcnow(),
+        "finished_at": None,
+        "elapsed_ms" : None,
+        "error"      : None,
+    }
+    _backfill_jobs[job["job_id"]] = job
+    while len(_backfill_jobs) > _BACKFILL_KEEP:
+        _backfill_jobs.popitem(last=False)
+    task = asyncio.create_task(_run_backfill(job, date_from, date_to))
+    _backfill_tasks.add(task)
+    task.add_done_callback(_backfill_tasks.discard)
+    return BackfillJobOut(**job)
+
+
+@router.get("/backfill/{job_id}", response_model=BackfillJobOut)
+async def backfill_status(
+    job_id : str,
+    _master: User = Depends(require_master),
+):
+    job = _backfill_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="재생성 작업을 찾을 수 없습니다.")
+    return BackfillJobOut(**job)
+
+
 # ── 목록 조회 ──────────────────────────────────────────
 @router.get("/", response_model=list[DailyRecordListItem])
 async def list_records(
     limit  : int = Query(60, ge=1, le=365),
     offset : int = Query(0, ge=0),
     _      : User = Depends(get_current_user),
-    db     : AsyncSession = Depends(get_db),
+    db     : AsyncSession = Depends(get_read_db),
 ):
     """저장된 보관함 목록 (최신순)"""
     q = (
         select(DailyRecord)
+        .options(defer(DailyRecord.summary_json))     # 목록에는 본문 불필요 (압축 해제 / JSONB 전송 생략)
         .order_by(DailyRecord.date.desc())
         .limit(limit)
         .offset(offset)
@@ -195,21 +439,142 @@ async def list_records(
     return [DailyRecordListItem.model_validate(r) for r in result.scalars()]
 
 
+# ── 추세 (상세 조회보다 먼저 등록해야 /{record_date} 에 잡히지 않음) ──
+@router.get("/trends", response_model=TrendsOut)
+async def trends(
+    date_from: dt_date = Query(..., alias="from", description="시작 날짜 (포함, YYYY-MM-DD)"),
+    date_to  : dt_date = Query(..., alias="to",   description="끝 날짜 (포함, YYYY-MM-DD)"),
+    window   : int     = Query(7, ge=1, le=90, description="이동 평균 창 (기록이 있는 날 수)"),
+    _        : User = Depends(get_current_user),
+    db       : AsyncSession = Depends(get_read_db),
+):
+    """
+    완료율 / 이동 완료율, 처리량(전날 대비 완료 증가) / 이동 평균, 미완료 증감, 부서별 처리량.
+    합계 컬럼과 부서별 건수 표만 읽음 (summary_json 은 풀지 않음)
+    """
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="시작 날짜가 끝 날짜보다 늦습니다.")
+    if (date_to - date_from).days + 1 > BACKFILL_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {BACKFILL_MAX_DAYS}일까지 조회할 수 있습니다.")
+    data = await compute_trends(db, date_from.isoformat(), date_to.isoformat(), window)
+    return TrendsOut(window=window, **data)
+
+
 # ── 상세 조회 (날짜로) ─────────────────────────────────
+# fields= 로 고를 수 있는 업무 필드 (_task_entry 의 키)
+_TASK_FIELDS = ("id", "title", "description", "status", "priority",
+                "assignee_name", "due_date", "created_at", "reports")
+
+# PostgreSQL: JSONB 안에서 부서 / 업무를 걸러 필요한 부분만 꺼냄 ({task} / {task_where} / {dept_where} 채움)
+_PG_PARTIAL = """
+SELECT jsonb_set(r.summary_json, '{{departments}}', coalesce((
+    SELECT jsonb_agg(jsonb_set(x.d, '{{tasks}}', coalesce((
+               SELECT jsonb_agg({task} ORDER BY t.ord)
+               FROM jsonb_array_elements(x.d->'tasks') WITH ORDINALITY AS t(v, ord)
+               WHERE {task_where}
+           ), '[]'::jsonb)) ORDER BY x.ord)
+    FROM jsonb_array_elements(r.summary_json->'departments') WITH ORDINALITY AS x(d, ord)
+    WHERE {dept_where}
+), '[]'::jsonb))
+FROM daily_records r
+WHERE r.date = :date
+"""
+
+
+def _filter_summary(
+    data: dict,
+    dept_ids: list[str] | None,
+    statuses: list[str] | None,
+    fields: list[str] | None,
+) -> dict:
+    """(SQLite) 부서 / 상태로 거르고 업무 필드만 남김. 상태로 걸러 업무가 없는 부서는 뺌"""
+    depts = []
+    for d in data.get("departments", []):
+        if dept_ids and d["dept_id"] not in dept_ids:
+            continue
+        tasks = [t for t in d["tasks"] if not statuses or t.get("status") in statuses]
+        if fields:
+            tasks = [{k: t[k] for k in fields if k in t} for t in tasks]
+        if tasks or not statuses:
+            depts.append({**d, "tasks": tasks})
+    return {**data, "departments": depts}
+
+
+async def _pg_partial(
+    db: AsyncSession,
+    record_date: str,
+    dept_ids: list[str] | None,
+    statuses: list[str] | None,
+    fields: list[str] | None,
+) -> dict:
+    params = {"date": record_date}
+    task, task_where, dept_where = "t.v", "TRUE", "TRUE"
+    if fields:
+        task = ("(SELECT jsonb_object_agg(e.key, e.value) FROM jsonb_each(t.v) e "
+                "WHERE e.key = ANY(:fields))")
+        params["fields"] = fields
+    if statuses:
+        task_where = "t.v->>'status' = ANY(:statuses)"
+        params["statuses"] = statuses
+    if dept_ids:
+        dept_where = "x.d->>'dept_id' = ANY(:dept_ids)"
+        params["dept_ids"] = dept_ids
+    sql = text(_PG_PARTIAL.format(task=task, task_where=task_where, dept_where=dept_where))
+    sql = sql.bindparams(*(bindparam(k, type_=ARRAY(String)) for k in params if k != "date"))
+    data = (await db.execute(sql, params)).scalar_one()
+    if statuses:
+        data["departments"] = [d for d in data["departments"] if d["tasks"]]
+    return data
+
+
+def _split(values: list[str] | None) -> list[str] | None:
+    """?x=a,b 와 ?x=a&x=b 모두 허용"""
+    if not values:
+        return None
+    out = [v.strip() for item in values for v in item.split(",") if v.strip()]
+    return list(dict.fromkeys(out)) or None
+
+
 @router.get("/{record_date}", response_model=DailyRecordOut)
 async def get_record(
     record_date: str,
+    dept_id    : list[str] | None = Query(None, description="이 부서들만 (여러 개 가능)"),
+    status     : list[str] | None = Query(None, description="이 상태의 업무만 (notStarted/inProgress/done)"),
+    fields     : str | None       = Query(None, description="업무 필드만 골라서, 예: id,title,status"),
     _          : User = Depends(get_current_user),
-    db         : AsyncSession = Depends(get_db),
+    db         : AsyncSession = Depends(get_read_db),
 ):
-    """특정 날짜의 보관함 상세 내용"""
-    result = await db.execute(
-        select(DailyRecord).where(DailyRecord.date == record_date)
-    )
-    record = result.scalar_one_or_none()
+    """
+    특정 날짜의 보관함 상세 내용.
+    dept_id / status / fields 를 주면 그 부분만 잘라서 summary_json 으로 내려줌
+    (PostgreSQL 은 DB 안에서 JSONB 를 걸러 꺼냄, 합계 컬럼은 그 날 전체 기준 그대로)
+    """
+    dept_ids = _split(dept_id)
+    statuses = _split(status)
+    field_list = _split([fields] if fields else None)
+    if statuses and any(s not in TaskStatus.__members__ for s in statuses):
+        raise HTTPException(status_code=400, detail="알 수 없는 업무 상태입니다.")
+    if field_list and any(f not in _TASK_FIELDS for f in field_list):
+        raise HTTPException(status_code=400,
+                            detail=f"fields 는 다음 중에서 고르세요: {', '.join(_TASK_FIELDS)}")
+    partial = bool(dept_ids or statuses or field_list)
+    pg = db.get_bind().dialect.name == "postgresql"
+
+    q = select(DailyRecord).where(DailyRecord.date == record_date)
+    if partial and pg:
+        q = q.options(defer(DailyRecord.summary_json))
+    record = (await db.execute(q)).scalar_one_or_none()
     if not record:
         raise HTTPException(status_code=404, detail="해당 날짜의 보관 기록이 없습니다.")
-    return DailyRecordOut.model_validate(record)
+    if not partial:
+        return DailyRecordOut.model_validate(record)
+
+    if pg:
+        summary = await _pg_partial(db, record_date, dept_ids, statuses, field_list)
+    else:
+        summary = _filter_summary(record.summary_json, dept_ids, statuses, field_list)
+    out = {c.key: getattr(record, c.key) for c in DailyRecord.__table__.c if c.key != "summary_json"}
+    return DailyRecordOut(**out, summary_json=summary)
 
 
 # ── 삭제 ───────────────────────────────────────────────
@@ -226,5 +591,6 @@ async def delete_record(
     if not record:
         raise HTTPException(status_code=404, detail="해당 날짜의 보관 기록이 없습니다.")
     await db.delete(record)
+    await db.execute(delete(DailyRecordDept).where(DailyRecordDept.date == record_date))
     await db.commit()
     return {"ok": True}
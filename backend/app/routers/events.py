@@ -0,0 +1,66 @@
+"""
+실시간 변경 알림 (Server-Sent Events)
+- GET /events/stream?dept_id=...&token=...
+  * 커밋된 업무 / 보고 / 부서 / 일일 기록 변경마다 event: change 전송
+    data: {"entity", "op", "id", "version", "dept_ids"}  (보고는 task_id 포함)
+  * dept_id 를 주면 그 부서 관련 변경 + 전체 대상 변경만 전송
+  * 너무 밀려서 이벤트를 버리면 event: resync 후 종료 → /sync/changes 로 따라잡기
+  * 백업 가져오기 / 복원 후에는 event: reload (data: {"reason"}) → 전체 다시 읽기 (연결은 유지)
+"""
+import asyncio
+import json
+import os
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from ..models import User
+from ..auth import get_stream_user
+from ..events import event_broker
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+# 프록시가 유휴 연결을 끊지 않도록 보내는 주석 줄 간격 (초)
+EVENTS_KEEPALIVE_SECONDS = float(os.environ.get("EVENTS_KEEPALIVE_SECONDS", "15"))
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
+
+
+@router.get("/stream")
+async def stream_events(
+    dept_id: str | None = Query(None, description="이 부서 관련 변경만 받기"),
+    user   : User = Depends(get_stream_user),
+):
+    sub = event_broker.subscribe(dept_id)
+
+    async def _gen():
+        try:
+            yield "retry: 3000\n\n"
+            yield _sse("ready", {"dept_id": dept_id})
+            while True:
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), timeout=EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if sub.overflow:
+                        yield _sse("resync", {"reason": "overflow"})
+                        return
+                    yield ": ping\n\n"
+                    continue
+                if event is None:            # 서버 종료
+                    return
+                if event.get("op") == "reload":
+                    yield _sse("reload", {"reason": event.get("reason")})
+                else:
+                    yield _sse("change", event)
+                if sub.overflow and sub.queue.empty():
+                    yield _sse("resync", {"reason": "overflow"})
+                    return
+        finally:
+            event_broker.unsubscribe(sub)
+
+    return StreamingResponse(
+        _gen(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
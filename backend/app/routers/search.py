@@ -0,0 +1,102 @@
+"""
+업무 / 보고 전문 검색
+- GET /search?q=...&dept_id=&status=&include_hidden=&limit=&offset=
+- /search/ 도 같은 핸들러 (리다이렉트 없이)
+- 한국어 2-gram 색인(search_docs)에서 찾고 관련도 순으로 정렬
+  (업무 제목 일치가 본문 / 보고 일치보다 높게)
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, text, literal_column, Float, Integer
+
+from ..database import get_read_db
+from ..models import User, Task, Report, SearchDoc, TaskStatus
+from ..schemas import SearchHit, SearchResult
+from ..auth import get_current_user
+from ..search import PG_VECTOR, query_terms, pg_tsquery, fts5_query
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+_SNIPPET_CHARS = 80
+
+# bm25 가중치: 제목 토큰, 본문 토큰
+_FTS5_SCORE = "-bm25(search_fts, 4.0, 1.0)"
+
+
+def _snippet(text_: str, q: str) -> str:
+    """검색어가 처음 나오는 곳 주변을 잘라 반환 (없으면 앞부분)"""
+    text_ = (text_ or "").replace("\n", " ").strip()
+    lower = text_.lower()
+    pos = -1
+    for word in q.lower().split():
+        pos = lower.find(word)
+        if pos >= 0:
+            break
+    start = max(0, pos - _SNIPPET_CHARS // 4) if pos >= 0 else 0
+    cut = text_[start:start + _SNIPPET_CHARS]
+    return ("…" if start > 0 else "") + cut + ("…" if start + _SNIPPET_CHARS < len(text_) else "")
+
+
+def _ranked(db: AsyncSession, q: str):
+    """search_docs 행 + 관련도(score) select. 검색어에 토큰이 없으면 None"""
+    terms = query_terms(q)
+    if not terms:
+        return None
+    if db.get_bind().dialect.name == "postgresql":
+        vector = literal_column(PG_VECTOR)
+        tsq = func.to_tsquery(literal_column("'simple'::regconfig"), pg_tsquery(terms))
+        return (select(SearchDoc, func.ts_rank(vector, tsq).label("score"))
+                .where(vector.op("@@")(tsq)))
+    fts = (
+        text(f"SELECT rowid AS rid, {_FTS5_SCORE} AS score FROM search_fts WHERE search_fts MATCH :m")
+        .bindparams(m=fts5_query(terms))
+        .columns(rid=Integer, score=Float)
+        .subquery("fts")
+    )
+    return (select(SearchDoc, fts.c.score)
+            .join(fts, fts.c.rid == literal_column("search_docs.rowid")))
+
+
+@router.get("", response_model=SearchResult)
+@router.get("/", response_model=SearchResult, include_in_schema=False)
+async def search(
+    q              : str = Query(..., min_length=1, max_length=200, description="검색어"),
+    dept_id        : str | None = Query(None),
+    status         : TaskStatus | None = Query(None),
+    include_hidden : bool = Query(False, description="True면 숨긴 업무도 포함"),
+    limit          : int = Query(20, ge=1, le=100),
+    offset         : int = Query(0, ge=0, le=10_000),
+    _              : User = Depends(get_current_user),
+    db             : AsyncSession = Depends(get_read_db),
+):
+    ranked = _ranked(db, q)
+    if ranked is None:
+        raise HTTPException(status_code=400, detail="검색어에 글자나 숫자가 없습니다.")
+
+    sub = ranked.subquery("ranked")
+    stmt = (
+        select(sub, Task.title.label("task_title"), Task.description, Task.dept_id, Task.status,
+               Report.content)
+        .join(Task, Task.id == sub.c.task_id)
+        .outerjoin(Report, Report.id == sub.c.id)
+    )
+    if dept_id:
+        stmt = stmt.where(Task.dept_id == dept_id)
+    if status:
+        stmt = stmt.where(Task.status == status)
+    if not include_hidden:
+        stmt = stmt.where(Task.is_hidden == False)
+    stmt = stmt.order_by(sub.c.score.desc(), sub.c.id).offset(offset).limit(limit + 1)
+
+    rows = (await db.execute(stmt)).mappings().all()
+    more = len(rows) > limit
+    items = []
+    for r in rows[:limit]:
+        body = r["content"] if r["entity"] == "reports" else (r["description"] or r["task_title"])
+        items.append(SearchHit(
+            entity=r["entity"], id=r["id"], task_id=r["task_id"],
+            task_title=r["task_title"], dept_id=r["dept_id"], status=r["status"],
+            snippet=_snippet(body, q), score=round(float(r["score"] or 0), 6),
+            updated_at=r["updated_at"],
+        ))
+    return SearchResult(items=items, next_offset=offset + limit if more else None)
@@ -0,0 +1,36 @@
+"""
+대시보드 통계 라우터
+- GET /stats/overview : 부서 / 상태 / 우선순위별 건수, 기한 초과, 이번 주 마감
+  (클라이언트가 전체 업무를 내려받아 세던 것을 DB 집계 + 메모리 캐시로 대체)
+"""
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_db
+from ..models import User
+from ..schemas import StatsOverview
+from ..auth import get_current_user
+from ..stats import stats_cache, compute_overview
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/overview", response_model=StatsOverview)
+async def overview(
+    include_hidden: bool       = Query(False, description="True면 숨긴 업무도 포함"),
+    assignee_id   : str | None = Query(None, max_length=100, description="이 담당자의 업무만"),
+    _             : User       = Depends(get_current_user),
+    db            : AsyncSession = Depends(get_db),
+):
+    key = (include_hidden, assignee_id)
+    cached = stats_cache.get(key)
+    if cached is not None:
+        return StatsOverview(**cached, cached=True)
+
+    version = stats_cache.data_version
+    now = datetime.utcnow()
+    result = {**await compute_overview(db, include_hidden, assignee_id, now),
+              "data_version": version, "generated_at": now}
+    stats_cache.put(key, result, version)
+    return StatsOverview(**result, cached=False)
@@ -0,0 +1,90 @@
+"""
+증분 동기화 라우터
+- GET /sync/changes?since=<token> : token 이후 생성/수정/삭제된 업무·보고·부서·사용자만 반환
+  * since 없이 호출하면 전체 데이터 + reset=true
+  * 응답의 token 을 다음 호출의 since 로 사용
+  * 토큰 발급 이후 백업 가져오기 / 복원이 있었으면 (updated_at 으로는 알 수 없음) 전체 + reset=true
+"""
+import base64
+import json
+import os
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.orm import noload
+
+from ..database import get_db
+from ..models import User, Department, Task, Report, Tombstone
+from ..schemas import TaskOut, ReportOut, DeptOut, UserOut
+from ..auth import get_current_user
+from ..tombstones import SYNC_ENTITIES, TOMBSTONE_RETENTION_DAYS, last_sync_reset
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+# 커밋이 늦게 끝난 트랜잭션의 updated_at 이 토큰보다 앞설 수 있으므로
+# since 보다 이만큼 앞에서부터 다시 조회 (클라이언트는 id 기준으로 덮어쓰면 됨)
+SYNC_OVERLAP_SECONDS = float(os.environ.get("SYNC_OVERLAP_SECONDS", "5"))
+
+
+def _encode_token(ts: datetime) -> str:
+    raw = json.dumps({"t": ts.isoformat()}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_token(token: str) -> datetime:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        return datetime.fromisoformat(json.loads(raw)["t"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="잘못된 동기화 토큰입니다.")
+
+
+@router.get("/changes")
+async def changes_since(
+    since: str | None = Query(None, description="이전 응답의 token (없으면 전체)"),
+    _    : User = Depends(get_current_user),
+    db   : AsyncSession = Depends(get_db),
+):
+    now = datetime.utcnow()
+    cutoff = None
+    if since:
+        cutoff = _decode_token(since) - timedelta(seconds=SYNC_OVERLAP_SECONDS)
+        # 삭제 기록 보존 기간보다 오래된 토큰 → 삭제를 놓쳤을 수 있으니 전체 재동기화
+        if cutoff < now - timedelta(days=TOMBSTONE_RETENTION_DAYS):
+            cutoff = None
+        # 그 사이 가져오기 / 복원 → 백업의 (예전) updated_at 으로 덮인 행을 놓치므로 전체 재동기화
+        reset_at = await last_sync_reset(db) if cutoff is not None else None
+        if reset_at is not None and reset_at >= cutoff:
+            cutoff = None
+
+    def changed(model, q=None):
+        q = q if q is not None else select(model)
+        if cutoff is not None:
+            q = q.where(model.updated_at >= cutoff)
+        return q.order_by(model.updated_at, model.id)
+
+    depts   = (await db.execute(changed(Department))).scalars()
+    users   = (await db.execute(changed(User))).scalars()
+    tasks   = (await db.execute(changed(Task, select(Task).options(noload(Task.reports))))).scalars()
+    reports = (await db.execute(changed(Report))).scalars()
+
+    deleted = {e: [] for e in SYNC_ENTITIES}
+    if cutoff is not None:
+        rows = await db.execute(
+            select(Tombstone.entity, Tombstone.entity_id)
+            .where(Tombstone.deleted_at >= cutoff)
+            .order_by(Tombstone.deleted_at)
+        )
+        for entity, entity_id in rows.all():
+            deleted[entity].append(entity_id)
+
+    return {
+        "token"      : _encode_token(now),
+        "reset"      : cutoff is None,
+        "departments": [DeptOut.model_validate(d) for d in depts],
+        "users"      : [UserOut.model_validate(u) for u in users],
+        "tasks"      : [TaskOut.model_validate(t) for t in tasks],
+        "reports"    : [ReportOut.model_validate(r) for r in reports],
+        "deleted"    : deleted,
+    }
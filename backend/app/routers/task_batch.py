@@ -0,0 +1,236 @@
+"""
+업무 일괄 변경 (POST /tasks/batch)
+- create / update / status / hide / unhide / delete 를 한 요청, 한 트랜잭션, 한 번의 커밋으로 처리
+- 같은 변경끼리 묶어 집합 단위 UPDATE / DELETE (항목마다 조회·커밋하지 않음)
+- 적용 순서: 생성 → 수정 → 상태 → 숨김/복원 → 삭제 (같은 업무에 여러 작업이 있으면 이 순서)
+- 생성 / 수정의 dept_id 는 부서 표에서 한 번에 확인 (없는 부서면 그 항목만 404)
+- 항목마다 version (요청 전 버전) 을 보내면 단건 수정의 If-Match 처럼 다를 때 409 로 실패
+  (대상 행은 FOR UPDATE 로 잠가 확인 ~ 적용 사이에 다른 요청이 끼어들지 못하게)
+- atomic 에서 하나라도 실패하면 아무것도 적용하지 않고, 나머지 항목도 ok=false (취소) 로 응답
+- Core 문장으로 바꾼 행은 변경 허브 / 삭제 기록 / 검색 색인 / 담당자·공유 부서 표에 직접 반영
+"""
+import json
+from datetime import datetime
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, func
+
+from .. import changes
+from ..database import get_db
+from ..models import User, Task, Report, TaskStatus, Department
+from ..schemas import (
+    TaskCreate, TaskUpdate, TaskBatchRequest, TaskBatchResult, TaskBatchItem,
+)
+from ..auth import get_current_user
+from ..search import index_rows, unindex
+from ..task_links import sync_links, unlink
+from ..tombstones import add_tombstones
+from .tasks import _task_query, _task_outs, _new_task, _status_values, changed_clause
+
+router = APIRouter(prefix="/tasks", tags=["tasks"])
+
+_COLUMNS = tuple(Task.__table__.c)
+
+
+class _Invalid(Exception):
+    def __init__(self, msg: str, code: int = 400):
+        super().__init__(msg)
+        self.code = code
+
+
+def _fail(items: list[TaskBatchItem], i: int, msg: str, code: int | None = 400) -> None:
+    items[i].ok = False
+    items[i].error = msg
+    items[i].code = code
+
+
+def _update_values(data: dict) -> tuple[dict, TaskStatus | None]:
+    """TaskUpdate 필드 → UPDATE 값 (상태는 상태 단계로 넘김)"""
+    body = TaskUpdate.model_validate(data)
+    values = body.model_dump(exclude_unset=True, exclude_none=True)
+    status = values.pop("status", None)
+    if "title" in values:
+        values["title"] = values["title"].strip()
+    return values, status
+
+
+async def _apply_update(db: AsyncSession, ids: list[str], values: dict, now: datetime) -> list[dict]:
+    """
+    UPDATE ... RETURNING (버전 +1) 결과를 변경 허브에 등록하고 행 반환.
+    값이 이미 같은 업무는 건드리지 않음 (버전 / updated_at 유지, 반환 행에도 없음)
+    """
+    stmt = (update(Task)
+            .where(Task.id.in_(ids), changed_clause(Task, values))
+            .values(**values, version=Task.version + 1, updated_at=now)
+            .returning(*_COLUMNS)
+            .execution_options(synchronize_session=False))
+    rows = [dict(r) for r in (await db.execute(stmt)).mappings()]
+    changes.record(db, "tasks", "update", rows)
+    return rows
+
+
+@router.post("/batch", response_model=TaskBatchResult)
+async def batch_tasks(
+    body   : TaskBatchRequest,
+    current: User = Depends(get_current_user),
+    db     : AsyncSession = Depends(get_db),
+):
+    items = [TaskBatchItem(index=i, op=o.op, id=o.id, ok=True) for i, o in enumerate(body.ops)]
+
+    # ── 1. 검증 + 대상 업무 현재 상태 한 번에 조회 ──
+    ref_ids = {o.id for o in body.ops if o.op != "create" and o.id}
+    current_rows = {}
+    versions     = {}
+    if ref_ids:
+        stmt = select(Task.id, Task.status, Task.version).where(Task.id.in_(ref_ids))
+        if any(o.version is not None for o in body.ops):
+            stmt = stmt.with_for_update()
+        rows = (await db.execute(stmt)).all()
+        current_rows = {r.id: r.status for r in rows}
+        versions     = {r.id: r.version for r in rows}
+
+    creates : list[tuple[int, Task]] = []
+    updates : dict[str, tuple[dict, list[int]]] = {}   # 같은 변경 내용 → 항목 번호들
+    statuses: dict[TaskStatus, list[int]] = {}
+    hides   : list[int] = []
+    unhides : list[int] = []
+    deletes : list[int] = []
+    status_after = dict(current_rows)                    # 상태 단계 이후 예상 상태 (숨김 검증용)
+    dept_refs: list[tuple[int, str]] = []                # (항목 번호, 지정한 부서)
+
+    for i, o in enumerate(body.ops):
+        try:
+            if o.op == "create":
+                data = TaskCreate.model_validate(o.data or {})
+                task = _new_task(data, datetime.utcnow())
+                if data.dept_id:
+                    dept_refs.append((i, data.dept_id))
+                items[i].id = task.id
+                creates.append((i, task))
+                continue
+
+            if not o.id or o.id not in current_rows:
+                raise _Invalid("업무를 찾을 수 없습니다.", 404)
+            if o.version is not None and o.version != versions[o.id]:
+                raise _Invalid(
+                    f"다른 사용자가 먼저 수정했습니다. 새로고침 후 다시 시도하세요. (현재 버전 {versions[o.id]})",
+                    409,
+                )
+            if o.op == "update":
+                values, new_status = _update_values(o.data or {})
+                if values.get("dept_id"):
+                    dept_refs.append((i, values["dept_id"]))
+                if values:
+                    key = json.dumps(values, sort_keys=True, default=str)
+                    updates.setdefault(key, (values, []))[1].append(i)
+                if new_status is not None:
+                    statuses.setdefault(new_status, []).append(i)
+                    status_after[o.id] = new_status
+            elif o.op == "status":
+                if o.status is None:
+                    raise _Invalid("변경할 상태(status)가 필요합니다.")
+                statuses.setdefault(o.status, []).append(i)
+                status_after[o.id] = o.status
+            elif o.op == "hide":
+                hides.append(i)
+            elif o.op == "unhide":
+                unhides.append(i)
+            else:
+                deletes.append(i)
+        except ValidationError as e:
+            _fail(items, i, f"입력값 오류: {e.errors()[0].get('msg', '')}", 422)
+        except _Invalid as e:
+            _fail(items, i, str(e), e.code)
+
+    if dept_refs:
+        found = set((await db.execute(
+            select(Department.id).where(Department.id.in_({d for _, d in dept_refs}))
+        )).scalars())
+        for i, dept_id in dept_refs:
+            if items[i].ok and dept_id not in found:
+                _fail(items, i, "부서를 찾을 수 없습니다.", 404)
+                items[i].id = body.ops[i].id          # 만들지 않은 업무 id 는 돌려주지 않음
+
+    for i in hides:
+        if status_after.get(body.ops[i].id) != TaskStatus.done:
+            _fail(items, i, "완료 상태인 업무만 숨길 수 있습니다.")
+
+    if body.atomic and not all(it.ok for it in items):
+        # 아무것도 적용하지 않음 → 검증을 통과한 항목도 취소로 표시 (생성 예정 id 도 돌려주지 않음)
+        for i, it in enumerate(items):
+            if it.ok:
+                _fail(items, i, "다른 항목이 실패해 적용하지 않았습니다.", None)
+                it.id = body.ops[i].id
+        # 버전 충돌 때문이면 단건 수정과 같은 409
+        return JSONResponse(
+            status_code=409 if any(it.code == 409 for it in items) else 400,
+            content=TaskBatchResult(ok=False, applied=0, results=items).model_dump(mode="json"),
+        )
+
+    def ok_ids(indexes: list[int]) -> list[str]:
+        return list(dict.fromkeys(body.ops[i].id for i in indexes if items[i].ok))
+
+    # ── 2. 적용 (한 트랜잭션) ──
+    now = datetime.utcnow()
+    new_tasks = [t for i, t in creates if items[i].ok]
+    if new_tasks:
+        db.add_all(new_tasks)
+        await db.flush()
+
+    for values, indexes in updates.values():
+        ids = ok_ids(indexes)
+        if not ids:
+            continue
+        rows = await _apply_update(db, ids, values, now)
+        if "title" in values or "description" in values:
+            await index_rows(db, "tasks", rows)
+        if "assignee_ids" in values or "department_ids" in values:
+            await sync_links(db, rows)
+
+    for status, indexes in statuses.items():
+        ids = ok_ids(indexes)
+        if not ids:
+            continue
+        await _apply_update(db, ids, _status_values(status, now), now)
+
+    if ok_ids(hides):
+        await _apply_update(db, ok_ids(hides),
+                            {"is_hidden": True, "hidden_at": func.coalesce(Task.hidden_at, now)}, now)
+    if ok_ids(unhides):
+        await _apply_update(db, ok_ids(unhides), {"is_hidden": False, "hidden_at": None}, now)
+
+    deleted_ids = ok_ids(deletes)
+    if deleted_ids:
+        # 보고 → 업무 순서 (FK), 지운 행은 삭제 기록 / 검색 색인 / 변경 허브에 반영
+        rep_rows = (await db.execute(
+            delete(Report).where(Report.task_id.in_(deleted_ids))
+            .returning(Report.id, Report.task_id, Report.updated_at)
+        )).mappings().all()
+        task_rows = (await db.execute(
+            delete(Task).where(Task.id.in_(deleted_ids)).returning(*_COLUMNS)
+        )).mappings().all()
+        dept_of = {r["id"]: r["dept_id"] for r in task_rows}
+        await add_tombstones(db, "reports", [(r["id"], dept_of.get(r["task_id"])) for r in rep_rows])
+        await add_tombstones(db, "tasks", [(r["id"], r["dept_id"]) for r in task_rows])
+        await unindex(db, deleted_ids)
+        await unlink(db, deleted_ids)
+        changes.record(db, "reports", "delete", [dict(r) for r in rep_rows])
+        changes.record(db, "tasks", "delete", [dict(r) for r in task_rows])
+
+    await db.commit()
+
+    # ── 3. 결과 (남아 있는 업무는 최종 상태로 한 번에 조회) ──
+    alive = {it.id for it in items if it.ok and it.op != "delete"} - set(deleted_ids)
+    if alive:
+        tasks = list((await db.execute(
+            _task_query(body.include_reports).where(Task.id.in_(alive))
+            .execution_options(populate_existing=True)
+        )).scalars())
+        outs = {o.id: o for o in await _task_outs(db, tasks, body.include_reports)}
+        for it in items:
+            if it.ok and it.op != "delete":
+                it.task = outs.get(it.id)
+    return TaskBatchResult(ok=all(it.ok for it in items), applied=sum(it.ok for it in items),
+                           results=items)
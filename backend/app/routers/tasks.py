@@ -1,209 +1,444 @@
 """
 업무 + 중간보고 라우터
 """
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime, timedelta, date
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, func, case, literal_column, or_
+from sqlalchemy.orm import selectinload, noload, aliased
 from uuid import uuid4
-from ..database import get_db
-from ..models import User, Task, Report, TaskStatus
+from .. import changes, clock
+from ..database import get_db, get_read_db
+from ..models import User, Task, Report, TaskStatus, TaskAssignee, TaskDepartment
 from ..schemas import (
     TaskCreate, TaskUpdate, TaskOut,
     ReportCreate, ReportUpdate, ReportOut,
     DailyReportDept, DeptOut,
 )
 from ..auth import get_current_user
-from ..backup_manager import save_backup
+from ..pagination import NEXT_CURSOR_HEADER, encode_cursor, after_cursor
+from ..search import index_rows
+from ..task_links import ALL_DEPTS, sync_links
+from .daily_records import _load_day_tasks
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
+# ── 보고 포함 방식 ────────────────────────────────────
+# all   : 모든 보고 (기존 동작)
+# none  : 보고 제외
+# count : 업무별 보고 개수만 (report_count)
+# latest: 최근 보고 N개만
+# summary: 보고 본문 없이 report_count / last_report_at / 최근 보고 미리보기만
+#          (전체 본문은 GET /tasks/{id}/reports 로 필요할 때 조회)
+REPORT_MODES = "^(all|none|count|latest|summary)$"
+
+# summary 모드 미리보기 길이 (글자)
+REPORT_PREVIEW_CHARS = 80
+
+
+# 보관함 조건: 바인드 파라미터 대신 리터럴로 써야 status = 'done' 부분 인덱스를 탐
+_ARCHIVED = Task.status == literal_column("'done'")
+
+
+def _status_values(status, now: datetime) -> dict:
+    """
+    상태 변경 UPDATE 값. 완료로 바뀌면 completed_at 기록 (이미 완료였으면 유지),
+    완료가 아니면 초기화.
+    """
+    try:
+        new_status = TaskStatus(status)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="올바르지 않은 업무 상태입니다.")
+    if new_status == TaskStatus.done:
+        completed = case((Task.status == TaskStatus.done, func.coalesce(Task.completed_at, now)),
+                         else_=now)
+    else:
+        completed = None
+    return {"status": new_status, "completed_at": completed}
+
+
+def _new_task(body: TaskCreate, now: datetime) -> Task:
+    """새 업무 행 (단건 / 일괄 생성 공용). 완료 상태로 만들면 completed_at 도 기록"""
+    return Task(
+        id=str(uuid4()),
+        title=body.title.strip(),
+        description=body.description,
+        dept_id=body.dept_id,
+        department_ids=body.department_ids,
+        status=body.status,
+        priority=body.priority,
+        assignee_name=body.assignee_name,
+        assignee_ids=body.assignee_ids,
+        start_date=body.start_date,
+        due_date=body.due_date,
+        is_hidden=False,
+        completed_at=now if body.status == TaskStatus.done else None,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+# ── 낙관적 잠금 (If-Match: 버전) ──────────────────────
+def expected_version(if_match: str | None = Header(None)) -> int | None:
+    """If-Match 헤더의 버전 (없으면 버전 확인 없이 덮어씀)"""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    try:
+        return int(if_match.strip().removeprefix("W/").strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="If-Match 헤더는 버전 숫자여야 합니다.")
+
+
+def changed_clause(model, values: dict):
+    """values 중 하나라도 현재 값과 다른 행만 (같은 값으로 덮어쓸 때는 버전 / updated_at 유지)"""
+    return or_(*(getattr(model, k).is_distinct_from(v) for k, v in values.items()))
+
+
+async def _after_update(db: AsyncSession, model, values: dict, row: dict) -> None:
+    """실제로 바뀐 행의 검색 색인 / 연결 표 (같은 트랜잭션, 해당 필드가 바뀐 경우만)"""
+    if model is Task:
+        if "title" in values or "description" in values:
+            await index_rows(db, "tasks", [row])
+        if "assignee_ids" in values or "department_ids" in values:
+            await sync_links(db, [row])
+    elif "content" in values:
+        await index_rows(db, "reports", [row])
+
+
+async def _conditional_update(
+    db: AsyncSession,
+    model,
+    where: list,
+    values: dict,
+    version: int | None,
+    not_found: str,
+) -> dict | None:
+    """
+    UPDATE ... WHERE 조건 [AND version = ?] AND (값이 다른 열이 있음) RETURNING * 로 수정하고 버전을 올린다.
+    검색 색인 / 연결 표는 그 필드가 실제로 바뀐 경우에만 같은 트랜잭션에서 추가 문장으로 갱신.
+    바꿀 값이 없거나 모두 지금 값과 같으면 UPDATE 없이 현재 행을 그대로 반환 (버전 유지).
+    갱신된 행이 없으면 이유를 확인해서 404 / 409, 그 밖의 조건 불일치면 None.
+    """
+    if values:
+        stmt = (
+            update(model)
+            .where(*where, changed_clause(model, values))
+            .values(**values, version=model.version + 1, updated_at=datetime.utcnow())
+            .returning(*model.__table__.c)
+            .execution_options(synchronize_session=False)
+        )
+        if version is not None:
+            stmt = stmt.where(model.version == version)
+        row = (await db.execute(stmt)).mappings().one_or_none()
+        if row is not None:
+            row = dict(row)
+            changes.record(db, model.__tablename__, "update", [row])
+            await _after_update(db, model, values, row)
+            return row
+
+    # 바뀐 것이 없음 (조건은 맞음) → 현재 행 그대로
+    unchanged = (await db.execute(
+        select(*model.__table__.c).where(*where)
+    )).mappings().one_or_none()
+    if unchanged is not None and (version is None or unchanged["version"] == version):
+        return dict(unchanged)
+
+    current = (await db.execute(select(model.version).where(*where[:1]))).scalar_one_or_none()
+    if current is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    if version is not None and current != version:
+        raise HTTPException(
+            status_code=409,
+            detail=f"다른 사용자가 먼저 수정했습니다. 새로고침 후 다시 시도하세요. (현재 버전 {current})",
+        )
+    return None
+
+
+def _task_query(include_reports: str):
+    if include_reports == "all":
+        return select(Task).options(selectinload(Task.reports))
+    return select(Task).options(noload(Task.reports))
+
+
+async def _task_outs(
+    db: AsyncSession,
+    tasks: list,
+    include_reports: str,
+    latest_reports: int = 3,
+    reports_loaded: bool = True,
+) -> list[TaskOut]:
+    """
+    업무 목록 (ORM 객체 또는 RETURNING 행) → TaskOut.
+    보고는 모드에 맞게 해당 업무들 것만 한 번에 조회
+    (reports_loaded=True 면 all 모드는 이미 selectinload 된 것으로 봄)
+    """
+    outs = [TaskOut.model_validate(t) for t in tasks]
+    ids  = [o.id for o in outs]
+    if not ids or include_reports == "none" or (include_reports == "all" and reports_loaded):
+        return outs
+
+    by_id = {o.id: o for o in outs}
+    if include_reports == "all":
+        rows = await db.execute(
+            select(Report).where(Report.task_id.in_(ids)).order_by(Report.created_at, Report.id)
+        )
+        for r in rows.scalars():
+            by_id[r.task_id].reports.append(ReportOut.model_validate(r))
+    elif include_reports == "summary":
+        # 업무별 최신 보고 1건 + 전체 개수를 한 번에 (창 함수)
+        cnt = func.count().over(partition_by=Report.task_id).label("cnt")
+        rn  = func.row_number().over(
+            partition_by=Report.task_id,
+            order_by=(Report.created_at.desc(), Report.id.desc()),
+        ).label("rn")
+        ranked = (
+            select(Report.task_id, Report.created_at,
+                   func.substr(Report.content, 1, REPORT_PREVIEW_CHARS + 1).label("head"), cnt, rn)
+            .where(Report.task_id.in_(ids))
+            .subquery()
+        )
+        rows = await db.execute(
+            select(ranked.c.task_id, ranked.c.created_at, ranked.c.head, ranked.c.cnt)
+            .where(ranked.c.rn == 1)
+        )
+        for o in outs:
+            o.report_count = 0
+        for task_id, created_at, head, count in rows.all():
+            o = by_id[task_id]
+            o.report_count   = count
+            o.last_report_at = created_at
+            o.latest_report_preview = (head[:REPORT_PREVIEW_CHARS] + "…"
+                                       if len(head) > REPORT_PREVIEW_CHARS else head)
+    elif include_reports == "count":
+        rows = await db.execute(
+            select(Report.task_id, func.count())
+            .where(Report.task_id.in_(ids))
+            .group_by(Report.task_id)
+        )
+        counts = dict(rows.all())
+        for o in outs:
+            o.report_count = counts.get(o.id, 0)
+    else:
+        rn = func.row_number().over(
+            partition_by=Report.task_id,
+            order_by=(Report.created_at.desc(), Report.id.desc()),
+        ).label("rn")
+        ranked = select(Report, rn).where(Report.task_id.in_(ids)).subquery()
+        latest = aliased(Report, ranked)
+        rows = await db.execute(
+            select(latest)
+            .where(ranked.c.rn <= latest_reports)
+            .order_by(ranked.c.task_id, ranked.c.created_at)
+        )
+        for r in rows.scalars():
+            by_id[r.task_id].reports.append(ReportOut.model_validate(r))
+    return outs
+
+
 # ── 업무 목록 ──────────────────────────────────────────
 @router.get("/", response_model=list[TaskOut])
 async def list_tasks(
+    response   : Response,
     dept_id    : str | None = Query(None),
     status     : str | None = Query(None),
     include_hidden: bool    = Query(False, description="True면 숨긴 항목도 포함"),
+    assignee_id: str | None = Query(None, max_length=100, description="assignee_ids 에 이 값이 있는 업무"),
+    shared_dept_id: str | None = Query(None, max_length=36,
+                                       description="이 부서 소속이거나 이 부서(또는 전체)에 공유된 업무"),
+    limit      : int | None = Query(None, ge=1, le=500, description="페이지 크기 (없으면 전체)"),
+    cursor     : str | None = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값"),
+    include_reports: str    = Query("all", pattern=REPORT_MODES),
+    latest_reports : int    = Query(3, ge=1, le=50, description="include_reports=latest 일 때 개수"),
     _          : User       = Depends(get_current_user),
-    db         : AsyncSession = Depends(get_db),
+    db         : AsyncSession = Depends(get_read_db),
 ):
-    q = select(Task).options(selectinload(Task.reports))
+    """
+    업무 목록 (최신순). limit 을 주면 (created_at, id) 기준 keyset 페이지로 반환하고
+    다음 페이지가 있으면 X-Next-Cursor 헤더에 커서를 담는다.
+    """
+    q = _task_query(include_reports)
     if dept_id: q = q.where(Task.dept_id == dept_id)
     if status:  q = q.where(Task.status  == status)
     if not include_hidden:
         q = q.where(Task.is_hidden == False)
-    q = q.order_by(Task.created_at.desc())
-    result = await db.execute(q)
-    return [TaskOut.model_validate(t) for t in result.scalars()]
+    if assignee_id:
+        q = q.where(Task.id.in_(
+            select(TaskAssignee.task_id).where(TaskAssignee.assignee_id == assignee_id)
+        ))
+    if shared_dept_id:
+        q = q.where((Task.dept_id == shared_dept_id) | Task.id.in_(
+            select(TaskDepartment.task_id)
+            .where(TaskDepartment.dept_id.in_([shared_dept_id, ALL_DEPTS]))
+        ))
+    if cursor:
+        q = q.where(after_cursor(Task.created_at, Task.id, cursor))
+    q = q.order_by(Task.created_at.desc(), Task.id.desc())
+    if limit:
+        q = q.limit(limit + 1)
+    tasks = list((await db.execute(q)).scalars())
+
+    if limit and len(tasks) > limit:
+        tasks = tasks[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(tasks[-1].created_at, tasks[-1].id)
+    return await _task_outs(db, tasks, include_reports, latest_reports)
 
 
 # ── 업무 생성 ──────────────────────────────────────────
 @router.post("/", response_model=TaskOut)
 async def create_task(
     body   : TaskCreate,
+    include_reports: str = Query("all", pattern=REPORT_MODES),
+    latest_reports : int = Query(3, ge=1, le=50, description="include_reports=latest 일 때 개수"),
     current: User = Depends(get_current_user),
     db     : AsyncSession = Depends(get_db),
 ):
-    task = Task(
-        id=str(uuid4()),
-        title=body.title.strip(),
-        description=body.description,
-        dept_id=body.dept_id,
-        department_ids=body.department_ids,
-        status=body.status,
-        priority=body.priority,
-        assignee_name=body.assignee_name,
-        assignee_ids=body.assignee_ids,
-        start_date=body.start_date,
-        due_date=body.due_date,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow(),
-    )
+    task = _new_task(body, datetime.utcnow())
+    task.reports = []   # 새 업무는 보고가 없음 → 재조회 불필요
     db.add(task)
     await db.commit()
-    await db.refresh(task)
-    # reports 로드
-    result = await db.execute(
-        select(Task).options(selectinload(Task.reports)).where(Task.id == task.id)
-    )
-    # 데이터 변경 후 백업
-    await save_backup(db)
-    return TaskOut.model_validate(result.scalar_one())
+    return (await _task_outs(db, [task], include_reports, latest_reports))[0]
+
+
+async def _finish(
+    db: AsyncSession,
+    response: Response,
+    row: dict,
+    include_reports: str,
+    latest_reports: int,
+) -> TaskOut:
+    """수정된 행으로 응답 구성 (보고는 요청한 모드일 때만 조회) 후 커밋"""
+    out = (await _task_outs(db, [row], include_reports, latest_reports, reports_loaded=False))[0]
+    await db.commit()
+    response.headers["ETag"] = f'"{row["version"]}"'
+    return out
 
 
 # ── 업무 수정 ──────────────────────────────────────────
 @router.patch("/{task_id}", response_model=TaskOut)
 async def update_task(
-    task_id: str,
-    body   : TaskUpdate,
-    current: User = Depends(get_current_user),
-    db     : AsyncSession = Depends(get_db),
+    task_id : str,
+    body    : TaskUpdate,
+    response: Response,
+    include_reports: str = Query("all", pattern=REPORT_MODES),
+    latest_reports : int = Query(3, ge=1, le=50, description="include_reports=latest 일 때 개수"),
+    version : int | None = Depends(expected_version),
+    current : User = Depends(get_current_user),
+    db      : AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Task).options(selectinload(Task.reports)).where(Task.id == task_id)
-    )
-    task = result.scalar_one_or_none()
-    if not task:
-        raise HTTPException(status_code=404, detail="업무를 찾을 수 없습니다.")
-
-    if body.title         is not None: task.title         = body.title.strip()
-    if body.description   is not None: task.description   = body.description
-    if body.dept_id       is not None: task.dept_id       = body.dept_id
-    if body.department_ids is not None: task.department_ids = body.department_ids
-    if body.status        is not None: task.status        = body.status
-    if body.priority      is not None: task.priority      = body.priority
-    if body.assignee_name is not None: task.assignee_name = body.assignee_name
-    if body.assignee_ids  is not None: task.assignee_ids  = body.assignee_ids
-    if body.start_date    is not None: task.start_date    = body.start_date
-    if body.due_date      is not None: task.due_date      = body.due_date
-    task.updated_at = datetime.utcnow()
-
-    await db.commit()
-    result2 = await db.execute(
-        select(Task).options(selectinload(Task.reports)).where(Task.id == task_id)
-    )
-    # 데이터 변경 후 백업
-    await save_backup(db)
-    return TaskOut.model_validate(result2.scalar_one())
+    """If-Match: <version> 을 보내면 그 버전일 때만 수정 (아니면 409)"""
+    values = {}
+    if body.title         is not None: values["title"]         = body.title.strip()
+    if body.description   is not None: values["description"]   = body.description
+    if body.dept_id       is not None: values["dept_id"]       = body.dept_id
+    if body.department_ids is not None: values["department_ids"] = body.department_ids
+    if body.status        is not None: values.update(_status_values(body.status, datetime.utcnow()))
+    if body.priority      is not None: values["priority"]      = body.priority
+    if body.assignee_name is not None: values["assignee_name"] = body.assignee_name
+    if body.assignee_ids  is not None: values["assignee_ids"]  = body.assignee_ids
+    if body.start_date    is not None: values["start_date"]    = body.start_date
+    if body.due_date      is not None: values["due_date"]      = body.due_date
+
+    row = await _conditional_update(db, Task, [Task.id == task_id], values, version,
+                                    "업무를 찾을 수 없습니다.")
+    return await _finish(db, response, row, include_reports, latest_reports)
 
 
 # ── 업무 상태만 변경 ───────────────────────────────────
 @router.patch("/{task_id}/status", response_model=TaskOut)
 async def update_status(
-    task_id: str,
-    body   : dict,
-    current: User = Depends(get_current_user),
-    db     : AsyncSession = Depends(get_db),
+    task_id : str,
+    body    : dict,
+    response: Response,
+    include_reports: str = Query("all", pattern=REPORT_MODES),
+    latest_reports : int = Query(3, ge=1, le=50, description="include_reports=latest 일 때 개수"),
+    version : int | None = Depends(expected_version),
+    current : User = Depends(get_current_user),
+    db      : AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Task).options(selectinload(Task.reports)).where(Task.id == task_id)
-    )
-    task = result.scalar_one_or_none()
-    if not task:
-        raise HTTPException(status_code=404, detail="업무를 찾을 수 없습니다.")
-    task.status     = body.get("status", task.status)
-    task.updated_at = datetime.utcnow()
-    # 완료 상태로 변경될 때 completed_at 기록
-    new_status = body.get("status", task.status)
-    if new_status == "done" and task.status != "done":
-        task.completed_at = datetime.utcnow()
-    elif new_status != "done":
-        task.completed_at = None  # 완료 취소 시 초기화
-    await db.commit()
-    result2 = await db.execute(
-        select(Task).options(selectinload(Task.reports)).where(Task.id == task_id)
-    )
-    return TaskOut.model_validate(result2.scalar_one())
+    if "status" not in body:
+        raise HTTPException(status_code=400, detail="변경할 상태(status)가 필요합니다.")
+    # 완료 상태로 변경될 때 completed_at 기록 (완료 취소 시 초기화)
+    values = _status_values(body["status"], datetime.utcnow())
+    row = await _conditional_update(db, Task, [Task.id == task_id], values, version,
+                                    "업무를 찾을 수 없습니다.")
+    return await _finish(db, response, row, include_reports, latest_reports)
 
 
 # ── 완료 업무 숨기기 (보관함엔 유지) ─────────────────
 @router.patch("/{task_id}/hide", response_model=TaskOut)
 async def hide_task(
-    task_id: str,
-    current: User = Depends(get_current_user),
-    db     : AsyncSession = Depends(get_db),
+    task_id : str,
+    response: Response,
+    include_reports: str = Query("all", pattern=REPORT_MODES),
+    latest_reports : int = Query(3, ge=1, le=50, description="include_reports=latest 일 때 개수"),
+    version : int | None = Depends(expected_version),
+    current : User = Depends(get_current_user),
+    db      : AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Task).options(selectinload(Task.reports)).where(Task.id == task_id)
+    row = await _conditional_update(
+        db, Task, [Task.id == task_id, Task.status == TaskStatus.done],
+        {"is_hidden": True, "hidden_at": func.coalesce(Task.hidden_at, datetime.utcnow())}, version,
+        "업무를 찾을 수 없습니다.",
     )
-    task = result.scalar_one_or_none()
-    if not task:
-        raise HTTPException(status_code=404, detail="업무를 찾을 수 없습니다.")
-    if task.status != TaskStatus.done:
+    if row is None:
         raise HTTPException(status_code=400, detail="완료 상태인 업무만 숨길 수 있습니다.")
-    task.is_hidden  = True
-    task.hidden_at  = datetime.utcnow()
-    task.updated_at = datetime.utcnow()
-    await db.commit()
-    result2 = await db.execute(
-        select(Task).options(selectinload(Task.reports)).where(Task.id == task_id)
-    )
-    return TaskOut.model_validate(result2.scalar_one())
+    return await _finish(db, response, row, include_reports, latest_reports)
 
 
 # ── 숨긴 업무 복원 ─────────────────────────────────────
 @router.patch("/{task_id}/unhide", response_model=TaskOut)
 async def unhide_task(
-    task_id: str,
-    current: User = Depends(get_current_user),
-    db     : AsyncSession = Depends(get_db),
+    task_id : str,
+    response: Response,
+    include_reports: str = Query("all", pattern=REPORT_MODES),
+    latest_reports : int = Query(3, ge=1, le=50, description="include_reports=latest 일 때 개수"),
+    version : int | None = Depends(expected_version),
+    current : User = Depends(get_current_user),
+    db      : AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Task).options(selectinload(Task.reports)).where(Task.id == task_id)
-    )
-    task = result.scalar_one_or_none()
-    if not task:
-        raise HTTPException(status_code=404, detail="업무를 찾을 수 없습니다.")
-    task.is_hidden  = False
-    task.hidden_at  = None
-    task.updated_at = datetime.utcnow()
-    await db.commit()
-    result2 = await db.execute(
-        select(Task).options(selectinload(Task.reports)).where(Task.id == task_id)
-    )
-    return TaskOut.model_validate(result2.scalar_one())
+    row = await _conditional_update(db, Task, [Task.id == task_id],
+                                    {"is_hidden": False, "hidden_at": None}, version,
+                                    "업무를 찾을 수 없습니다.")
+    return await _finish(db, response, row, include_reports, latest_reports)
 
 
 # ── 완료 업무 보관함 조회 (숨긴 항목 포함, 날짜별 정렬) ─
 @router.get("/archive", response_model=list[TaskOut])
 async def list_archive(
-    dept_id : str | None = Query(None),
-    _       : User        = Depends(get_current_user),
-    db      : AsyncSession = Depends(get_db),
+    response : Response,
+    dept_id  : str | None  = Query(None),
+    date_from: date | None = Query(None, alias="from", description="완료일 시작 (포함, YYYY-MM-DD)"),
+    date_to  : date | None = Query(None, alias="to",   description="완료일 끝 (포함, YYYY-MM-DD)"),
+    limit    : int | None  = Query(None, ge=1, le=500, description="페이지 크기 (없으면 전체)"),
+    cursor   : str | None  = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값"),
+    include_reports: str   = Query("all", pattern=REPORT_MODES),
+    latest_reports : int   = Query(3, ge=1, le=50, description="include_reports=latest 일 때 개수"),
+    _        : User        = Depends(get_current_user),
+    db       : AsyncSession = Depends(get_read_db),
 ):
-    """완료된 모든 업무 (숨긴 것 포함) 최신순 반환"""
-    q = (
-        select(Task)
-        .options(selectinload(Task.reports))
-        .where(Task.status == TaskStatus.done)
-    )
+    """
+    완료된 업무 (숨긴 것 포함) 최신순 반환.
+    limit 을 주면 (updated_at, id) 기준 keyset 페이지, from / to 는 완료일(completed_at, 기관 시간대 날짜) 기준.
+    """
+    q = _task_query(include_reports).where(_ARCHIVED)
     if dept_id:
         q = q.where(Task.dept_id == dept_id)
-    q = q.order_by(Task.updated_at.desc())
-    result = await db.execute(q)
-    return [TaskOut.model_validate(t) for t in result.scalars()]
+    if date_from:
+        q = q.where(Task.completed_at >= clock.day_start(date_from))
+    if date_to:
+        q = q.where(Task.completed_at < clock.day_start(date_to + timedelta(days=1)))
+    if cursor:
+        q = q.where(after_cursor(Task.updated_at, Task.id, cursor))
+    q = q.order_by(Task.updated_at.desc(), Task.id.desc())
+    if limit:
+        q = q.limit(limit + 1)
+    tasks = list((await db.execute(q)).scalars())
+
+    if limit and len(tasks) > limit:
+        tasks = tasks[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(tasks[-1].updated_at, tasks[-1].id)
+    return await _task_outs(db, tasks, include_reports, latest_reports)
 
 
 # ── 업무 삭제 (영구) ─────────────────────────────────────
@@ -219,11 +454,41 @@ async def delete_task(
         raise HTTPException(status_code=404, detail="업무를 찾을 수 없습니다.")
     await db.delete(task)
     await db.commit()
-    # 데이터 변경 후 백업
-    await save_backup(db)
     return {"ok": True}
 
 
+# ── 중간보고 목록 (페이지) ─────────────────────────────
+@router.get("/{task_id}/reports", response_model=list[ReportOut])
+async def list_reports(
+    task_id : str,
+    response: Response,
+    limit   : int = Query(50, ge=1, le=200),
+    cursor  : str | None = Query(None, description="이전 응답의 X-Next-Cursor 헤더 값"),
+    order   : str = Query("asc", pattern="^(asc|desc)$", description="작성 시각 순서"),
+    _       : User = Depends(get_current_user),
+    db      : AsyncSession = Depends(get_read_db),
+):
+    """업무의 중간보고 전문. (created_at, id) 기준 keyset 페이지, 다음 커서는 X-Next-Cursor 헤더"""
+    exists = await db.execute(select(Task.id).where(Task.id == task_id))
+    if exists.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="업무를 찾을 수 없습니다.")
+
+    desc = order == "desc"
+    q = select(Report).where(Report.task_id == task_id)
+    if cursor:
+        q = q.where(after_cursor(Report.created_at, Report.id, cursor, descending=desc))
+    if desc:
+        q = q.order_by(Report.created_at.desc(), Report.id.desc())
+    else:
+        q = q.order_by(Report.created_at, Report.id)
+    reports = list((await db.execute(q.limit(limit + 1))).scalars())
+
+    if len(reports) > limit:
+        reports = reports[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(reports[-1].created_at, reports[-1].id)
+    return [ReportOut.model_validate(r) for r in reports]
+
+
 # ── 중간보고 추가 ──────────────────────────────────────
 @router.post("/{task_id}/reports", response_model=ReportOut)
 async def add_report(
@@ -253,21 +518,23 @@ async def update_report(
     task_id  : str,
     report_id: str,
     body     : ReportUpdate,
+    response : Response,
+    version  : int | None = Depends(expected_version),
     current  : User = Depends(get_current_user),
     db       : AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Report).where(Report.id == report_id, Report.task_id == task_id)
+    values = {}
+    if body.content       is not None: values["content"]       = body.content
+    if body.reporter_name is not None: values["reporter_name"] = body.reporter_name
+    row = await _conditional_update(
+        db, Report, [Report.id == report_id, Report.task_id == task_id], values, version,
+        "보고를 찾을 수 없습니다.",
     )
-    report = result.scalar_one_or_none()
-    if not report:
+    if row is None:   # 다른 업무의 보고
         raise HTTPException(status_code=404, detail="보고를 찾을 수 없습니다.")
-    if body.content       is not None: report.content       = body.content
-    if body.reporter_name is not None: report.reporter_name = body.reporter_name
-    report.updated_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(report)
-    return ReportOut.model_validate(report)
+    response.headers["ETag"] = f'"{row["version"]}"'
+    return ReportOut.model_validate(row)
 
 
 # ── 중간보고 삭제 ──────────────────────────────────────
@@ -294,44 +561,19 @@ async def delete_report(
 async def daily_report(
     date   : str = Query(..., description="YYYY-MM-DD"),
     _      : User = Depends(get_current_user),
-    db     : AsyncSession = Depends(get_db),
+    db     : AsyncSession = Depends(get_read_db),
 ):
-    from ..models import Department
     try:
-        target = datetime.strptime(date, "%Y-%m-%d")
+        target = datetime.strptime(date, "%Y-%m-%d").date()
     except ValueError:
         raise HTTPException(status_code=400, detail="날짜 형식은 YYYY-MM-DD 입니다.")
 
-    depts_result = await db.execute(select(Department).order_by(Department.created_at))
-    depts = depts_result.scalars().all()
-
-    result_list = []
-    for dept in depts:
-        # 해당 날짜에 완료되었거나 보고가 있는 업무
-        q = (
-            select(Task)
-            .options(selectinload(Task.reports))
-            .where(Task.dept_id == dept.id)
+    # 해당 날짜 (기관 시간대) 에 완료되었거나 보고가 있는 업무 (부서별, 그 날 보고만 포함)
+    groups = await _load_day_tasks(db, *clock.day_range(target))
+    return [
+        DailyReportDept(
+            dept =DeptOut.model_validate(dept),
+            tasks=[TaskOut.model_validate(t) for t in day_tasks],
         )
-        tasks_result = await db.execute(q)
-        all_tasks    = tasks_result.scalars().all()
-
-        day_tasks = []
-        for t in all_tasks:
-            is_done = t.status == TaskStatus.done
-            has_report = any(
-                r.created_at.year  == target.year and
-                r.created_at.month == target.month and
-                r.created_at.day   == target.day
-                for r in t.reports
-            )
-            if is_done or has_report:
-                day_tasks.append(t)
-
-        if day_tasks:
-            result_list.append(DailyReportDept(
-                dept =DeptOut.model_validate(dept),
-                tasks=[TaskOut.model_validate(t) for t in day_tasks],
-            ))
-
-    return result_list
+        for dept, day_tasks in groups
+    ]
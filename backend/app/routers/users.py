@@ -8,8 +8,7 @@ from uuid import uuid4
 from ..database import get_db
 from ..models import User, UserRole
 from ..schemas import UserCreate, UserUpdate, UserOut
-from ..auth import hash_password, get_current_user, require_master
-from ..backup_manager import save_backup
+from ..auth import hash_password, get_current_user, require_master, invalidate_user
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -50,7 +49,6 @@ async def create_user(
     db.add(user)
     await db.commit()
     await db.refresh(user)
-    await save_backup(db)
     return UserOut.model_validate(user)
 
 
@@ -81,8 +79,8 @@ async def update_user(
     if body.is_active    is not None: user.is_active    = body.is_active
 
     await db.commit()
+    invalidate_user(user_id)
     await db.refresh(user)
-    await save_backup(db)
     return UserOut.model_validate(user)
 
 
@@ -110,5 +108,5 @@ async def delete_user(
 
     await db.delete(user)
     await db.commit()
-    await save_backup(db)
+    invalidate_user(user_id)
     return {"ok": True}
@@ -0,0 +1,265 @@
+"""
+예약 작업 스케줄러 (자정 보관함 봉인 / 삭제 기록 정리 / 백업)
+- 하루 단위 작업: 날짜 D 의 작업은 D+1 00:00 (기관 시간대, ORG_TIMEZONE) 이후 한 번 실행
+- 처리한 날짜는 job_runs 에 기록 → 서버가 멈춰 있던 날도 다시 켜지면 이어서 처리 (catch-up)
+- 여러 워커 / 인스턴스 중 리더 하나만 실행
+  * PostgreSQL: pg_try_advisory_lock 을 잡은 연결을 유지하는 프로세스가 리더
+    (연결이 끊기면 잠금이 풀려 다른 인스턴스가 이어받음)
+  * SQLite: 모든 프로세스가 후보
+  어느 경우든 job_runs 행의 임대(lease)를 UPDATE 로 잡은 쪽만 실제로 실행
+  임대는 하루 치 실행 시간 (제한 시간 + 여유) 만큼만 잡고 밀린 날짜마다 갱신
+  → 실행 중이던 프로세스가 죽으면 길어야 그만큼 뒤에 다른 프로세스가 이어받음
+- 자정에 몰리지 않도록 지터, 작업별 제한 시간, 실행 지표(/health) 제공
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, date as dt_date, timedelta
+from typing import Awaitable, Callable
+from uuid import uuid4
+from sqlalchemy import update, text
+
+from . import clock
+from .database import engine, AsyncSessionLocal
+from .models import JobRun
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_TICK_SECONDS   = float(os.environ.get("SCHEDULER_TICK_SECONDS", "60"))
+SCHEDULER_JITTER_SECONDS = float(os.environ.get("SCHEDULER_JITTER_SECONDS", "30"))
+SCHEDULER_CATCHUP_DAYS   = int(os.environ.get("SCHEDULER_CATCHUP_DAYS", "31"))     # 이보다 오래 밀린 날은 포기
+SCHEDULER_JOB_TIMEOUT_SECONDS = float(os.environ.get("SCHEDULER_JOB_TIMEOUT_SECONDS", "600"))
+SCHEDULER_LEASE_MARGIN_SECONDS = float(os.environ.get("SCHEDULER_LEASE_MARGIN_SECONDS", "60"))   # 임대 = 제한 시간 + 여유
+
+# pg_try_advisory_lock 키 (이 앱 전용 임의 상수)
+_LEADER_LOCK_KEY = 7_210_522
+
+
+@dataclass
+class Job:
+    name    : str
+    run     : Callable[[dt_date], Awaitable[None]]   # 처리할 날짜를 받음
+    timeout : float = SCHEDULER_JOB_TIMEOUT_SECONDS
+    catch_up: bool = True        # False: 여러 날 밀려 있어도 가장 최근 하루만 실행
+    enabled : Callable[[], bool] = lambda: True
+
+
+class Scheduler:
+    def __init__(self):
+        self._jobs: dict[str, Job] = {}
+        self._task: asyncio.Task | None = None
+        self._leader_conn = None         # PostgreSQL: advisory lock 을 잡은 연결
+        self.owner   = f"{os.getpid()}-{uuid4().hex[:8]}"
+        self.leader  = False
+        self.metrics: dict[str, dict] = {}
+
+    def add(self, job: Job) -> None:
+        self._jobs[job.name] = job
+        self.metrics[job.name] = {"runs": 0, "failures": 0, "timeouts": 0, "last_run_for": None,
+                                  "last_status": None, "last_duration_ms": None, "last_error": None}
+
+    def status(self) -> dict:
+        return {
+            "running" : self._task is not None and not self._task.done(),
+            "leader"  : self.leader,
+            "mode"    : "advisory_lock" if engine.dialect.name == "postgresql" else "lease",
+            "timezone": clock.ORG_TIMEZONE,
+            "jobs"    : self.metrics,
+        }
+
+    # ── 리더 선출 ──────────────────────────────────
+    async def _ensure_leader(self) -> bool:
+        if engine.dialect.name != "postgresql":
+            self.leader = True
+            return True
+        if self._leader_conn is not None:
+            try:
+                await self._leader_conn.execute(text("SELECT 1"))
+                return True
+            except Exception as e:
+                logger.warning(f"⚠️ [scheduler] 리더 연결 끊김 - 다시 선출: {e}")
+                await self._release_leader()
+        conn = None
+        try:
+            conn = await engine.connect()
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            got = (await conn.execute(
+                text("SELECT pg_try_advisory_lock(:k)"), {"k": _LEADER_LOCK_KEY}
+            )).scalar()
+        except Exception as e:
+            logger.error(f"❌ [scheduler] 리더 잠금 시도 실패: {e}")
+            got = False
+        if got:
+            self._leader_conn, self.leader = conn, True
+            logger.info(f"👑 [scheduler] 리더로 선출됨 ({self.owner})")
+            return True
+        if conn is not None:
+            await conn.close()
+        return False
+
+    async def _release_leader(self) -> None:
+        conn, self._leader_conn, self.leader = self._leader_conn, None, False
+        if conn is None:
+            return
+        try:
+            await conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": _LEADER_LOCK_KEY})
+        except Exception:
+            pass
+        try:
+            await conn.close()
+        except Exception:
+            pass
+
+    # ── 실행 ───────────────────────────────────────
+    async def _due_days(self, job: Job) -> list[dt_date]:
+        """job_runs 기준으로 아직 처리하지 않은 날짜들 (오늘은 제외)"""
+        today = clock.today()
+        async with AsyncSessionLocal() as db:
+            row = await db.get(JobRun, job.name)
+            if row is None:
+                # 처음 등록된 작업은 어제 것부터 (과거 전체를 소급하지 않음)
+                row = JobRun(name=job.name, last_run_for=(today - timedelta(days=2)).isoformat())
+                db.add(row)
+                try:
+                    await db.commit()
+                except Exception:
+                    await db.rollback()          # 다른 프로세스가 먼저 만듦
+                    row = await db.get(JobRun, job.name)
+            last = dt_date.fromisoformat(row.last_run_for)
+        first = max(last + timedelta(days=1), today - timedelta(days=SCHEDULER_CATCHUP_DAYS))
+        days = [first + timedelta(days=i) for i in range((today - first).days)]
+        return days if job.catch_up else days[-1:]
+
+    @staticmethod
+    def _lease_until(job: Job, now: datetime) -> datetime:
+        """하루 치 실행이 끝날 만큼만 (제한 시간 + 여유)"""
+        return now + timedelta(seconds=job.timeout + SCHEDULER_LEASE_MARGIN_SECONDS)
+
+    async def _claim(self, job: Job) -> bool:
+        """실행 임대 획득 (이미 다른 프로세스가 실행 중이면 False)"""
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(JobRun)
+                .where(JobRun.name == job.name,
+                       (JobRun.lease_until == None) | (JobRun.lease_until < now))
+                .values(lease_owner=self.owner, lease_until=self._lease_until(job, now))
+            )
+            await db.commit()
+            return result.rowcount == 1
+
+    async def _renew(self, job: Job) -> bool:
+        """다음 날짜를 실행하기 전 임대 연장 (그 사이 임대가 끝나 다른 프로세스가 잡았으면 False)"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(JobRun)
+                .where(JobRun.name == job.name, JobRun.lease_owner == self.owner)
+                .values(lease_until=self._lease_until(job, datetime.utcnow()))
+            )
+            await db.commit()
+            return result.rowcount == 1
+
+    async def _finish(self, job: Job, day: dt_date, status: str, error: str | None,
+                      started: datetime, elapsed_ms: int) -> None:
+        values = {
+            "last_status": status, "last_error": error,
+            "last_started_at": started, "last_finished_at": datetime.utcnow(),
+            "last_duration_ms": elapsed_ms,
+            "runs": JobRun.runs + 1,
+            "failures": JobRun.failures + (0 if status == "ok" else 1),
+        }
+        if status == "ok":
+            values["last_run_for"] = day.isoformat()
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(JobRun).where(JobRun.name == job.name,
+                                                  JobRun.lease_owner == self.owner).values(**values))
+            await db.commit()
+
+        m = self.metrics[job.name]
+        m["runs"] += 1
+        m["failures"] += 0 if status == "ok" else 1
+        m["timeouts"] += 1 if status == "timeout" else 0
+        m.update(last_status=status, last_duration_ms=elapsed_ms, last_error=error)
+        if status == "ok":
+            m["last_run_for"] = day.isoformat()
+
+    async def _release(self, job: Job) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(JobRun).where(JobRun.name == job.name, JobRun.lease_owner == self.owner)
+                             .values(lease_owner=None, lease_until=None))
+            await db.commit()
+
+    async def _run_job(self, job: Job) -> None:
+        """밀린 날짜를 차례로 실행. 실패하면 그 날짜에서 멈추고 다음 tick 에 재시도"""
+        if not await self._due_days(job) or not await self._claim(job):
+            return
+        try:
+            # 임대를 잡은 뒤 다시 확인 (그 사이 다른 프로세스가 처리했을 수 있음)
+            for i, day in enumerate(await self._due_days(job)):
+                if i and not await self._renew(job):
+                    logger.warning(f"⚠️ [scheduler] {job.name} 임대를 잃음 - {day} 부터는 다른 프로세스가 처리")
+                    return
+                started, t0 = datetime.utcnow(), time.perf_counter()
+                status, error = "ok", None
+                try:
+                    await asyncio.wait_for(job.run(day), timeout=job.timeout)
+                except asyncio.TimeoutError:
+                    status, error = "timeout", f"{job.timeout:g}초 안에 끝나지 않음"
+                except Exception as e:
+                    status, error = "failed", str(e)[:1000]
+                elapsed_ms = round((time.perf_counter() - t0) * 1000)
+                await self._finish(job, day, status, error, started, elapsed_ms)
+                if status != "ok":
+                    logger.error(f"❌ [scheduler] {job.name} ({day}) {status}: {error}")
+                    return
+                logger.info(f"✅ [scheduler] {job.name} ({day}) 완료 {elapsed_ms}ms")
+        finally:
+            await self._release(job)
+
+    async def tick(self) -> None:
+        if not await self._ensure_leader():
+            return
+        jittered = False
+        for job in self._jobs.values():
+            if not job.enabled():
+                continue
+            if not jittered and await self._due_days(job):
+                # 자정에 여러 작업 / 인스턴스가 한꺼번에 몰리지 않게
+                jittered = True
+                await asyncio.sleep(random.uniform(0, SCHEDULER_JITTER_SECONDS))
+            try:
+                await self._run_job(job)
+            except Exception as e:
+                logger.error(f"❌ [scheduler] {job.name} 실행 준비 오류: {e}")
+
+    # ── 수명 주기 ──────────────────────────────────
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._release_leader()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.error(f"❌ [scheduler] 오류: {e}")
+            # 다음 자정 직후에 깨어나도록 (그 전에는 tick 간격마다 리더 확인 / 재시도)
+            now = datetime.utcnow()
+            until = (clock.next_midnight(now) - now).total_seconds() + 5
+            await asyncio.sleep(min(SCHEDULER_TICK_SECONDS, until))
+
+
+scheduler = Scheduler()
@@ -3,7 +3,8 @@ Pydantic 스키마 (요청/응답 직렬화)
 """
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel
+import json
+from pydantic import BaseModel, Field, field_validator
 from .models import UserRole, TaskStatus, TaskPriority
 
 
@@ -85,6 +86,7 @@ class ReportOut(BaseModel):
     task_id      : str
     content      : str
     reporter_name: Optional[str]
+    version      : int = 1
     created_at   : datetime
     updated_at   : datetime
 
@@ -134,10 +136,41 @@ class TaskOut(BaseModel):
     hidden_at      : Optional[datetime] = None
     completed_at   : Optional[datetime] = None
     reports        : list[ReportOut] = []
+    version        : int = 1                 # If-Match 로 보내면 낙관적 잠금
+    report_count   : Optional[int] = None   # include_reports=count / summary 일 때만
+    last_report_at : Optional[datetime] = None   # include_reports=summary 일 때만
+    latest_report_preview: Optional[str] = None  # 최근 보고 앞부분 (summary)
 
     model_config = {"from_attributes": True}
 
 
+class TaskBatchOp(BaseModel):
+    op     : str = Field(..., pattern="^(create|update|status|hide|unhide|delete)$")
+    id     : Optional[str] = None          # create 외에는 필수
+    data   : Optional[dict] = None         # create: TaskCreate / update: TaskUpdate 필드
+    status : Optional[TaskStatus] = None   # op=status 일 때
+    version: Optional[int] = None          # 기대 버전 (If-Match 와 같음, 다르면 409 로 실패)
+
+class TaskBatchRequest(BaseModel):
+    ops    : list[TaskBatchOp] = Field(..., min_length=1, max_length=500)
+    atomic : bool = True                   # True면 하나라도 실패하면 전부 취소
+    include_reports: str = Field("none", pattern="^(all|none|count|latest|summary)$")
+
+class TaskBatchItem(BaseModel):
+    index  : int
+    op     : str
+    id     : Optional[str] = None
+    ok     : bool
+    error  : Optional[str] = None
+    code   : Optional[int] = None          # 실패 사유 (400 / 404 / 409 / 422), 다른 항목 때문에 취소되면 없음
+    task   : Optional[TaskOut] = None      # 삭제 / 실패 항목은 없음
+
+class TaskBatchResult(BaseModel):
+    ok      : bool                         # 모든 항목이 반영되었는지
+    applied : int
+    results : list[TaskBatchItem]
+
+
 # ── Daily Report ───────────────────────────────────────
 class DailyReportTask(BaseModel):
     task   : TaskOut
@@ -155,7 +188,7 @@ TokenResponse.model_rebuild()
 class DailyRecordOut(BaseModel):
     id          : str
     date        : str
-    summary_json: str
+    summary_json: str                # 클라이언트 호환: JSON 문자열로 내려줌
     total_tasks : int
     done_count  : int
     in_progress : int
@@ -167,6 +200,11 @@ class DailyRecordOut(BaseModel):
 
     model_config = {"from_attributes": True}
 
+    @field_validator("summary_json", mode="before")
+    @classmethod
+    def _dump_summary(cls, v):
+        return v if isinstance(v, str) else json.dumps(v, ensure_ascii=False)
+
 
 class DailyRecordListItem(BaseModel):
     """목록 조회용 (summary_json 제외 - 용량 절약)"""
@@ -181,3 +219,78 @@ class DailyRecordListItem(BaseModel):
     created_at  : datetime
 
     model_config = {"from_attributes": True}
+
+
+class DeptTrend(BaseModel):
+    dept_id           : str
+    done              : list[int]
+    throughput        : list[Optional[int]]      # 전날 기록 대비 완료 증가
+    rolling_throughput: list[Optional[float]]
+
+
+class TrendsOut(BaseModel):
+    """GET /daily-records/trends (열 단위: 모든 배열은 dates 와 같은 길이)"""
+    window                 : int
+    dates                  : list[str]
+    total                  : list[int]
+    done                   : list[int]
+    backlog                : list[int]                # 진행 + 미시작
+    completion_rate        : list[Optional[float]]
+    rolling_completion_rate: list[Optional[float]]    # 창 안 완료 합 / 전체 합
+    throughput             : list[Optional[int]]
+    rolling_throughput     : list[Optional[float]]
+    backlog_delta          : list[Optional[int]]
+    departments            : list[DeptTrend]
+
+
+class BackfillJobOut(BaseModel):
+    """POST /daily-records/backfill 작업 진행 상태"""
+    job_id     : str
+    status     : str                 # "running" / "done" / "failed"
+    date_from  : str
+    date_to    : str
+    days       : int
+    done_days  : int
+    failed_days: int
+    started_at : datetime
+    finished_at: Optional[datetime] = None
+    elapsed_ms : Optional[float] = None
+    error      : Optional[str] = None
+
+
+# ── Search ─────────────────────────────────────────────
+class SearchHit(BaseModel):
+    entity     : str                 # "tasks" / "reports"
+    id         : str                 # 업무 또는 보고 id
+    task_id    : str
+    task_title : str
+    dept_id    : str
+    status     : TaskStatus
+    snippet    : str                 # 검색어 주변 본문 일부
+    score      : float
+    updated_at : datetime
+
+
+class SearchResult(BaseModel):
+    items      : list[SearchHit]
+    next_offset: Optional[int] = None   # 다음 페이지가 있을 때만
+
+
+# ── Stats ──────────────────────────────────────────────
+class StatsCounts(BaseModel):
+    total        : int
+    overdue      : int                   # 완료 전 + 기한 지남
+    due_this_week: int                   # 완료 전 + 이번 주(~일요일) 마감
+    by_status    : dict[str, int]
+    by_priority  : dict[str, int]
+
+
+class DeptStats(StatsCounts):
+    dept_id: str
+
+
+class StatsOverview(StatsCounts):
+    by_dept     : list[DeptStats]
+    data_version: int
+    generated_at: datetime
+    cached      : bool = False
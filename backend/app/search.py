@@ -0,0 +1,156 @@
+"""
+업무 / 보고 전문 검색 색인
+- 한국어는 띄어쓰기 단위가 검색 단위와 맞지 않으므로 (예: "주간회의록" 에서 "회의")
+  한글·한자 구간은 글자 2-gram 으로, 그 밖의 단어는 소문자 단어 그대로 토큰화
+- search_docs 표에 토큰 문자열을 저장하고 ORM flush 때 같은 트랜잭션에서 갱신
+  (Core 일괄 변경은 index_rows / unindex 로 직접 반영)
+- PostgreSQL: tsvector('simple') GIN 인덱스 / SQLite: search_docs 를 따라가는 FTS5 가상 테이블
+"""
+import re
+import unicodedata
+from datetime import datetime
+from sqlalchemy import event, delete, or_, inspect as sa_inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .models import Task, Report, SearchDoc
+
+# 한글 자모 / 음절, 한자
+_CJK  = "\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3\u4e00-\u9fff"
+_WORD = re.compile(r"[^\W_]+")
+_RUNS = re.compile(f"[{_CJK}]+|[^{_CJK}]+")
+_IS_CJK = re.compile(f"[{_CJK}]")
+
+# PostgreSQL GIN 인덱스 식 (인덱스를 타려면 쿼리에서도 글자 그대로 같아야 함)
+PG_VECTOR = (
+    "(setweight(to_tsvector('simple'::regconfig, coalesce(search_docs.title_tokens, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(search_docs.body_tokens, '')), 'B'))"
+)
+
+
+# ── 토큰화 ─────────────────────────────────────────────
+def _runs(text: str) -> list[list[str]]:
+    """단어를 한글·한자 / 그 밖 구간으로 나눠 구간별 토큰 목록 반환"""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    out = []
+    for word in _WORD.findall(text):
+        for run in _RUNS.findall(word):
+            if _IS_CJK.match(run):
+                out.append([run] if len(run) == 1 else
+                           [run[i:i + 2] for i in range(len(run) - 1)])
+            else:
+                out.append([run])
+    return out
+
+
+def tokenize(text: str | None) -> str:
+    """저장용 토큰 문자열 (공백 구분)"""
+    return " ".join(tok for run in _runs(text) for tok in run)
+
+
+def query_terms(q: str) -> list[tuple[list[str], bool]]:
+    """
+    검색어 → [(연속해야 하는 토큰들, 접두어 검색 여부)].
+    한글 2글자 이상은 2-gram 구문, 한 글자·영문·숫자는 접두어로 찾는다.
+    """
+    terms = []
+    for run in _runs(q):
+        prefix = len(run) == 1 and (len(run[0]) == 1 or not _IS_CJK.match(run[0]))
+        terms.append((run, prefix))
+    return terms
+
+
+def pg_tsquery(terms: list[tuple[list[str], bool]]) -> str:
+    parts = []
+    for toks, prefix in terms:
+        if prefix:
+            parts.append(f"{toks[0]}:*")
+        else:
+            parts.append("(" + " <-> ".join(toks) + ")")
+    return " & ".join(parts)
+
+
+def fts5_query(terms: list[tuple[list[str], bool]]) -> str:
+    parts = []
+    for toks, prefix in terms:
+        phrase = '"' + " ".join(toks) + '"'
+        parts.append(phrase + "*" if prefix else phrase)
+    return " ".join(parts)
+
+
+# ── 색인 갱신 ──────────────────────────────────────────
+def doc_values(entity: str, row) -> dict:
+    """업무 / 보고 (ORM 객체 또는 dict) → search_docs 행"""
+    get = row.get if isinstance(row, dict) else lambda k: getattr(row, k)
+    if entity == "tasks":
+        return {
+            "id": get("id"), "entity": "tasks", "task_id": get("id"),
+            "title_tokens": tokenize(get("title")),
+            "body_tokens": tokenize(get("description")),
+            "updated_at": datetime.utcnow(),
+        }
+    return {
+        "id": get("id"), "entity": "reports", "task_id": get("task_id"),
+        "title_tokens": "",
+        "body_tokens": tokenize(get("content")),
+        "updated_at": datetime.utcnow(),
+    }
+
+
+def upsert_stmt(dialect: str, docs: list[dict]):
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert(SearchDoc.__table__).values(docs)
+    return stmt.on_conflict_do_update(
+        index_elements=[SearchDoc.id],
+        set_={c: stmt.excluded[c] for c in ("task_id", "title_tokens", "body_tokens", "updated_at")},
+    )
+
+
+def _unindex_stmt(ids: list[str]):
+    # 업무 id 면 그 업무의 보고 문서까지 함께 제거
+    return delete(SearchDoc).where(or_(SearchDoc.id.in_(ids), SearchDoc.task_id.in_(ids)))
+
+
+async def index_rows(db, entity: str, rows: list[dict]) -> None:
+    """ORM 을 거치지 않고 upsert 한 업무 / 보고 색인 (커밋은 호출한 쪽에서)"""
+    if entity not in ("tasks", "reports") or not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    await db.execute(upsert_stmt(dialect, [doc_values(entity, r) for r in rows]))
+
+
+async def unindex(db, ids: list[str]) -> None:
+    """ORM 을 거치지 않고 삭제한 업무 / 보고 색인 제거"""
+    if ids:
+        await db.execute(_unindex_stmt(list(ids)))
+
+
+_INDEXED = {Task: ("tasks", ("title", "description")),
+            Report: ("reports", ("content", "task_id"))}
+
+
+def _changed(obj, attrs) -> bool:
+    state = sa_inspect(obj)
+    return any(state.attrs[a].history.has_changes() for a in attrs)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_docs(session: Session, flush_context) -> None:
+    docs, removed = {}, []
+    for obj in list(session.new) + list(session.dirty):
+        spec = _INDEXED.get(type(obj))
+        if spec is None:
+            continue
+        entity, attrs = spec
+        if obj in session.new or _changed(obj, attrs):
+            docs[obj.id] = doc_values(entity, obj)
+    for obj in session.deleted:
+        if type(obj) in _INDEXED:
+            removed.append(obj.id)
+    if not docs and not removed:
+        return
+    conn = session.connection()
+    if removed:
+        conn.execute(_unindex_stmt(removed))
+    if docs:
+        conn.execute(upsert_stmt(conn.dialect.name, list(docs.values())))
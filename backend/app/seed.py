@@ -135,6 +135,7 @@ async def seed_if_empty(db: AsyncSession):
             status=td["status"], priority=td["pri"],
             assignee_name=td["assignee"],
             start_date=td["sd"], due_date=td["dd"],
+            completed_at=now if td["status"] == TaskStatus.done else None,
             created_at=now, updated_at=now,
         )
         tasks.append(t)
@@ -0,0 +1,140 @@
+"""
+대시보드 집계 (GET /stats/overview)
+- 부서 × 상태 × 우선순위 GROUP BY 한 번으로 건수 / 기한 초과 / 이번 주 마감을 계산
+- 결과는 데이터 버전별로 메모리에 캐시: 업무가 커밋될 때마다 changes 허브가 버전을 올려
+  이전 결과를 버림. 기한 초과 여부는 시간이 지나도 바뀌고 다른 워커 / 인스턴스의
+  변경은 이 프로세스 허브를 거치지 않으므로 TTL 안에서만 재사용
+"""
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from sqlalchemy import select, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import changes, clock
+from .models import Task, TaskAssignee, TaskStatus, TaskPriority
+
+STATS_CACHE_TTL_SECONDS = float(os.environ.get("STATS_CACHE_TTL_SECONDS", "60"))
+STATS_CACHE_MAX_SIZE    = int(os.environ.get("STATS_CACHE_MAX_SIZE", "256"))
+
+# 이 테이블이 바뀌면 집계를 다시 함
+_STATS_ENTITIES = ("tasks",)
+
+
+class StatsCache:
+    """
+    조회 조건 → (만료 시각, 집계 결과). data_version 이 바뀌면 통째로 비움.
+    조회 도중 버전이 바뀐 결과는 넣지 않음 (오래된 집계가 새 버전으로 남지 않게).
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.ttl_seconds  = ttl_seconds
+        self.max_size     = max_size
+        self.data_version = 0
+        self._items: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+        self.hits   = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> dict | None:
+        item = self._items.get(key)
+        if item is None or item[0] < time.monotonic():
+            if item is not None:
+                del self._items[key]
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def put(self, key: tuple, value: dict, version: int) -> None:
+        if self.ttl_seconds <= 0 or version != self.data_version:
+            return
+        self._items[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        self.data_version += 1
+        self._items.clear()
+
+    def on_changes(self, batch: list["changes.Change"]) -> None:
+        if any(c.entity in _STATS_ENTITIES for c in batch):
+            self.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "data_version": self.data_version,
+            "size"        : len(self._items),
+            "ttl_seconds" : self.ttl_seconds,
+            "hits"        : self.hits,
+            "misses"      : self.misses,
+            "hit_rate"    : round(self.hits / total, 3) if total else None,
+        }
+
+
+stats_cache = StatsCache(STATS_CACHE_TTL_SECONDS, STATS_CACHE_MAX_SIZE)
+changes.subscribe(stats_cache.on_changes)
+
+
+# ── 집계 ───────────────────────────────────────────────
+def _week_end(now: datetime) -> datetime:
+    """이번 주 (월~일, 기관 시간대) 가 끝나는 시각 = 다음 주 월요일 00:00 의 UTC 시각"""
+    today = clock.local_date(now)
+    return clock.day_start(today + timedelta(days=7 - today.weekday()))
+
+
+def _empty_counts() -> dict:
+    return {
+        "total"        : 0,
+        "overdue"      : 0,
+        "due_this_week": 0,
+        "by_status"    : {s.value: 0 for s in TaskStatus},
+        "by_priority"  : {p.value: 0 for p in TaskPriority},
+    }
+
+
+def _add(bucket: dict, status: str, priority: str, n: int, overdue: int, due_week: int) -> None:
+    bucket["total"]         += n
+    bucket["overdue"]       += overdue
+    bucket["due_this_week"] += due_week
+    bucket["by_status"][status]     = bucket["by_status"].get(status, 0) + n
+    bucket["by_priority"][priority] = bucket["by_priority"].get(priority, 0) + n
+
+
+async def compute_overview(
+    db: AsyncSession,
+    include_hidden: bool,
+    assignee_id: str | None,
+    now: datetime,
+) -> dict:
+    """
+    전체 / 부서별 건수. 기한 초과 = 완료 전이면서 due_date 가 지금보다 이전
+    (클라이언트 Task.isOverdue 와 같은 기준), 이번 주 마감 = 완료 전이면서
+    지금 ~ 이번 주 일요일 끝 사이에 due_date 가 있음.
+    """
+    open_ = Task.status != TaskStatus.done
+    overdue  = func.sum(case((open_ & (Task.due_date < now), 1), else_=0))
+    due_week = func.sum(case((open_ & (Task.due_date >= now) & (Task.due_date < _week_end(now)), 1),
+                             else_=0))
+    q = (select(Task.dept_id, Task.status, Task.priority,
+                func.count().label("n"), overdue.label("overdue"), due_week.label("due_week"))
+         .group_by(Task.dept_id, Task.status, Task.priority))
+    if not include_hidden:
+        q = q.where(Task.is_hidden == False)
+    if assignee_id:
+        q = q.where(Task.id.in_(
+            select(TaskAssignee.task_id).where(TaskAssignee.assignee_id == assignee_id)
+        ))
+
+    totals = _empty_counts()
+    by_dept: dict[str, dict] = {}
+    for dept_id, status, priority, n, od, dw in (await db.execute(q)).all():
+        status   = getattr(status, "value", status)
+        priority = getattr(priority, "value", priority)
+        _add(totals, status, priority, n, od or 0, dw or 0)
+        dept = by_dept.setdefault(dept_id, {"dept_id": dept_id, **_empty_counts()})
+        _add(dept, status, priority, n, od or 0, dw or 0)
+    return {**totals, "by_dept": sorted(by_dept.values(), key=lambda d: d["dept_id"])}
@@ -0,0 +1,78 @@
+"""
+업무 담당자 / 공유 부서 연결 표
+- API 와 백업은 지금처럼 Task.assignee_ids / department_ids JSON 문자열을 주고받고,
+  task_assignees / task_departments 는 그 배열을 한 항목당 한 줄로 풀어 둔 색인용 사본
+  (GET /tasks/?assignee_id=&shared_dept_id= 가 JSON 문자열 검색 대신 인덱스를 탐)
+- ORM flush 때 같은 트랜잭션에서 갱신 (Core 일괄 변경은 sync_links / unlink 로 직접 반영)
+"""
+import json
+from sqlalchemy import event, delete, insert, inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+from .models import Task, TaskAssignee, TaskDepartment
+
+# department_ids 에서 "모든 부서에 공유" 를 뜻하는 값
+ALL_DEPTS = "__ALL__"
+
+
+def parse_ids(raw: str | None, max_len: int) -> list[str]:
+    """JSON 배열 문자열 → 중복 없는 문자열 목록 (형식이 틀리면 빈 목록)"""
+    try:
+        items = json.loads(raw) if raw else []
+    except (TypeError, ValueError):
+        return []
+    if not isinstance(items, list):
+        return []
+    out = [s.strip() for s in items if isinstance(s, str)]
+    return list(dict.fromkeys(s for s in out if s and len(s) <= max_len))
+
+
+def _statements(task_ids: list[str], rows: list) -> list:
+    """해당 업무들의 연결 행을 지우고 rows (ORM 객체 또는 dict) 기준으로 다시 넣는 문장들"""
+    assignees, depts = [], []
+    for row in rows:
+        get = row.get if isinstance(row, dict) else lambda k, row=row: getattr(row, k)
+        tid = get("id")
+        assignees += [{"task_id": tid, "assignee_id": a} for a in parse_ids(get("assignee_ids"), 100)]
+        depts     += [{"task_id": tid, "dept_id": d} for d in parse_ids(get("department_ids"), 36)]
+    stmts = [delete(TaskAssignee).where(TaskAssignee.task_id.in_(task_ids)),
+             delete(TaskDepartment).where(TaskDepartment.task_id.in_(task_ids))]
+    if assignees:
+        stmts.append(insert(TaskAssignee).values(assignees))
+    if depts:
+        stmts.append(insert(TaskDepartment).values(depts))
+    return stmts
+
+
+async def sync_links(db, rows: list[dict]) -> None:
+    """ORM 을 거치지 않고 넣거나 바꾼 업무 행의 연결 표 갱신 (커밋은 호출한 쪽에서)"""
+    if rows:
+        for stmt in _statements([r["id"] for r in rows], rows):
+            await db.execute(stmt)
+
+
+async def unlink(db, task_ids: list[str]) -> None:
+    """ORM 을 거치지 않고 삭제한 업무의 연결 행 제거 (SQLite 는 FK CASCADE 를 강제하지 않음)"""
+    if task_ids:
+        for stmt in _statements(list(task_ids), []):
+            await db.execute(stmt)
+
+
+_LINKED = ("assignee_ids", "department_ids")
+
+
+def _changed(obj) -> bool:
+    state = sa_inspect(obj)
+    return any(state.attrs[a].history.has_changes() for a in _LINKED)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_task_links(session: Session, flush_context) -> None:
+    touched = [obj for obj in session.new if isinstance(obj, Task)]
+    touched += [obj for obj in session.dirty if isinstance(obj, Task) and _changed(obj)]
+    removed = [obj.id for obj in session.deleted if isinstance(obj, Task)]
+    if not touched and not removed:
+        return
+    conn = session.connection()
+    for stmt in _statements([t.id for t in touched] + removed, touched):
+        conn.execute(stmt)
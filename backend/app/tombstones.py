@@ -0,0 +1,81 @@
+"""
+삭제 기록(tombstone) 관리
+- ORM 으로 삭제되는 업무 / 보고 / 부서 / 사용자는 before_flush 에서 자동 기록
+  (부서 삭제 시 cascade 로 함께 지워지는 업무·보고 포함)
+- ORM 을 거치지 않는 일괄 DELETE 는 add_tombstones() 로 직접 기록
+- 백업 가져오기 / 복원 시점은 record_sync_reset() 으로 기록 → 그 이전 토큰은 전체 재동기화
+"""
+import os
+from datetime import datetime, timedelta
+from uuid import uuid4
+from sqlalchemy import event, insert, delete, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from . import changes
+from .models import Tombstone, SyncReset
+
+SYNC_ENTITIES = ("departments", "users", "tasks", "reports")
+
+# 이 기간보다 오래된 삭제 기록은 정리 (그보다 오래된 since 토큰은 전체 재동기화)
+TOMBSTONE_RETENTION_DAYS = int(os.environ.get("TOMBSTONE_RETENTION_DAYS", "30"))
+
+
+def _dept_of(obj) -> str | None:
+    entity = obj.__tablename__
+    if entity == "departments":
+        return obj.id
+    if entity == "reports":
+        task = obj.__dict__.get("task")   # 이미 로드된 경우만 (추가 조회 없음)
+        return task.dept_id if task is not None else None
+    return obj.dept_id
+
+
+@event.listens_for(Session, "before_flush")
+def _record_deletes(session: Session, flush_context, instances) -> None:
+    if session.info.get(changes.SKIP):
+        return
+    now = datetime.utcnow()
+    for obj in list(session.deleted):
+        entity = getattr(obj, "__tablename__", None)
+        if entity not in SYNC_ENTITIES:
+            continue
+        session.add(Tombstone(
+            id=str(uuid4()), entity=entity, entity_id=obj.id,
+            dept_id=_dept_of(obj), deleted_at=now,
+        ))
+
+
+async def add_tombstones(
+    db: AsyncSession,
+    entity: str,
+    rows: list[tuple[str, str | None]],
+) -> None:
+    """일괄 DELETE 용: (entity_id, dept_id) 목록을 한 문장으로 기록"""
+    if not rows or db.info.get(changes.SKIP):
+        return
+    now = datetime.utcnow()
+    await db.execute(insert(Tombstone), [
+        {"id": str(uuid4()), "entity": entity, "entity_id": eid,
+         "dept_id": dept_id, "deleted_at": now}
+        for eid, dept_id in rows
+    ])
+
+
+async def record_sync_reset(db: AsyncSession, reason: str) -> None:
+    """가져오기 / 복원과 같은 트랜잭션에서 호출 (커밋은 호출한 쪽에서)"""
+    await db.execute(insert(SyncReset).values(id=str(uuid4()), reason=reason,
+                                              created_at=datetime.utcnow()))
+
+
+async def last_sync_reset(db: AsyncSession) -> datetime | None:
+    return (await db.execute(select(func.max(SyncReset.created_at)))).scalar()
+
+
+async def prune_tombstones(db: AsyncSession) -> int:
+    """보존 기간이 지난 삭제 기록 / 동기화 초기화 기록 정리"""
+    cutoff = datetime.utcnow() - timedelta(days=TOMBSTONE_RETENTION_DAYS)
+    result = await db.execute(delete(Tombstone).where(Tombstone.deleted_at < cutoff))
+    await db.execute(delete(SyncReset).where(SyncReset.created_at < cutoff))
+    await db.commit()
+    return result.rowcount or 0
@@ -0,0 +1,183 @@
+"""
+일일 보관함 추세 (GET /daily-records/trends)
+- summary_json 은 풀지 않고 daily_records 합계 컬럼 / daily_record_depts 부서별 건수만 사용
+- PostgreSQL: 윈도 함수 (LAG, 이동 합 / 평균) 로 DB 안에서 계산
+- SQLite: 컬럼만 한 번에 읽어 열(배열) 단위로 누적 합을 이용해 계산 (같은 결과)
+- 이동 창(window)과 증감은 "기록이 있는 날" 기준 (빠진 날은 건너뜀)
+"""
+from itertools import accumulate
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import DailyRecord, DailyRecordDept
+
+_DIGITS = 4
+
+
+def _rate(num, den):
+    return round(num / den, _DIGITS) if den else None
+
+
+def _round(v):
+    return None if v is None else round(float(v), _DIGITS)
+
+
+def _deltas(values: list[int]) -> list[int | None]:
+    """직전 기록 대비 증감 (첫 값은 None)"""
+    prev = None
+    out = []
+    for v in values:
+        out.append(None if prev is None else v - prev)
+        prev = v
+    return out
+
+
+def _rolling_sum(values: list, window: int) -> list:
+    """창 안의 합 (None 은 0 으로), 누적 합의 차로 한 번에"""
+    acc = [0, *accumulate(v or 0 for v in values)]
+    return [acc[i + 1] - acc[max(0, i + 1 - window)] for i in range(len(values))]
+
+
+def _rolling_avg(values: list, window: int) -> list[float | None]:
+    """None 을 뺀 평균 (SQL AVG 와 같음)"""
+    sums   = _rolling_sum(values, window)
+    counts = _rolling_sum([0 if v is None else 1 for v in values], window)
+    return [round(s / c, _DIGITS) if c else None for s, c in zip(sums, counts)]
+
+
+async def _lower_bound(db: AsyncSession, date_from: str, window: int) -> str:
+    """증감 / 이동 창 계산에 필요한 만큼 date_from 앞의 기록까지 포함할 시작 날짜"""
+    lower = (await db.execute(
+        select(DailyRecord.date).where(DailyRecord.date < date_from)
+        .order_by(DailyRecord.date.desc()).limit(1).offset(window - 1)
+    )).scalar_one_or_none()
+    return lower or ""
+
+
+# ── PostgreSQL: 윈도 함수 ──────────────────────────────
+_PG_TOTALS = """
+SELECT date, total, done, backlog, completion_rate, rolling_completion_rate,
+       throughput, backlog_delta,
+       AVG(throughput) OVER (ORDER BY date ROWS BETWEEN {n} PRECEDING AND CURRENT ROW) AS rolling_throughput
+FROM (
+    SELECT date, total_tasks AS total, done_count AS done,
+           in_progress + not_started AS backlog,
+           CAST(done_count AS float) / NULLIF(total_tasks, 0) AS completion_rate,
+           CAST(SUM(done_count) OVER w AS float) / NULLIF(SUM(total_tasks) OVER w, 0) AS rolling_completion_rate,
+           done_count - LAG(done_count) OVER (ORDER BY date) AS throughput,
+           (in_progress + not_started) - LAG(in_progress + not_started) OVER (ORDER BY date) AS backlog_delta
+    FROM daily_records
+    WHERE date >= :lower AND date <= :to
+    WINDOW w AS (ORDER BY date ROWS BETWEEN {n} PRECEDING AND CURRENT ROW)
+) s
+ORDER BY date
+"""
+
+_PG_DEPTS = """
+WITH days AS (
+    SELECT date FROM daily_records WHERE date >= :lower AND date <= :to
+), depts AS (
+    SELECT DISTINCT dept_id FROM daily_record_depts WHERE date >= :lower AND date <= :to
+), grid AS (
+    SELECT d.date, p.dept_id, coalesce(c.done, 0) AS done
+    FROM days d CROSS JOIN depts p
+    LEFT JOIN daily_record_depts c ON c.date = d.date AND c.dept_id = p.dept_id
+), s AS (
+    SELECT date, dept_id, done,
+           done - LAG(done) OVER (PARTITION BY dept_id ORDER BY date) AS throughput
+    FROM grid
+)
+SELECT date, dept_id, done, throughput,
+       AVG(throughput) OVER (PARTITION BY dept_id ORDER BY date
+                             ROWS BETWEEN {n} PRECEDING AND CURRENT ROW) AS rolling_throughput
+FROM s
+ORDER BY dept_id, date
+"""
+
+
+async def _pg_trends(db: AsyncSession, lower: str, date_from: str, date_to: str, window: int) -> dict:
+    params = {"lower": lower, "to": date_to}
+    rows = [r for r in (await db.execute(text(_PG_TOTALS.format(n=window - 1)), params)).mappings()
+            if r["date"] >= date_from]
+    out = {
+        "dates"                  : [r["date"] for r in rows],
+        "total"                  : [r["total"] for r in rows],
+        "done"                   : [r["done"] for r in rows],
+        "backlog"                : [r["backlog"] for r in rows],
+        "completion_rate"        : [_round(r["completion_rate"]) for r in rows],
+        "rolling_completion_rate": [_round(r["rolling_completion_rate"]) for r in rows],
+        "throughput"             : [r["throughput"] for r in rows],
+        "rolling_throughput"     : [_round(r["rolling_throughput"]) for r in rows],
+        "backlog_delta"          : [r["backlog_delta"] for r in rows],
+    }
+    depts: dict[str, dict] = {}
+    for r in (await db.execute(text(_PG_DEPTS.format(n=window - 1)), params)).mappings():
+        if r["date"] < date_from:
+            continue
+        d = depts.setdefault(r["dept_id"], {"dept_id": r["dept_id"], "done": [],
+                                            "throughput": [], "rolling_throughput": []})
+        d["done"].append(r["done"])
+        d["throughput"].append(r["throughput"])
+        d["rolling_throughput"].append(_round(r["rolling_throughput"]))
+    out["departments"] = list(depts.values())
+    return out
+
+
+# ── SQLite: 열 단위 계산 ───────────────────────────────
+async def _columnar_trends(db: AsyncSession, lower: str, date_from: str, date_to: str, window: int) -> dict:
+    rows = (await db.execute(
+        select(DailyRecord.date, DailyRecord.total_tasks, DailyRecord.done_count,
+               DailyRecord.in_progress, DailyRecord.not_started)
+        .where(DailyRecord.date >= lower, DailyRecord.date <= date_to)
+        .order_by(DailyRecord.date)
+    )).all()
+    dates   = [r[0] for r in rows]
+    total   = [r[1] for r in rows]
+    done    = [r[2] for r in rows]
+    backlog = [r[3] + r[4] for r in rows]
+
+    throughput = _deltas(done)
+    series = {
+        "dates"                  : dates,
+        "total"                  : total,
+        "done"                   : done,
+        "backlog"                : backlog,
+        "completion_rate"        : [_rate(d, t) for d, t in zip(done, total)],
+        "rolling_completion_rate": [_rate(d, t) for d, t in zip(_rolling_sum(done, window),
+                                                                _rolling_sum(total, window))],
+        "throughput"             : throughput,
+        "rolling_throughput"     : _rolling_avg(throughput, window),
+        "backlog_delta"          : _deltas(backlog),
+    }
+
+    # 부서별: (날짜 × 부서) 격자, 그 날 기록에 없는 부서는 0
+    index = {d: i for i, d in enumerate(dates)}
+    grid: dict[str, list[int]] = {}
+    for date, dept_id, n in (await db.execute(
+        select(DailyRecordDept.date, DailyRecordDept.dept_id, DailyRecordDept.done)
+        .where(DailyRecordDept.date >= lower, DailyRecordDept.date <= date_to)
+    )).all():
+        if date in index:
+            grid.setdefault(dept_id, [0] * len(dates))[index[date]] = n
+    departments = []
+    for dept_id in sorted(grid):
+        col = grid[dept_id]
+        tp = _deltas(col)
+        departments.append({"dept_id": dept_id, "done": col, "throughput": tp,
+                            "rolling_throughput": _rolling_avg(tp, window)})
+
+    # 앞쪽 여유분(lookback)을 잘라냄
+    start = next((i for i, d in enumerate(dates) if d >= date_from), len(dates))
+    out = {k: v[start:] for k, v in series.items()}
+    out["departments"] = [
+        {"dept_id": d["dept_id"], **{k: d[k][start:] for k in ("done", "throughput", "rolling_throughput")}}
+        for d in departments
+    ]
+    return out
+
+
+async def compute_trends(db: AsyncSession, date_from: str, date_to: str, window: int) -> dict:
+    lower = await _lower_bound(db, date_from, window)
+    if db.get_bind().dialect.name == "postgresql":
+        return await _pg_trends(db, lower, date_from, date_to, window)
+    return await _columnar_trends(db, lower, date_from, date_to, window)
@@ -1,54 +1,64 @@
 """
 song work - FastAPI 백엔드 서버
 포트: 8080 (Fly.io)
-DB : PostgreSQL (Supabase)
+DB : PostgreSQL (Supabase) 또는 SQLite 로컬 모드 (DATABASE_URL=sqlite:///data/songwork.db)
 """
-import asyncio
 import logging
-from datetime import datetime, timedelta
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.database import init_db, AsyncSessionLocal
+from app.database import init_db, AsyncSessionLocal, db_registry, IS_SQLITE
+from app.pagination import NEXT_CURSOR_HEADER
 from app.seed     import seed_if_empty
-from app.backup_manager import save_backup, restore_from_backup
-from app.routers  import auth, users, departments, tasks
+from app.backup_manager import save_backup, restore_from_backup, backup_service
+from app.routers  import auth, users, departments, tasks, task_batch
 from app.routers.backup import router as backup_router
 from app.routers.daily_records import router as daily_records_router, _upsert_record
 from app.routers.ai import router as ai_router
+from app.routers.sync import router as sync_router
+from app.routers.events import router as events_router
+from app.routers.search import router as search_router
+from app.routers.stats import router as stats_router
+from app.events import event_broker
+from app.auth import user_cache
+from app.stats import stats_cache
+from app.daily_recorder import daily_recorder
+from app.scheduler import scheduler, Job
+from app.tombstones import prune_tombstones
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-# ── 자정 자동 저장 스케줄러 ───────────────────────────
-async def _auto_save_scheduler():
-    """매일 자정(00:00 UTC)에 전날 보관함 자동 저장 + 백업"""
-    while True:
-        now = datetime.utcnow()
-        next_midnight = (now + timedelta(days=1)).replace(
-            hour=0, minute=0, second=5, microsecond=0
-        )
-        wait_secs = (next_midnight - now).total_seconds()
-        await asyncio.sleep(wait_secs)
-
-        yesterday = (datetime.utcnow() - timedelta(days=1)).date()
-        try:
-            async with AsyncSessionLocal() as db:
-                await _upsert_record(yesterday, "auto", db)
-        except Exception as e:
-            logger.error(f"[auto-save] 오류: {e}")
-
-        # 자정마다 백업 저장 (SQLite 환경에서만)
-        from app.database import DATABASE_URL as _DB_URL
-        if "postgresql" not in _DB_URL:
-            try:
-                async with AsyncSessionLocal() as db:
-                    await save_backup(db)
-                    logger.info("[auto-backup] 자정 자동 백업 완료")
-            except Exception as e:
-                logger.error(f"[auto-backup] 오류: {e}")
+# ── 자정 예약 작업 (app/scheduler.py 가 리더 하나에서 날짜별로 한 번씩 실행) ──
+async def _seal_daily_record(day):
+    """전날 보관함 봉인. 그 날 내내 증분 갱신해 왔으면 밀린 변경만 반영, 아니면 전체 계산"""
+    if daily_recorder.covers(day):
+        await daily_recorder.save(day, "auto")
+    else:
+        async with AsyncSessionLocal() as db:
+            await _upsert_record(day, "auto", db)
+
+
+async def _prune_tombstones(day):
+    """보존 기간이 지난 삭제 기록(tombstone) 정리"""
+    async with AsyncSessionLocal() as db:
+        pruned = await prune_tombstones(db)
+        if pruned:
+            logger.info(f"🧹 [sync] 오래된 삭제 기록 {pruned}건 정리")
+
+
+async def _auto_backup(day):
+    """자정마다 백업 저장 (SQLite 환경에서만)"""
+    async with AsyncSessionLocal() as db:
+        await save_backup(db)
+        logger.info("[auto-backup] 자정 자동 백업 완료")
+
+
+scheduler.add(Job("daily_record_seal", _seal_daily_record))
+scheduler.add(Job("prune_tombstones", _prune_tombstones, catch_up=False))
+scheduler.add(Job("auto_backup", _auto_backup, catch_up=False, enabled=lambda: IS_SQLITE))
 
 
 @asynccontextmanager
@@ -61,8 +71,8 @@ async def lifespan(app: FastAPI):
         await seed_if_empty(db)
 
     # 3. SQLite 환경에서만 backup.json 복원 (PostgreSQL은 DB 자체가 영구 저장)
-    from app.database import DATABASE_URL
-    if "postgresql" not in DATABASE_URL:
+    restored = False
+    if IS_SQLITE:
         async with AsyncSessionLocal() as db:
             restored = await restore_from_backup(db)
             if restored:
@@ -72,26 +82,33 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("✅ PostgreSQL(Supabase) 사용 중 - 백업 복원 불필요")
 
-    # 4. 스케줄러 시작
-    task = asyncio.create_task(_auto_save_scheduler())
+    # 4. 스케줄러 + 백그라운드 백업 서비스 + 실시간 알림 시작
+    await scheduler.start()
+    await backup_service.start()
+    await event_broker.start()
+    await daily_recorder.start()
+    if restored:
+        # 이미 연결된 구독자에게 전체 다시 읽기 알림 (재연결하는 클라이언트는 /sync/changes 의 reset 으로 따라잡음)
+        event_broker.reload("restore")
 
     yield
 
-    # 종료 시 백업 저장 (SQLite 환경에서만)
-    from app.database import DATABASE_URL
-    if "postgresql" not in DATABASE_URL:
-        try:
-            async with AsyncSessionLocal() as db:
-                await save_backup(db)
-                logger.info("✅ 종료 전 백업 저장 완료")
-        except Exception as e:
-            logger.error(f"종료 백업 오류: {e}")
+    # 예약 작업 중단 + 리더 잠금 반환 (다른 인스턴스가 이어받음)
+    await scheduler.stop()
+
+    # 열린 SSE 스트림 종료 + LISTEN 연결 반환
+    await event_broker.stop()
+
+    # 오늘 보관함에 아직 반영하지 않은 변경 반영
+    await daily_recorder.stop()
+
+    # 종료 시 대기 중인 변경만 journal 에 기록 (전체 스냅샷 없이 빠르게 종료)
+    await backup_service.stop()
+    if backup_service.last_error is None:
+        logger.info("✅ 종료 전 백업 정리 완료")
 
-    task.cancel()
-    try:
-        await task
-    except asyncio.CancelledError:
-        pass
+    # 연결 풀 정리 (primary + 읽기 복제본)
+    await db_registry.dispose()
 
 
 app = FastAPI(
@@ -107,6 +124,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],   # 페이지 커서 / 수정 버전을 웹 클라이언트에서 읽을 수 있게
 )
 
 # 라우터 등록
@@ -114,18 +132,28 @@ app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(departments.router)
 app.include_router(tasks.router)
+app.include_router(task_batch.router)
 app.include_router(daily_records_router)
 app.include_router(backup_router)
 app.include_router(ai_router)
+app.include_router(sync_router)
+app.include_router(events_router)
+app.include_router(search_router)
+app.include_router(stats_router)
 
 
 
 @app.get("/health")
 async def health():
-    from app.database import DATABASE_URL
-    db_type = "postgresql" if "postgresql" in DATABASE_URL else "sqlite"
+    db_type = "sqlite" if IS_SQLITE else "postgresql"
     return {
         "status": "ok",
         "service": "song work API",
         "db_type": db_type,
+        "events" : event_broker.status(),
+        "user_cache": user_cache.stats(),
+        "stats_cache": stats_cache.stats(),
+        "daily_recorder": daily_recorder.status(),
+        "scheduler": scheduler.status(),
+        "database": db_registry.status(),
     }
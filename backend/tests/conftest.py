@@ -0,0 +1,166 @@
+"""
+테스트 공용 설정
+- SQLite 로컬 모드 (임시 폴더의 파일 DB) 로 앱을 띄움 → 네트워크 DB 없이 실행
+- 테스트마다 DB / 백업 파일을 새로 만들고 lifespan (마이그레이션 + 시드) 을 다시 실행
+- 예약 작업 스케줄러는 자동으로 돌리지 않음 (필요한 테스트에서 tick() 을 직접 호출)
+- 인덱스 마이그레이션은 old_engine / assert_indexes_used 로 적용 전후 EXPLAIN 을 비교
+
+실행: cd backend && python -m pytest -q
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_TMP = Path(tempfile.mkdtemp(prefix="songwork-test-"))
+DB_PATH = _TMP / "test.db"
+
+# app 을 import 하기 전에 설정해야 함 (database.py 가 import 시점에 엔진을 만듦)
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("SCHEDULER_JITTER_SECONDS", "0")
+os.environ.setdefault("DAILY_RECORD_DEBOUNCE_SECONDS", "0")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+import pytest
+from sqlalchemy import text, insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import main
+from app import backup_manager
+from app.auth import user_cache
+from app.database import AsyncSessionLocal, Base
+from app.migrations import run_migrations
+from app.models import Task, Report, Tombstone, TaskStatus
+from app.stats import stats_cache
+
+
+# async 테스트는 anyio (asyncio) 로 실행: 테스트 모듈마다 pytestmark = pytest.mark.anyio
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _remove_db() -> None:
+    for suffix in ("", "-wal", "-shm"):
+        p = Path(f"{DB_PATH}{suffix}")
+        if p.exists():
+            p.unlink()
+
+
+@pytest.fixture
+async def app(tmp_path, monkeypatch):
+    """빈 DB + 시드 데이터로 앱 시작 (lifespan 전체), 테스트가 끝나면 종료"""
+    _remove_db()
+    monkeypatch.setattr(backup_manager, "BACKUP_PATH", tmp_path / "backup.json")
+    monkeypatch.setattr(backup_manager, "JOURNAL_PATH", tmp_path / "backup.journal.jsonl")
+
+    async def _no_scheduler():
+        return None
+    monkeypatch.setattr(main.scheduler, "start", _no_scheduler)
+    user_cache.clear()
+    stats_cache.clear()
+
+    async with main.lifespan(main.app):
+        yield main.app
+    _remove_db()
+
+
+async def login(c: httpx.AsyncClient, username: str, password: str) -> None:
+    r = await c.post("/auth/login", json={"username": username, "password": password})
+    assert r.status_code == 200, r.text
+    c.headers["Authorization"] = f"Bearer {r.json()['access_token']}"
+
+
+@pytest.fixture
+async def client(app):
+    """master 로 로그인한 클라이언트"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        await login(c, "master", "master1234")
+        yield c
+
+
+@pytest.fixture
+async def user_client(app):
+    """일반 사용자 (user1) 로 로그인한 클라이언트"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        await login(c, "user1", "user1234")
+        yield c
+
+
+@pytest.fixture
+async def db(app):
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+async def dept_id(client):
+    r = await client.get("/departments/")
+    return r.json()[0]["id"]
+
+
+# ── 인덱스 마이그레이션 EXPLAIN 확인 ───────────────────
+async def _fill_old_db(conn, n: int = 3000) -> None:
+    """부서 6개, 상태 고르게, 업무마다 보고 1건, 삭제 기록 약간 (운영과 비슷한 분포)"""
+    base = datetime(2026, 1, 1)
+    statuses = list(TaskStatus)
+    await conn.execute(insert(Task), [{
+        "id": f"t{i}", "title": f"업무 {i}", "dept_id": f"d{i % 6}",
+        "status": statuses[i % 3], "is_hidden": i % 5 == 0,
+        "created_at": base + timedelta(minutes=i), "updated_at": base + timedelta(minutes=i),
+        "completed_at": base + timedelta(minutes=i) if statuses[i % 3] == TaskStatus.done else None,
+    } for i in range(n)])
+    await conn.execute(insert(Report), [
+        {"id": f"r{i}", "task_id": f"t{i}", "content": "보고",
+         "created_at": base + timedelta(minutes=i), "updated_at": base + timedelta(minutes=i)}
+        for i in range(n)
+    ])
+    await conn.execute(insert(Tombstone), [
+        {"id": f"x{i}", "entity": "tasks", "entity_id": f"gone{i}", "deleted_at": base + timedelta(hours=i)}
+        for i in range(n // 10)
+    ])
+
+
+async def query_plan(conn, sql: str) -> str:
+    rows = (await conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))).all()
+    return " | ".join(r[-1] for r in rows)
+
+
+@pytest.fixture
+async def old_engine(tmp_path):
+    """create_all 후 ix_* 인덱스를 모두 지우고 데이터를 채운 DB (= 인덱스 마이그레이션 전 스키마)"""
+    eng = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+    async with eng.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        names = (await conn.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'ix\\_%' ESCAPE '\\'"
+        ))).scalars().all()
+        for name in names:
+            await conn.execute(text(f"DROP INDEX {name}"))
+        await _fill_old_db(conn)
+    yield eng
+    await eng.dispose()
+
+
+@pytest.fixture
+def assert_indexes_used(old_engine):
+    """
+    {인덱스 이름: 조회} → 마이그레이션 전에는 그 인덱스를 쓰지 않고,
+    마이그레이션 + ANALYZE 후에는 EXPLAIN QUERY PLAN 에 나오는지 확인
+    """
+    async def check(plans: dict[str, str]) -> None:
+        async with old_engine.connect() as conn:
+            for name, sql in plans.items():
+                plan = await query_plan(conn, sql)
+                assert name not in plan, plan
+        await run_migrations(old_engine)
+        async with old_engine.connect() as conn:
+            await conn.execute(text("ANALYZE"))
+            for name, sql in plans.items():
+                plan = await query_plan(conn, sql)
+                assert name in plan, f"{name}: {plan}"
+    return check
@@ -0,0 +1,72 @@
+"""
+완료 업무 보관함 (GET /tasks/archive) - 완료 업무만 (숨긴 것 포함), keyset 페이지, 완료일 필터
+"""
+from datetime import datetime
+import pytest
+from sqlalchemy import update
+
+from app import clock
+from app.models import Task
+
+pytestmark = pytest.mark.anyio
+
+
+async def _done(client, dept_id, title: str) -> dict:
+    task = (await client.post("/tasks/", json={"title": title, "dept_id": dept_id})).json()
+    return (await client.patch(f"/tasks/{task['id']}/status", json={"status": "done"})).json()
+
+
+async def test_archive_lists_done_tasks_including_hidden(client, dept_id):
+    a = await _done(client, dept_id, "완료 A")
+    await client.patch(f"/tasks/{a['id']}/hide")
+    open_ = (await client.post("/tasks/", json={"title": "진행 중", "dept_id": dept_id})).json()
+
+    ids = {t["id"] for t in (await client.get("/tasks/archive")).json()}
+    assert a["id"] in ids and open_["id"] not in ids
+    assert a["id"] not in {t["id"] for t in (await client.get("/tasks/")).json()}
+
+
+async def test_archive_pages_in_updated_order(client, dept_id):
+    for i in range(5):
+        await _done(client, dept_id, f"완료 {i}")
+    full = [t["id"] for t in (await client.get("/tasks/archive")).json()]
+
+    seen, cursor = [], None
+    while True:
+        r = await client.get("/tasks/archive", params={"limit": 2, **({"cursor": cursor} if cursor else {})})
+        seen += [t["id"] for t in r.json()]
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == full
+
+
+async def test_completion_date_filter_uses_org_day(client, db, dept_id):
+    late = await _done(client, dept_id, "23:30 완료")
+    next_ = await _done(client, dept_id, "다음 날 00:30 완료")
+    # Asia/Seoul 기준 3/1 23:30, 3/2 00:30 (UTC 로 저장)
+    await db.execute(update(Task).where(Task.id == late["id"]).values(completed_at=datetime(2026, 3, 1, 14, 30)))
+    await db.execute(update(Task).where(Task.id == next_["id"]).values(completed_at=datetime(2026, 3, 1, 15, 30)))
+    await db.commit()
+
+    day1 = {t["id"] for t in (await client.get("/tasks/archive", params={"from": "2026-03-01", "to": "2026-03-01"})).json()}
+    day2 = {t["id"] for t in (await client.get("/tasks/archive", params={"from": "2026-03-02", "to": "2026-03-02"})).json()}
+    assert day1 == {late["id"]}
+    assert day2 == {next_["id"]}
+
+
+async def test_created_as_done_is_in_date_filter(client, dept_id):
+    task = (await client.post("/tasks/", json={"title": "처음부터 완료", "dept_id": dept_id, "status": "done"})).json()
+    today = clock.today().isoformat()
+    ids = {t["id"] for t in (await client.get("/tasks/archive", params={"from": today, "to": today})).json()}
+    assert task["id"] in ids
+
+
+async def test_archive_pages_use_partial_indexes(assert_indexes_used):
+    await assert_indexes_used({
+        "ix_tasks_done_updated":
+            "SELECT id FROM tasks WHERE status = 'done' ORDER BY updated_at DESC, id DESC LIMIT 20",
+        "ix_tasks_done_dept_updated":
+            "SELECT id FROM tasks WHERE status = 'done' AND dept_id = 'x' "
+            "ORDER BY updated_at DESC, id DESC LIMIT 20",
+    })
@@ -0,0 +1,55 @@
+"""
+인증 사용자 캐시 - 비활성화 / 비밀번호 변경 즉시 반영, 다른 워커의 변경 알림으로 무효화
+"""
+import json
+import pytest
+
+from app.auth import user_cache
+from app.events import event_broker, EVENTS_CHANNEL
+
+pytestmark = pytest.mark.anyio
+
+
+async def _user1_id(client) -> str:
+    users = (await client.get("/users/")).json()
+    return next(u["id"] for u in users if u["username"] == "user1")
+
+
+async def test_deactivated_user_is_rejected_immediately(client, user_client):
+    assert (await user_client.get("/auth/me")).status_code == 200
+    uid = await _user1_id(client)
+
+    r = await client.patch(f"/users/{uid}", json={"is_active": False})
+    assert r.status_code == 200, r.text
+    assert (await user_client.get("/auth/me")).status_code in (401, 403)
+
+
+async def test_remote_user_change_evicts_cache(client, user_client):
+    assert (await user_client.get("/auth/me")).status_code == 200
+    uid = await _user1_id(client)
+    assert user_cache.get(uid) is not None
+
+    # 다른 워커가 커밋한 users 변경이 pg_notify 로 들어온 상황
+    payload = json.dumps([{"entity": "users", "op": "update", "id": uid, "version": None, "dept_ids": []}])
+    event_broker._on_notify(None, 0, EVENTS_CHANNEL, payload)
+    assert user_cache.get(uid) is None
+
+
+async def test_user_events_are_not_sent_to_subscribers(client, dept_id):
+    sub = event_broker.subscribe()
+    try:
+        uid = await _user1_id(client)
+        await client.patch(f"/users/{uid}", json={"display_name": "새 이름"})
+        task = (await client.post("/tasks/", json={"title": "다음", "dept_id": dept_id})).json()
+        event = await sub.queue.get()
+        assert (event["entity"], event["id"]) == ("tasks", task["id"])
+    finally:
+        event_broker.unsubscribe(sub)
+
+
+async def test_reload_clears_cache(user_client):
+    assert (await user_client.get("/auth/me")).status_code == 200
+    assert user_cache.stats()["size"] > 0
+    event_broker._deliver([{"entity": "*", "op": "reload", "id": None, "version": None,
+                            "dept_ids": [], "reason": "import"}])
+    assert user_cache.stats()["size"] == 0
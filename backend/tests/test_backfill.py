@@ -0,0 +1,62 @@
+"""
+보관함 기간 재생성 (POST /daily-records/backfill) - 날짜별 결과가 하루씩 계산한 것과 같은지, 권한 / 검증
+"""
+import asyncio
+from datetime import date, datetime, timedelta
+import pytest
+from sqlalchemy import select, update
+
+from app.models import DailyRecord, Report
+from app.routers.daily_records import _build_record_data
+
+pytestmark = pytest.mark.anyio
+
+FIRST, LAST = date(2026, 2, 9), date(2026, 2, 11)
+
+
+async def _wait(client, job_id: str) -> dict:
+    for _ in range(100):
+        job = (await client.get(f"/daily-records/backfill/{job_id}")).json()
+        if job["status"] != "running":
+            return job
+        await asyncio.sleep(0.05)
+    raise AssertionError("재생성 작업이 끝나지 않음")
+
+
+async def test_backfill_matches_per_day_build(client, db, dept_id):
+    task = (await client.post("/tasks/", json={"title": "지난 보고", "dept_id": dept_id})).json()
+    rep = (await client.post(f"/tasks/{task['id']}/reports", json={"content": "2/10 보고"})).json()
+    await db.execute(update(Report).where(Report.id == rep["id"]).values(created_at=datetime(2026, 2, 10, 3, 0)))
+    await db.commit()
+
+    r = await client.post("/daily-records/backfill", params={"from": FIRST.isoformat(), "to": LAST.isoformat()})
+    assert r.status_code == 202, r.text
+    job = await _wait(client, r.json()["job_id"])
+    assert (job["status"], job["done_days"], job["failed_days"]) == ("done", 3, 0)
+
+    db.expire_all()
+    records = {r.date: r for r in (await db.execute(
+        select(DailyRecord).where(DailyRecord.date.between(FIRST.isoformat(), LAST.isoformat()))
+    )).scalars()}
+    assert sorted(records) == ["2026-02-09", "2026-02-10", "2026-02-11"]
+    for i in range(3):
+        day = FIRST + timedelta(days=i)
+        expected = await _build_record_data(day, db)
+        got = records[day.isoformat()]
+        assert got.saved_by == "backfill"
+        assert got.summary_json["departments"] == expected["departments"]
+        assert got.total_tasks == expected["total_tasks"]
+
+    day10 = {t["id"]: t for d in records["2026-02-10"].summary_json["departments"] for t in d["tasks"]}
+    assert [x["content"] for x in day10[task["id"]]["reports"]] == ["2/10 보고"]
+    assert task["id"] not in {t["id"] for d in records["2026-02-11"].summary_json["departments"] for t in d["tasks"]}
+
+
+async def test_backfill_is_master_only(user_client):
+    r = await user_client.post("/daily-records/backfill", params={"from": "2026-02-01", "to": "2026-02-02"})
+    assert r.status_code == 403
+
+
+async def test_backfill_validates_range(client):
+    r = await client.post("/daily-records/backfill", params={"from": "2026-02-02", "to": "2026-02-01"})
+    assert r.status_code == 400
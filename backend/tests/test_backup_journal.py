@@ -0,0 +1,73 @@
+"""
+기준 스냅샷 + journal 백업 - 새 DB 에 복원하면 스냅샷 이후 변경 (추가 / 수정 / 삭제) 까지 재현,
+journal 이 길어지면 스냅샷으로 합침, 쓰다 만 마지막 줄은 무시
+"""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app import backup_manager
+from app.backup_manager import backup_service, restore_from_backup
+from app.database import Base
+from app.migrations import run_migrations
+from app.models import Task
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def fresh_db(tmp_path):
+    """복원 대상: 스키마만 있는 빈 DB"""
+    eng = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'restored.db'}")
+    async with eng.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await run_migrations(eng)
+    async with async_sessionmaker(eng, expire_on_commit=False)() as session:
+        yield session
+    await eng.dispose()
+
+
+async def _titles(db) -> dict[str, str]:
+    return dict((await db.execute(select(Task.id, Task.title))).all())
+
+
+async def test_snapshot_plus_journal_restores_later_changes(client, db, fresh_db, dept_id):
+    assert await backup_service.compact()
+    tasks = (await client.get("/tasks/")).json()
+    edited, removed = tasks[0], tasks[1]
+
+    added = (await client.post("/tasks/", json={"title": "스냅샷 이후", "dept_id": dept_id})).json()
+    await client.patch(f"/tasks/{edited['id']}", json={"title": "수정됨"})
+    await client.delete(f"/tasks/{removed['id']}")
+    assert await backup_service.flush()
+    assert backup_service.status()["journal_records"] >= 3
+
+    assert await restore_from_backup(fresh_db)
+    assert await _titles(fresh_db) == await _titles(db)
+    restored = await _titles(fresh_db)
+    assert restored[added["id"]] == "스냅샷 이후" and restored[edited["id"]] == "수정됨"
+    assert removed["id"] not in restored
+
+
+async def test_long_journal_is_compacted(client, dept_id, monkeypatch):
+    assert await backup_service.compact()
+    snapshots = backup_service.snapshots_written
+    monkeypatch.setattr(backup_service, "compact_every", 3)
+    for i in range(3):
+        await client.post("/tasks/", json={"title": f"합치기 {i}", "dept_id": dept_id})
+    assert await backup_service.flush()
+
+    assert backup_service.snapshots_written == snapshots + 1
+    assert backup_service.status()["journal_records"] == 0
+    assert backup_manager.JOURNAL_PATH.read_text() == ""
+
+
+async def test_torn_last_line_is_ignored(client, fresh_db, dept_id):
+    assert await backup_service.compact()
+    kept = (await client.post("/tasks/", json={"title": "온전한 줄", "dept_id": dept_id})).json()
+    assert await backup_service.flush()
+    with open(backup_manager.JOURNAL_PATH, "a", encoding="utf-8") as f:
+        f.write('{"seq": 999, "op": "upsert", "entity": "tasks", "da')     # 쓰다 만 줄
+
+    assert await restore_from_backup(fresh_db)
+    assert kept["id"] in await _titles(fresh_db)
@@ -0,0 +1,50 @@
+"""
+백그라운드 백업 서비스 - 요청 중에는 파일을 쓰지 않고, 모인 변경을 한 번에 journal 에 기록
+"""
+import json
+import pytest
+
+from app import backup_manager
+from app.backup_manager import backup_service
+
+pytestmark = pytest.mark.anyio
+
+
+def _journal() -> list[dict]:
+    path = backup_manager.JOURNAL_PATH
+    return [json.loads(l) for l in path.read_text(encoding="utf-8").splitlines() if l] if path.exists() else []
+
+
+@pytest.fixture
+async def baseline(app):
+    """기준 스냅샷을 만든 뒤 (journal 비어 있음) 에서 시작"""
+    assert await backup_service.compact()
+    assert _journal() == []
+
+
+async def test_request_does_not_write_backup(client, baseline, dept_id):
+    snapshot = backup_manager.BACKUP_PATH.read_bytes()
+    r = await client.post("/tasks/", json={"title": "백업 대기", "dept_id": dept_id})
+    assert r.status_code == 200
+    assert backup_service.pending
+    assert backup_manager.BACKUP_PATH.read_bytes() == snapshot and _journal() == []
+
+    status = (await client.get("/backup/status")).json()
+    assert status["pending"] is True and status["pending_changes"] >= 1
+
+
+async def test_changes_are_coalesced_into_one_append(client, baseline, dept_id):
+    appends = backup_service.journal_appends
+    ids = [(await client.post("/tasks/", json={"title": f"묶음 {i}", "dept_id": dept_id})).json()["id"]
+           for i in range(5)]
+    assert await backup_service.flush()
+
+    assert backup_service.journal_appends == appends + 1
+    assert not backup_service.pending
+    records = _journal()
+    assert {r["id"] for r in records if r["entity"] == "tasks"} >= set(ids)
+    assert [r["seq"] for r in records] == list(range(records[0]["seq"], records[0]["seq"] + len(records)))
+
+
+async def test_backup_status_is_master_only(user_client):
+    assert (await user_client.get("/backup/status")).status_code == 403
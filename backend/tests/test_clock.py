@@ -0,0 +1,56 @@
+"""
+기관 시간대 날짜 경계 - UTC 반열린 구간, 일광 절약 시간, 일일 보고가 기관 날짜로 묶이는지
+"""
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+import pytest
+from sqlalchemy import update
+
+from app import clock
+from app.models import Report
+
+pytestmark = pytest.mark.anyio
+
+
+def test_seoul_day_is_utc_range_from_previous_15h():
+    assert clock.day_range(date(2026, 3, 1)) == (datetime(2026, 2, 28, 15), datetime(2026, 3, 1, 15))
+    assert clock.day_range(date(2026, 3, 1), date(2026, 3, 3)) == (datetime(2026, 2, 28, 15), datetime(2026, 3, 3, 15))
+    assert clock.local_date(datetime(2026, 3, 1, 14, 59)) == date(2026, 3, 1)
+    assert clock.local_date(datetime(2026, 3, 1, 15, 0)) == date(2026, 3, 2)
+
+
+def test_dst_days_are_23_and_25_hours(monkeypatch):
+    monkeypatch.setattr(clock, "ORG_TZ", ZoneInfo("America/New_York"))
+    start, end = clock.day_range(date(2026, 3, 8))       # 서머타임 시작
+    assert (end - start).total_seconds() == 23 * 3600
+    start, end = clock.day_range(date(2026, 11, 1))      # 서머타임 끝
+    assert (end - start).total_seconds() == 25 * 3600
+
+
+def test_next_midnight():
+    assert clock.next_midnight(datetime(2026, 3, 1, 14, 59)) == datetime(2026, 3, 1, 15)
+    assert clock.next_midnight(datetime(2026, 3, 1, 15, 0)) == datetime(2026, 3, 2, 15)
+
+
+async def test_daily_report_groups_by_org_day(client, db, dept_id):
+    task = (await client.post("/tasks/", json={"title": "밤 보고", "dept_id": dept_id})).json()
+    rep = (await client.post(f"/tasks/{task['id']}/reports", json={"content": "자정 직후"})).json()
+    # UTC 3/1 15:30 = 서울 3/2 00:30
+    await db.execute(update(Report).where(Report.id == rep["id"]).values(created_at=datetime(2026, 3, 1, 15, 30)))
+    await db.commit()
+
+    async def task_ids(day: str) -> set[str]:
+        r = await client.get("/tasks/daily-report", params={"date": day})
+        assert r.status_code == 200, r.text
+        return {t["id"] for d in r.json() for t in d["tasks"]}
+
+    assert task["id"] not in await task_ids("2026-03-01")
+    assert task["id"] in await task_ids("2026-03-02")
+
+
+async def test_completion_range_uses_index(assert_indexes_used):
+    await assert_indexes_used({
+        "ix_tasks_done_completed":
+            "SELECT id FROM tasks WHERE status = 'done' "
+            "AND completed_at >= '2026-01-01' AND completed_at < '2026-01-02'",
+    })
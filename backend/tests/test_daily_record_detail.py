@@ -0,0 +1,77 @@
+"""
+보관함 요약 저장 형식과 부분 조회 - SQLite 는 압축 바이트 (예전 평문 JSON 도 읽음),
+GET /daily-records/{date}?dept_id=&status=&fields= 는 그 부분만 내려줌
+"""
+import json
+import zlib
+from datetime import datetime
+import pytest
+from sqlalchemy import text
+
+pytestmark = pytest.mark.anyio
+
+DAY = "2026-01-15"
+SUMMARY = {
+    "date": DAY,
+    "departments": [
+        {"dept_id": "d1", "dept_name": "기획", "tasks": [
+            {"id": "t1", "title": "완료 업무", "status": "done", "reports": []},
+            {"id": "t2", "title": "진행 업무", "status": "inProgress", "reports": [{"content": "보고"}]},
+        ]},
+        {"dept_id": "d2", "dept_name": "총무", "tasks": [
+            {"id": "t3", "title": "총무 진행", "status": "inProgress", "reports": []},
+        ]},
+    ],
+}
+
+
+async def _insert(db, summary) -> None:
+    await db.execute(text(
+        "INSERT INTO daily_records (id, date, summary_json, total_tasks, done_count, in_progress, "
+        "not_started, dept_count, saved_by, created_at, updated_at) "
+        "VALUES ('r1', :date, :summary, 3, 1, 2, 0, 2, 'manual', :now, :now)"
+    ), {"date": DAY, "summary": summary, "now": str(datetime.utcnow())})   # SQLAlchemy DateTime 과 같은 문자열
+    await db.commit()
+
+
+async def test_saved_summary_is_compressed(client, db):
+    r = await client.post("/daily-records/save", params={"target_date": DAY})
+    assert r.status_code == 200, r.text
+    raw = (await db.execute(text("SELECT summary_json FROM daily_records WHERE date = :d"), {"d": DAY})).scalar_one()
+    assert isinstance(raw, bytes)
+    assert json.loads(zlib.decompress(raw))["date"] == DAY
+    assert json.loads(r.json()["summary_json"])["date"] == DAY
+
+
+async def test_legacy_plain_json_is_still_readable(client, db):
+    await _insert(db, json.dumps(SUMMARY, ensure_ascii=False))
+    body = (await client.get(f"/daily-records/{DAY}")).json()
+    assert json.loads(body["summary_json"]) == SUMMARY
+
+
+async def test_partial_detail_filters(client, db):
+    await _insert(db, zlib.compress(json.dumps(SUMMARY, ensure_ascii=False).encode()))
+
+    async def summary(**params):
+        r = await client.get(f"/daily-records/{DAY}", params=params)
+        assert r.status_code == 200, r.text
+        return json.loads(r.json()["summary_json"])
+
+    by_dept = await summary(dept_id="d2")
+    assert [d["dept_id"] for d in by_dept["departments"]] == ["d2"]
+
+    by_status = await summary(status="done")
+    assert [(d["dept_id"], [t["id"] for t in d["tasks"]]) for d in by_status["departments"]] == [("d1", ["t1"])]
+
+    slim = await summary(fields="id,status")
+    assert slim["departments"][0]["tasks"][1] == {"id": "t2", "status": "inProgress"}
+
+    r = await client.get(f"/daily-records/{DAY}", params={"dept_id": "d2"})
+    assert r.json()["total_tasks"] == 3          # 합계는 그 날 전체 기준
+
+
+async def test_partial_detail_validation(client, db):
+    await _insert(db, json.dumps(SUMMARY))
+    assert (await client.get(f"/daily-records/{DAY}", params={"status": "bogus"})).status_code == 400
+    assert (await client.get(f"/daily-records/{DAY}", params={"fields": "password"})).status_code == 400
+    assert (await client.get("/daily-records/2000-01-01")).status_code == 404
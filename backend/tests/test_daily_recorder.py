@@ -0,0 +1,78 @@
+"""
+오늘의 일일 보관함 증분 갱신 - 바뀐 업무만 고쳐 쓴 결과가 전체 계산과 같은지, 수동 저장 / 조회
+"""
+import json
+import pytest
+from sqlalchemy import select
+
+from app import clock
+from app.daily_recorder import daily_recorder
+from app.models import DailyRecord
+from app.routers.daily_records import _build_record_data
+
+pytestmark = pytest.mark.anyio
+
+
+def _shape(data: dict) -> dict:
+    """비교용: 부서 → (업무 id, 상태, 보고 수) 목록 + 합계"""
+    return {
+        "depts": {d["dept_id"]: [(t["id"], t["status"], len(t["reports"])) for t in d["tasks"]]
+                  for d in data["departments"]},
+        "totals": [data[k] for k in ("total_tasks", "done_count", "in_progress", "not_started", "dept_count")],
+    }
+
+
+async def _today_record(db) -> DailyRecord:
+    db.expire_all()
+    return (await db.execute(
+        select(DailyRecord).where(DailyRecord.date == clock.today().isoformat())
+    )).scalar_one()
+
+
+async def test_incremental_patch_matches_full_rebuild(client, db, dept_id):
+    daily_recorder.mark_stale()               # 기준 기록은 전체 계산으로 만듦
+    await daily_recorder.flush()
+    rebuilt = daily_recorder.rebuilt
+
+    done = (await client.post("/tasks/", json={"title": "오늘 완료", "dept_id": dept_id})).json()
+    await client.patch(f"/tasks/{done['id']}/status", json={"status": "done"})
+    reported = (await client.post("/tasks/", json={"title": "오늘 보고", "dept_id": dept_id})).json()
+    await client.post(f"/tasks/{reported['id']}/reports", json={"content": "진행 상황"})
+    idle = (await client.post("/tasks/", json={"title": "아무 일 없음", "dept_id": dept_id})).json()
+    await daily_recorder.flush()
+
+    record = await _today_record(db)
+    assert daily_recorder.rebuilt == rebuilt
+    assert daily_recorder.patched > 0
+    ids = {t["id"] for d in record.summary_json["departments"] for t in d["tasks"]}
+    assert {done["id"], reported["id"]} <= ids and idle["id"] not in ids
+
+    full = await _build_record_data(clock.today(), db)
+    assert _shape(record.summary_json) == _shape(full)
+    assert record.total_tasks == full["total_tasks"] and record.done_count == full["done_count"]
+
+
+async def test_deleted_task_leaves_todays_record(client, db, dept_id):
+    task = (await client.post("/tasks/", json={"title": "지울 업무", "dept_id": dept_id})).json()
+    await client.patch(f"/tasks/{task['id']}/status", json={"status": "done"})
+    await daily_recorder.flush()
+    await client.delete(f"/tasks/{task['id']}")
+    await daily_recorder.flush()
+
+    record = await _today_record(db)
+    assert task["id"] not in {t["id"] for d in record.summary_json["departments"] for t in d["tasks"]}
+
+
+async def test_manual_save_and_read_back(client, dept_id):
+    task = (await client.post("/tasks/", json={"title": "저장", "dept_id": dept_id})).json()
+    await client.patch(f"/tasks/{task['id']}/status", json={"status": "done"})
+
+    r = await client.post("/daily-records/save")
+    assert r.status_code == 200, r.text
+    assert r.json()["saved_by"] == "manual"
+
+    today = clock.today().isoformat()
+    body = (await client.get(f"/daily-records/{today}")).json()
+    summary = json.loads(body["summary_json"])
+    assert task["id"] in {t["id"] for d in summary["departments"] for t in d["tasks"]}
+    assert today in {r["date"] for r in (await client.get("/daily-records/")).json()}
@@ -0,0 +1,74 @@
+"""
+일일 보고 (GET /tasks/daily-report) - 부서 수와 상관없이 같은 수의 쿼리, 그 날 완료 / 보고 업무만 부서별로
+"""
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+
+from app import clock
+from app.daily_recorder import daily_recorder
+from app.database import engine
+
+pytestmark = pytest.mark.anyio
+
+
+@contextmanager
+def count_queries():
+    counter = {"n": 0}
+
+    def before(*_):
+        counter["n"] += 1
+    event.listen(engine.sync_engine, "before_cursor_execute", before)
+    try:
+        yield counter
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before)
+
+
+async def _daily(client) -> list[dict]:
+    r = await client.get("/tasks/daily-report", params={"date": clock.today().isoformat()})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+async def _done_task(client, dept_id: str, title: str) -> dict:
+    task = (await client.post("/tasks/", json={"title": title, "dept_id": dept_id})).json()
+    await client.patch(f"/tasks/{task['id']}/status", json={"status": "done"})
+    return task
+
+
+async def test_query_count_does_not_grow_with_departments(client, dept_id):
+    await _done_task(client, dept_id, "첫 부서 완료")
+    await _daily(client)                      # 인증 캐시 등 준비
+    await daily_recorder.flush()              # 백그라운드 쿼리가 세는 동안 끼어들지 않게
+    with count_queries() as few:
+        await _daily(client)
+
+    for i in range(5):
+        dept = (await client.post("/departments/", json={"name": f"추가 부서 {i}"})).json()
+        await _done_task(client, dept["id"], f"추가 부서 {i} 완료")
+    await daily_recorder.flush()
+    with count_queries() as many:
+        body = await _daily(client)
+
+    assert len(body) >= 6
+    assert many["n"] == few["n"]
+
+
+async def test_groups_only_todays_work_by_department(client, dept_id):
+    done = await _done_task(client, dept_id, "오늘 완료")
+    reported = (await client.post("/tasks/", json={"title": "오늘 보고", "dept_id": dept_id})).json()
+    await client.post(f"/tasks/{reported['id']}/reports", json={"content": "진행"})
+    idle = (await client.post("/tasks/", json={"title": "아무 일 없음", "dept_id": dept_id})).json()
+
+    body = await _daily(client)
+    mine = next(d for d in body if d["dept"]["id"] == dept_id)
+    ids = {t["id"] for t in mine["tasks"]}
+    assert {done["id"], reported["id"]} <= ids and idle["id"] not in ids
+    assert [r["content"] for t in mine["tasks"] if t["id"] == reported["id"] for r in t["reports"]] == ["진행"]
+    assert all(d["tasks"] for d in body)
+
+
+async def test_bad_date_is_rejected(client):
+    r = await client.get("/tasks/daily-report", params={"date": "2026/03/01"})
+    assert r.status_code == 400
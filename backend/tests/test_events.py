@@ -0,0 +1,66 @@
+"""
+실시간 변경 알림 (SSE) - 커밋된 변경 이벤트 / 부서 필터 / 가져오기 후 reload
+(httpx ASGITransport 는 스트리밍 응답을 끝까지 모으므로 브로커 큐와 SSE 생성기를 직접 읽음)
+"""
+import asyncio
+import json
+import pytest
+
+from app.events import event_broker
+from app.routers.events import stream_events
+
+pytestmark = pytest.mark.anyio
+
+
+async def _next(sub, timeout=2.0):
+    return await asyncio.wait_for(sub.queue.get(), timeout)
+
+
+async def test_task_change_is_published_after_commit(client, dept_id):
+    sub = event_broker.subscribe()
+    try:
+        task = (await client.post("/tasks/", json={"title": "알림", "dept_id": dept_id})).json()
+        event = await _next(sub)
+        assert (event["entity"], event["op"], event["id"]) == ("tasks", "insert", task["id"])
+        assert event["dept_ids"] == [dept_id]
+    finally:
+        event_broker.unsubscribe(sub)
+
+
+async def test_dept_filter_skips_other_departments(client):
+    depts = [d["id"] for d in (await client.get("/departments/")).json()]
+    sub = event_broker.subscribe(depts[1])
+    try:
+        await client.post("/tasks/", json={"title": "다른 부서", "dept_id": depts[0]})
+        mine = (await client.post("/tasks/", json={"title": "내 부서", "dept_id": depts[1]})).json()
+        event = await _next(sub)
+        assert event["id"] == mine["id"]
+    finally:
+        event_broker.unsubscribe(sub)
+
+
+async def test_import_publishes_reload_to_every_subscriber(client):
+    exported = (await client.get("/backup/export")).json()
+    subs = [event_broker.subscribe(), event_broker.subscribe("some-dept")]
+    try:
+        assert (await client.post("/backup/import", json=exported)).status_code == 200
+        for sub in subs:
+            event = await _next(sub)
+            assert (event["op"], event["reason"]) == ("reload", "import")
+    finally:
+        for sub in subs:
+            event_broker.unsubscribe(sub)
+
+
+async def test_stream_sends_reload_event(app):
+    resp = await stream_events(dept_id=None, user=None)
+    chunks = resp.body_iterator
+    assert (await anext(chunks)).startswith("retry:")
+    assert (await anext(chunks)).startswith("event: ready")
+
+    event_broker.reload("restore")
+    chunk = await asyncio.wait_for(anext(chunks), 2.0)
+    head, data = chunk.strip().split("\n")
+    assert head == "event: reload"
+    assert json.loads(data.removeprefix("data: ")) == {"reason": "restore"}
+    await chunks.aclose()
@@ -0,0 +1,55 @@
+"""
+스트리밍 내보내기 (GET /backup/export) - JSON / NDJSON / gzip 이 같은 내용, NDJSON(.gz) 스트리밍 가져오기 왕복
+"""
+import gzip
+import json
+import pytest
+
+from app.routers import backup as backup_router
+
+pytestmark = pytest.mark.anyio
+
+ENTITIES = ("departments", "users", "tasks", "reports")
+
+
+def _ndjson_rows(raw: bytes) -> dict[str, list[dict]]:
+    lines = [json.loads(l) for l in raw.decode("utf-8").splitlines() if l]
+    assert lines[0]["entity"] == "meta"
+    out = {e: [] for e in ENTITIES}
+    for l in lines[1:]:
+        out[l["entity"]].append(l["data"])
+    return out
+
+
+async def test_formats_carry_the_same_rows(client, monkeypatch):
+    monkeypatch.setattr(backup_router, "EXPORT_BATCH_SIZE", 2)     # 여러 배치로 나뉘어도 올바른 JSON
+    as_json = (await client.get("/backup/export")).json()
+    as_ndjson = _ndjson_rows((await client.get("/backup/export", params={"format": "ndjson"})).content)
+
+    r = await client.get("/backup/export", params={"gzip": True})
+    assert r.headers["content-type"] == "application/gzip"
+    assert 'filename="songwork-export-' in r.headers["content-disposition"]
+    as_gzip = json.loads(gzip.decompress(r.content))
+
+    for entity in ENTITIES:
+        ids = [row["id"] for row in as_json[entity]]
+        assert ids, entity
+        assert [row["id"] for row in as_ndjson[entity]] == ids
+        assert [row["id"] for row in as_gzip[entity]] == ids
+
+
+async def test_gzip_ndjson_round_trip(client):
+    r = await client.get("/backup/export", params={"format": "ndjson", "gzip": True})
+    exported = _ndjson_rows(gzip.decompress(r.content))
+    r = await client.post("/backup/import/stream", content=r.content)
+    assert r.status_code == 200, r.text
+    assert r.json()["restored"] == {e: len(exported[e]) for e in ENTITIES}
+
+
+async def test_stream_import_rejects_garbage(client):
+    r = await client.post("/backup/import/stream", content=b"not json\n")
+    assert r.status_code == 400
+
+
+async def test_export_is_master_only(user_client):
+    assert (await user_client.get("/backup/export")).status_code == 403
@@ -0,0 +1,28 @@
+"""
+앱 기동 (lifespan: 마이그레이션 + 시드) / 헬스 체크
+"""
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_health_reports_sqlite_mode(client):
+    r = await client.get("/health")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["status"] == "ok"
+    assert body["db_type"] == "sqlite"
+    assert body["events"]["running"] is True
+
+
+async def test_seeded_data_is_visible(client):
+    depts = (await client.get("/departments/")).json()
+    tasks = (await client.get("/tasks/")).json()
+    assert len(depts) == 6
+    assert tasks and all(t["dept_id"] in {d["id"] for d in depts} for t in tasks)
+
+
+async def test_requests_require_login(app):
+    import httpx
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        assert (await c.get("/tasks/")).status_code == 401
@@ -0,0 +1,56 @@
+"""
+백업 가져오기 일괄 upsert - 있는 행은 덮어쓰고 없는 행은 추가, 여러 청크로 나눠도 같은 결과,
+검색 색인 / 연결 표도 함께 갱신
+"""
+import json
+import pytest
+from sqlalchemy import select, func
+
+from app.importer import import_payload
+from app.models import Task
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_import_updates_existing_and_adds_new(client):
+    exported = (await client.get("/backup/export")).json()
+    before = len(exported["tasks"])
+    exported["tasks"][0]["title"] = "가져오며 바뀐 제목"
+    new = {**exported["tasks"][1], "id": "imported-task", "title": "가져온 새 업무 예산",
+           "assignee_ids": json.dumps(["u-import"])}
+    exported["tasks"].append(new)
+
+    r = await client.post("/backup/import", json=exported)
+    assert r.status_code == 200, r.text
+    assert r.json()["restored"]["tasks"] == before + 1
+
+    tasks = {t["id"]: t for t in (await client.get("/tasks/", params={"include_hidden": True})).json()}
+    assert len(tasks) == before + 1
+    assert tasks[exported["tasks"][0]["id"]]["title"] == "가져오며 바뀐 제목"
+    assert "imported-task" in {t["id"] for t in (await client.get("/tasks/", params={"assignee_id": "u-import"})).json()}
+    hits = (await client.get("/search", params={"q": "가져온 새 업무"})).json()["items"]
+    assert "imported-task" in {h["task_id"] for h in hits}
+
+
+async def test_import_is_idempotent(client):
+    exported = (await client.get("/backup/export")).json()
+    for _ in range(2):
+        assert (await client.post("/backup/import", json=exported)).status_code == 200
+    again = (await client.get("/backup/export")).json()
+    for entity in ("users", "departments", "tasks", "reports"):
+        assert len(again[entity]) == len(exported[entity])
+
+
+async def test_small_chunks_give_same_result(client, db):
+    exported = (await client.get("/backup/export")).json()
+    for t in exported["tasks"]:
+        t["title"] += " (청크)"
+    result = await import_payload(db, exported, chunk_size=2)
+    await db.commit()
+    assert result["restored"]["tasks"] == len(exported["tasks"])
+    changed = (await db.execute(select(func.count()).where(Task.title.like("% (청크)")))).scalar_one()
+    assert changed == len(exported["tasks"])
+
+
+async def test_import_is_master_only(user_client):
+    assert (await user_client.post("/backup/import", json={})).status_code == 403
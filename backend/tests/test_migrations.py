@@ -0,0 +1,51 @@
+"""
+마이그레이션 실행기 + v001 자주 쓰는 조회 인덱스
+- 인덱스가 없던 예전 스키마의 SQLite DB (운영과 비슷한 분포의 데이터) 에 마이그레이션을 적용하고
+  ANALYZE 한 뒤 EXPLAIN QUERY PLAN 이 새 인덱스를 쓰는지 (적용 전에는 쓰지 않는지) 확인
+"""
+import pytest
+from sqlalchemy import select, text
+
+from app.migrations import run_migrations, schema_version, _discover
+
+pytestmark = pytest.mark.anyio
+
+# v001 이 만드는 인덱스 → 그 인덱스를 써야 하는 조회
+PLANS = {
+    "ix_tasks_dept_hidden_created":
+        "SELECT id FROM tasks WHERE dept_id = 'x' AND is_hidden = 0 ORDER BY created_at DESC",
+    "ix_tasks_status_updated":
+        "SELECT id FROM tasks WHERE status = 'inProgress' AND updated_at > '2026-01-01'",
+    "ix_reports_task_created":
+        "SELECT id FROM reports WHERE task_id = 'x' ORDER BY created_at",
+    "ix_reports_created":
+        "SELECT id FROM reports WHERE created_at >= '2026-01-01' AND created_at < '2026-01-02'",
+}
+
+
+async def test_migrations_add_indexes_used_by_hot_queries(assert_indexes_used):
+    await assert_indexes_used(PLANS)
+
+
+async def test_daily_record_lookup_uses_unique_date_index(old_engine):
+    """daily_records(date) 는 UNIQUE 제약의 인덱스를 그대로 씀 (마이그레이션 전후 모두)"""
+    sql = "EXPLAIN QUERY PLAN SELECT id FROM daily_records WHERE date = '2026-01-01'"
+    for _ in range(2):
+        async with old_engine.connect() as conn:
+            plan = " | ".join(r[-1] for r in (await conn.execute(text(sql))).all())
+        assert "USING INDEX sqlite_autoindex_daily_records" in plan, plan
+        await run_migrations(old_engine)
+
+
+async def test_migrations_run_once_and_are_recorded(old_engine):
+    first = await run_migrations(old_engine)
+    assert first == [m.VERSION for m in _discover()]
+    assert await run_migrations(old_engine) == []
+    async with old_engine.connect() as conn:
+        versions = (await conn.execute(select(schema_version.c.version))).scalars().all()
+    assert sorted(versions) == first
+
+
+async def test_migration_versions_are_unique_and_ordered():
+    versions = [m.VERSION for m in _discover()]
+    assert versions == sorted(set(versions))
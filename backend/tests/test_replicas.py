@@ -0,0 +1,76 @@
+"""
+읽기 복제본 선택 (EngineRegistry.pick) - 지연 허용치, 이 프로세스의 쓰기 이후 반영 여부, 연결 오류 제외, 순환
+(복제 지연 점검은 가짜로 바꿔 PostgreSQL 없이 확인)
+"""
+import asyncio
+import time
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import database
+from app.database import EngineRegistry, _Replica, AsyncSessionLocal
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def registry(monkeypatch):
+    reg = EngineRegistry(AsyncSessionLocal, [])
+    lags = {}
+    for name in ("replica1", "replica2"):
+        e = create_async_engine("sqlite+aiosqlite://")
+        reg.replicas.append(_Replica(name, e, async_sessionmaker(e)))
+        reg._locks[name] = asyncio.Lock()
+        lags[name] = 0.0
+
+    async def fake_check(r):
+        r.lag, r.ok = lags[r.name], True
+        r.synced_at = time.time() - r.lag
+        r.checked_at = time.monotonic()
+    monkeypatch.setattr(reg, "_check", fake_check)
+    reg.lags = lags
+    yield reg
+    for r in reg.replicas:
+        await r.engine.dispose()
+
+
+async def test_no_replicas_reads_primary():
+    reg = EngineRegistry(AsyncSessionLocal, [])
+    assert await reg.pick() is None
+    assert reg.sessions(None) is AsyncSessionLocal
+
+
+async def test_round_robin_over_healthy_replicas(registry):
+    picked = [(await registry.pick()).name for _ in range(4)]
+    assert picked == ["replica1", "replica2", "replica1", "replica2"]
+
+
+async def test_lagging_replica_is_skipped(registry, monkeypatch):
+    monkeypatch.setattr(database, "DB_REPLICA_MAX_LAG_SECONDS", 1.0)
+    registry.lags["replica1"] = 30.0
+    assert {(await registry.pick()).name for _ in range(3)} == {"replica2"}
+
+    registry.lags["replica2"] = 30.0
+    for r in registry.replicas:
+        r.checked_at = 0.0               # 다음 pick 때 다시 점검
+    assert await registry.pick() is None
+    assert registry.primary_reads == 1
+
+
+async def test_own_write_waits_for_replica_to_catch_up(registry, monkeypatch):
+    await registry.pick()
+    registry.note_write()
+    monkeypatch.setattr(database, "_RECHECK_AFTER_WRITE", 60.0)
+    # 쓰기 이후 점검 전 → 복제본에 아직 없을 수 있으므로 primary
+    assert await registry.pick() is None
+
+    monkeypatch.setattr(database, "_RECHECK_AFTER_WRITE", 0.0)
+    assert await registry.pick() is not None
+
+
+async def test_connection_error_marks_replica_down(registry):
+    first = await registry.pick()
+    registry.mark_down(first, OSError("연결 끊김"))
+    picked = [(await registry.pick()).name for _ in range(3)]
+    assert first.name not in picked
+    assert registry.status()["replicas"][0]["failures"] == 1
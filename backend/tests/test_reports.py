@@ -0,0 +1,43 @@
+"""
+업무의 중간보고 목록 (GET /tasks/{id}/reports) - keyset 페이지, 정렬 방향, 없는 업무 404
+"""
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def task_with_reports(client, dept_id):
+    task = (await client.post("/tasks/", json={"title": "보고 목록", "dept_id": dept_id})).json()
+    for i in range(5):
+        r = await client.post(f"/tasks/{task['id']}/reports", json={"content": f"보고 {i}"})
+        assert r.status_code == 200, r.text
+    return task
+
+
+async def _all_pages(client, task_id: str, **params) -> list[str]:
+    seen, cursor = [], None
+    while True:
+        r = await client.get(f"/tasks/{task_id}/reports",
+                             params={**params, **({"cursor": cursor} if cursor else {})})
+        assert r.status_code == 200, r.text
+        seen += [rep["content"] for rep in r.json()]
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            return seen
+
+
+async def test_pages_in_both_orders(client, task_with_reports):
+    contents = [f"보고 {i}" for i in range(5)]
+    assert await _all_pages(client, task_with_reports["id"], limit=2) == contents
+    assert await _all_pages(client, task_with_reports["id"], limit=2, order="desc") == contents[::-1]
+
+
+async def test_single_page_has_no_cursor(client, task_with_reports):
+    r = await client.get(f"/tasks/{task_with_reports['id']}/reports")
+    assert len(r.json()) == 5 and "X-Next-Cursor" not in r.headers
+
+
+async def test_unknown_task_is_404(client):
+    r = await client.get("/tasks/no-such-task/reports")
+    assert r.status_code == 404
@@ -0,0 +1,109 @@
+"""
+예약 작업 스케줄러 - 밀린 날짜 처리 (catch-up), 실패 시 그 날짜에서 멈춤, 짧은 임대 + 날짜마다 갱신
+(tick() 을 직접 호출, 작업은 테스트용 Job)
+"""
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import update
+
+from app import clock
+from app.database import AsyncSessionLocal
+from app.models import JobRun
+from app.scheduler import Scheduler, Job, SCHEDULER_LEASE_MARGIN_SECONDS
+
+pytestmark = pytest.mark.anyio
+
+TIMEOUT = 5.0
+
+
+async def _job_row(name: str) -> JobRun:
+    async with AsyncSessionLocal() as db:
+        return await db.get(JobRun, name)
+
+
+async def _set_row(name: str, **values) -> None:
+    async with AsyncSessionLocal() as db:
+        row = await db.get(JobRun, name)
+        if row is None:
+            db.add(JobRun(name=name, **values))
+        else:
+            await db.execute(update(JobRun).where(JobRun.name == name).values(**values))
+        await db.commit()
+
+
+def _days_ago(n: int) -> str:
+    return (clock.today() - timedelta(days=n)).isoformat()
+
+
+def _recording_scheduler(ran: list, fail_on: str | None = None, on_run=None) -> Scheduler:
+    async def run(day):
+        ran.append(day.isoformat())
+        if on_run:
+            await on_run(day)
+        if day.isoformat() == fail_on:
+            raise RuntimeError("실패")
+    s = Scheduler()
+    s.add(Job("test_job", run, timeout=TIMEOUT))
+    return s
+
+
+async def test_catch_up_runs_missed_days_in_order(app):
+    await _set_row("test_job", last_run_for=_days_ago(4))
+    ran = []
+    await _recording_scheduler(ran).tick()
+    assert ran == [_days_ago(3), _days_ago(2), _days_ago(1)]
+    row = await _job_row("test_job")
+    assert row.last_run_for == _days_ago(1)
+    assert row.lease_owner is None and row.lease_until is None
+
+
+async def test_failure_stops_at_that_day_and_retries(app):
+    await _set_row("test_job", last_run_for=_days_ago(3))
+    ran = []
+    s = _recording_scheduler(ran, fail_on=_days_ago(1))
+    await s.tick()
+    assert ran == [_days_ago(2), _days_ago(1)]
+    assert (await _job_row("test_job")).last_run_for == _days_ago(2)
+    assert s.metrics["test_job"]["failures"] == 1
+
+    await s.tick()
+    assert ran[-1] == _days_ago(1)
+
+
+async def test_lease_is_short_and_renewed_per_day(app):
+    await _set_row("test_job", last_run_for=_days_ago(3))
+    leases = []
+
+    async def see_lease(day):
+        leases.append(((await _job_row("test_job")).lease_until, datetime.utcnow()))
+    await _recording_scheduler([], on_run=see_lease).tick()
+
+    assert len(leases) == 2
+    for until, now in leases:
+        assert until - now <= timedelta(seconds=TIMEOUT + SCHEDULER_LEASE_MARGIN_SECONDS)
+    assert leases[1][0] > leases[0][0]
+
+
+async def test_live_lease_of_other_owner_blocks_expired_does_not(app):
+    await _set_row("test_job", last_run_for=_days_ago(2), lease_owner="other",
+                   lease_until=datetime.utcnow() + timedelta(minutes=1))
+    ran = []
+    s = _recording_scheduler(ran)
+    await s.tick()
+    assert ran == []
+
+    await _set_row("test_job", lease_until=datetime.utcnow() - timedelta(seconds=1))
+    await s.tick()
+    assert ran == [_days_ago(1)]
+
+
+async def test_lost_lease_stops_catch_up(app):
+    await _set_row("test_job", last_run_for=_days_ago(4))
+
+    async def steal(day):
+        # 이 날짜를 처리하는 사이 임대가 끝나 다른 프로세스가 가져감
+        await _set_row("test_job", lease_owner="other")
+    ran = []
+    await _recording_scheduler(ran, on_run=steal).tick()
+    assert ran == [_days_ago(3)]
+    assert (await _job_row("test_job")).lease_owner == "other"
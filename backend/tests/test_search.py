@@ -0,0 +1,30 @@
+"""
+전문 검색 - /search 와 /search/ 모두 리다이렉트 없이 응답, 한국어 부분 일치, 관련도 순서
+"""
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("path", ["/search", "/search/"])
+async def test_search_path_without_redirect(client, dept_id, path):
+    await client.post("/tasks/", json={"title": "예산 편성 회의", "dept_id": dept_id})
+    r = await client.get(path, params={"q": "예산"})
+    assert r.status_code == 200, r.text
+    assert any(h["task_title"] == "예산 편성 회의" for h in r.json()["items"])
+
+
+async def test_title_match_ranks_before_body_match(client, dept_id):
+    body = (await client.post("/tasks/", json={
+        "title": "주간 회의", "description": "다음 분기 결산 자료 준비", "dept_id": dept_id,
+    })).json()
+    title = (await client.post("/tasks/", json={"title": "결산 보고서", "dept_id": dept_id})).json()
+
+    items = (await client.get("/search", params={"q": "결산"})).json()["items"]
+    ids = [h["task_id"] for h in items]
+    assert ids.index(title["id"]) < ids.index(body["id"])
+
+
+async def test_search_without_word_characters_is_rejected(client):
+    r = await client.get("/search", params={"q": "!!!"})
+    assert r.status_code == 400
@@ -0,0 +1,37 @@
+"""
+SQLite 로컬 모드 - 연결마다 PRAGMA 적용, 동시 쓰기 요청이 차례로 처리되어 잠금 오류 없이 성공
+"""
+import asyncio
+import pytest
+from sqlalchemy import text
+
+from app.database import engine, sqlite_writes, _aiosqlite_url, SQLITE_BUSY_TIMEOUT_MS
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_pragmas_are_applied(app):
+    async with engine.connect() as conn:
+        assert (await conn.scalar(text("PRAGMA journal_mode"))) == "wal"
+        assert (await conn.scalar(text("PRAGMA synchronous"))) == 1          # NORMAL
+        assert (await conn.scalar(text("PRAGMA busy_timeout"))) == SQLITE_BUSY_TIMEOUT_MS
+        assert (await conn.scalar(text("PRAGMA temp_store"))) == 2           # MEMORY
+
+
+async def test_concurrent_writes_all_succeed(client, dept_id):
+    before = sqlite_writes["waited"]
+    results = await asyncio.gather(*(
+        client.post("/tasks/", json={"title": f"동시 {i}", "dept_id": dept_id}) for i in range(10)
+    ))
+    assert [r.status_code for r in results] == [200] * 10
+    assert sqlite_writes["waited"] > before
+    titles = {t["title"] for t in (await client.get("/tasks/")).json()}
+    assert {f"동시 {i}" for i in range(10)} <= titles
+
+
+def test_url_conversion(tmp_path):
+    assert _aiosqlite_url("sqlite://") == "sqlite+aiosqlite:///"
+    assert _aiosqlite_url("sqlite:///:memory:") == "sqlite+aiosqlite:///:memory:"
+    target = tmp_path / "nested" / "app.db"
+    assert _aiosqlite_url(f"sqlite:///{target}") == f"sqlite+aiosqlite:///{target}"
+    assert target.parent.is_dir()
@@ -0,0 +1,41 @@
+"""
+대시보드 집계 (GET /stats/overview) - 목록과 같은 건수, 캐시 재사용, 업무 커밋 시 무효화
+"""
+from collections import Counter
+from datetime import datetime, timedelta
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def _overview(client, **params) -> dict:
+    r = await client.get("/stats/overview", params=params)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+async def test_counts_match_task_list(client):
+    tasks = (await client.get("/tasks/", params={"include_reports": "none"})).json()
+    body = await _overview(client)
+    assert body["total"] == len(tasks)
+    assert {k: v for k, v in body["by_status"].items() if v} == Counter(t["status"] for t in tasks)
+    assert sum(d["total"] for d in body["by_dept"]) == len(tasks)
+
+
+async def test_second_call_is_cached_until_a_task_changes(client, dept_id):
+    first = await _overview(client)
+    again = await _overview(client)
+    assert again["cached"] is True and again["data_version"] == first["data_version"]
+
+    yesterday = (datetime.utcnow() - timedelta(days=1)).isoformat()
+    await client.post("/tasks/", json={"title": "기한 지남", "dept_id": dept_id, "due_date": yesterday})
+    fresh = await _overview(client)
+    assert fresh["cached"] is False and fresh["data_version"] > first["data_version"]
+    assert fresh["total"] == first["total"] + 1
+    assert fresh["overdue"] == first["overdue"] + 1
+
+
+async def test_assignee_filter(client, dept_id):
+    await client.post("/tasks/", json={"title": "담당", "dept_id": dept_id, "assignee_ids": '["u-stats"]'})
+    body = await _overview(client, assignee_id="u-stats")
+    assert body["total"] == 1
@@ -0,0 +1,95 @@
+"""
+업무 일괄 변경 (POST /tasks/batch) - 한 번에 적용 / atomic 취소 / 항목별 버전 확인 (409)
+"""
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def _new_task(client, dept_id, title="일괄") -> dict:
+    r = await client.post("/tasks/", json={"title": title, "dept_id": dept_id})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+async def test_mixed_ops_are_applied_together(client, dept_id):
+    a = await _new_task(client, dept_id, "가")
+    b = await _new_task(client, dept_id, "나")
+    r = await client.post("/tasks/batch", json={"ops": [
+        {"op": "create", "data": {"title": "새 업무", "dept_id": dept_id}},
+        {"op": "update", "id": a["id"], "data": {"title": "가 (수정)"}},
+        {"op": "status", "id": b["id"], "status": "done"},
+        {"op": "hide",   "id": b["id"]},
+    ]})
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["ok"] and body["applied"] == 4
+    results = body["results"]
+    assert results[0]["task"]["title"] == "새 업무"
+    assert results[1]["task"]["title"] == "가 (수정)"
+    assert results[3]["task"]["status"] == "done" and results[3]["task"]["is_hidden"]
+
+
+async def test_atomic_failure_applies_nothing_and_marks_nothing_ok(client, dept_id):
+    a = await _new_task(client, dept_id)
+    r = await client.post("/tasks/batch", json={"ops": [
+        {"op": "create", "data": {"title": "만들면 안 됨", "dept_id": dept_id}},
+        {"op": "update", "id": a["id"], "data": {"title": "바뀌면 안 됨"}},
+        {"op": "delete", "id": "no-such-task"},
+    ]})
+    assert r.status_code == 400
+    body = r.json()
+    assert body["ok"] is False and body["applied"] == 0
+    assert not any(it["ok"] for it in body["results"])
+    assert body["results"][0]["id"] is None
+    assert body["results"][2]["code"] == 404
+
+    titles = {t["title"] for t in (await client.get("/tasks/")).json()}
+    assert "만들면 안 됨" not in titles and "바뀌면 안 됨" not in titles
+
+
+async def test_non_atomic_applies_valid_ops(client, dept_id):
+    a = await _new_task(client, dept_id)
+    r = await client.post("/tasks/batch", json={"atomic": False, "ops": [
+        {"op": "update", "id": a["id"], "data": {"title": "반영됨"}},
+        {"op": "delete", "id": "no-such-task"},
+    ]})
+    body = r.json()
+    assert body["ok"] is False and body["applied"] == 1
+    assert [it["ok"] for it in body["results"]] == [True, False]
+
+
+async def test_stale_version_is_rejected_with_409(client, dept_id):
+    a = await _new_task(client, dept_id)
+    fresh = (await client.patch(f"/tasks/{a['id']}", json={"title": "다른 사람이 먼저"})).json()
+
+    r = await client.post("/tasks/batch", json={"ops": [
+        {"op": "update", "id": a["id"], "version": a["version"], "data": {"title": "덮어쓰기"}},
+    ]})
+    assert r.status_code == 409
+    item = r.json()["results"][0]
+    assert (item["ok"], item["code"]) == (False, 409)
+
+    titles = {t["title"] for t in (await client.get("/tasks/")).json()}
+    assert "덮어쓰기" not in titles
+    r = await client.post("/tasks/batch", json={"ops": [
+        {"op": "status", "id": a["id"], "version": fresh["version"], "status": "inProgress"},
+    ]})
+    assert r.status_code == 200, r.text
+    assert r.json()["results"][0]["task"]["version"] == fresh["version"] + 1
+
+
+async def test_unknown_department_fails_only_that_item(client, dept_id):
+    a = await _new_task(client, dept_id)
+    r = await client.post("/tasks/batch", json={"atomic": False, "ops": [
+        {"op": "create", "data": {"title": "없는 부서", "dept_id": "no-such-dept"}},
+        {"op": "create", "data": {"title": "있는 부서", "dept_id": dept_id}},
+        {"op": "update", "id": a["id"], "data": {"dept_id": "no-such-dept"}},
+    ]})
+    assert r.status_code == 200, r.text
+    results = r.json()["results"]
+    assert [(it["ok"], it["code"]) for it in results] == [(False, 404), (True, None), (False, 404)]
+    assert results[0]["id"] is None
+
+    titles = {t["title"] for t in (await client.get("/tasks/")).json()}
+    assert "없는 부서" not in titles and "있는 부서" in titles
@@ -0,0 +1,65 @@
+"""
+담당자 / 공유 부서 연결 표 - 생성·수정·일괄 변경·삭제가 표에 반영되고 목록 필터가 그 표로 찾음
+"""
+import json
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def _ids(client, **params) -> set[str]:
+    r = await client.get("/tasks/", params=params)
+    assert r.status_code == 200, r.text
+    return {t["id"] for t in r.json()}
+
+
+@pytest.fixture
+async def depts(client):
+    return [d["id"] for d in (await client.get("/departments/")).json()]
+
+
+async def test_assignee_filter_follows_create_and_update(client, depts):
+    task = (await client.post("/tasks/", json={
+        "title": "담당", "dept_id": depts[0], "assignee_ids": json.dumps(["u-a", "u-b"]),
+    })).json()
+    assert task["id"] in await _ids(client, assignee_id="u-b")
+
+    await client.patch(f"/tasks/{task['id']}", json={"assignee_ids": json.dumps(["u-c"])})
+    assert task["id"] not in await _ids(client, assignee_id="u-b")
+    assert task["id"] in await _ids(client, assignee_id="u-c")
+
+
+async def test_shared_dept_filter_includes_own_shared_and_all(client, depts):
+    own    = (await client.post("/tasks/", json={"title": "소속", "dept_id": depts[1]})).json()
+    shared = (await client.post("/tasks/", json={
+        "title": "공유", "dept_id": depts[0], "department_ids": json.dumps([depts[1]]),
+    })).json()
+    to_all = (await client.post("/tasks/", json={
+        "title": "전체 공유", "dept_id": depts[2], "department_ids": json.dumps(["__ALL__"]),
+    })).json()
+    other  = (await client.post("/tasks/", json={"title": "다른 부서", "dept_id": depts[3]})).json()
+
+    found = await _ids(client, shared_dept_id=depts[1])
+    assert {own["id"], shared["id"], to_all["id"]} <= found
+    assert other["id"] not in found
+
+
+async def test_batch_update_and_delete_keep_links_in_sync(client, depts):
+    task = (await client.post("/tasks/", json={
+        "title": "일괄 연결", "dept_id": depts[0], "assignee_ids": json.dumps(["u-x"]),
+    })).json()
+    r = await client.post("/tasks/batch", json={"ops": [
+        {"op": "update", "id": task["id"], "data": {"assignee_ids": json.dumps(["u-y"])}},
+    ]})
+    assert r.status_code == 200, r.text
+    assert task["id"] in await _ids(client, assignee_id="u-y")
+    assert task["id"] not in await _ids(client, assignee_id="u-x")
+
+    await client.post("/tasks/batch", json={"ops": [{"op": "delete", "id": task["id"]}]})
+    assert await _ids(client, assignee_id="u-y") == set()
+
+
+async def test_malformed_json_is_ignored(client, depts):
+    r = await client.post("/tasks/", json={"title": "잘못된 JSON", "dept_id": depts[0], "assignee_ids": "not json"})
+    assert r.status_code == 200
+    assert r.json()["id"] not in await _ids(client, assignee_id="not json")
@@ -0,0 +1,72 @@
+"""
+업무 목록 (GET /tasks/) - keyset 페이지 (X-Next-Cursor) 와 보고 포함 방식 (include_reports)
+"""
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def _pages(client, path: str, **params) -> list[list[dict]]:
+    pages, cursor = [], None
+    while True:
+        r = await client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert r.status_code == 200, r.text
+        pages.append(r.json())
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+
+
+async def test_keyset_pages_cover_full_list_once(client):
+    full = [t["id"] for t in (await client.get("/tasks/")).json()]
+    pages = await _pages(client, "/tasks/", limit=3)
+    assert all(len(p) <= 3 for p in pages)
+    assert [t["id"] for p in pages for t in p] == full
+
+
+async def test_new_task_does_not_shift_later_pages(client, dept_id):
+    first = await client.get("/tasks/", params={"limit": 2})
+    cursor = first.headers["X-Next-Cursor"]
+    expected = (await client.get("/tasks/", params={"limit": 2, "cursor": cursor})).json()
+
+    await client.post("/tasks/", json={"title": "맨 앞에 추가", "dept_id": dept_id})
+    again = (await client.get("/tasks/", params={"limit": 2, "cursor": cursor})).json()
+    assert [t["id"] for t in again] == [t["id"] for t in expected]
+
+
+async def test_bad_cursor_is_rejected(client):
+    r = await client.get("/tasks/", params={"limit": 2, "cursor": "@@@"})
+    assert r.status_code == 400
+
+
+async def test_report_modes(client, dept_id):
+    task = (await client.post("/tasks/", json={"title": "보고 모드", "dept_id": dept_id})).json()
+    for i in range(4):
+        await client.post(f"/tasks/{task['id']}/reports", json={"content": f"보고 {i} " + "가" * 100})
+
+    def mine(body):
+        return next(t for t in body if t["id"] == task["id"])
+
+    none = mine((await client.get("/tasks/", params={"include_reports": "none"})).json())
+    assert none["reports"] == [] and none["report_count"] is None
+
+    count = mine((await client.get("/tasks/", params={"include_reports": "count"})).json())
+    assert count["reports"] == [] and count["report_count"] == 4
+
+    latest = mine((await client.get("/tasks/", params={"include_reports": "latest",
+                                                      "latest_reports": 2})).json())
+    assert [r["content"][:4] for r in latest["reports"]] == ["보고 2", "보고 3"]
+
+    summary = mine((await client.get("/tasks/", params={"include_reports": "summary"})).json())
+    assert summary["reports"] == [] and summary["report_count"] == 4
+    assert summary["latest_report_preview"].startswith("보고 3") and summary["latest_report_preview"].endswith("…")
+
+    full = mine((await client.get("/tasks/")).json())
+    assert len(full["reports"]) == 4
+
+
+async def test_board_page_uses_keyset_index(assert_indexes_used):
+    await assert_indexes_used({
+        "ix_tasks_hidden_created":
+            "SELECT id FROM tasks WHERE is_hidden = 0 ORDER BY created_at DESC, id DESC LIMIT 20",
+    })
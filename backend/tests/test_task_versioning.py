@@ -0,0 +1,83 @@
+"""
+업무 / 보고 수정의 버전 (If-Match → 409, ETag) 과 변경 없는 수정
+"""
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def task(client, dept_id):
+    r = await client.post("/tasks/", json={"title": "버전", "dept_id": dept_id})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+async def test_patch_bumps_version_and_sets_etag(client, task):
+    r = await client.patch(f"/tasks/{task['id']}", json={"title": "버전 2"})
+    assert r.status_code == 200, r.text
+    assert r.json()["version"] == task["version"] + 1
+    assert r.headers["ETag"] == f'"{task["version"] + 1}"'
+
+
+async def test_stale_if_match_is_rejected(client, task):
+    await client.patch(f"/tasks/{task['id']}", json={"title": "먼저"})
+    r = await client.patch(f"/tasks/{task['id']}", json={"title": "나중"},
+                           headers={"If-Match": f'"{task["version"]}"'})
+    assert r.status_code == 409
+    r = await client.patch(f"/tasks/{task['id']}", json={"title": "나중"},
+                           headers={"If-Match": f'"{task["version"] + 1}"'})
+    assert r.status_code == 200, r.text
+
+
+async def test_unknown_task_is_404(client):
+    r = await client.patch("/tasks/no-such-task", json={"title": "x"})
+    assert r.status_code == 404
+
+
+async def test_noop_patch_keeps_version_and_updated_at(client, task):
+    for body in ({}, {"title": task["title"]}):
+        r = await client.patch(f"/tasks/{task['id']}", json=body)
+        assert r.status_code == 200, r.text
+        assert r.json()["version"] == task["version"]
+        assert r.json()["updated_at"] == task["updated_at"]
+
+
+async def test_noop_patch_still_checks_if_match(client, task):
+    await client.patch(f"/tasks/{task['id']}", json={"title": "바뀜"})
+    r = await client.patch(f"/tasks/{task['id']}", json={},
+                           headers={"If-Match": str(task["version"])})
+    assert r.status_code == 409
+
+
+async def test_hiding_twice_bumps_once(client, task):
+    done = (await client.patch(f"/tasks/{task['id']}/status", json={"status": "done"})).json()
+    first = (await client.patch(f"/tasks/{task['id']}/hide")).json()
+    second = (await client.patch(f"/tasks/{task['id']}/hide")).json()
+    assert first["version"] == done["version"] + 1
+    assert second["version"] == first["version"]
+    assert second["hidden_at"] == first["hidden_at"]
+
+
+async def test_hiding_unfinished_task_is_rejected(client, task):
+    r = await client.patch(f"/tasks/{task['id']}/hide")
+    assert r.status_code == 400
+
+
+async def test_title_change_reaches_search_index(client, task):
+    await client.patch(f"/tasks/{task['id']}", json={"title": "분기별 감사 일정"})
+    items = (await client.get("/search", params={"q": "감사"})).json()["items"]
+    assert [h["task_id"] for h in items] == [task["id"]]
+
+
+async def test_report_patch_uses_versions(client, task):
+    rep = (await client.post(f"/tasks/{task['id']}/reports", json={"content": "첫 보고"})).json()
+    r = await client.patch(f"/tasks/{task['id']}/reports/{rep['id']}", json={"content": "첫 보고"})
+    assert r.json()["version"] == rep["version"]
+
+    r = await client.patch(f"/tasks/{task['id']}/reports/{rep['id']}", json={"content": "고친 보고"},
+                           headers={"If-Match": str(rep["version"])})
+    assert r.status_code == 200 and r.json()["version"] == rep["version"] + 1
+    r = await client.patch(f"/tasks/{task['id']}/reports/{rep['id']}", json={"content": "또"},
+                           headers={"If-Match": str(rep["version"])})
+    assert r.status_code == 409
@@ -0,0 +1,88 @@
+"""
+일일 보관함 추세 - v009 가 기존 보관함에서 부서별 건수를 채우고, GET /daily-records/trends 가 그 값으로 계산
+"""
+import json
+from uuid import uuid4
+import pytest
+from sqlalchemy import select, text
+
+from app.database import engine
+from app.migrations import v009_daily_record_depts as v009
+from app.models import DailyRecord, DailyRecordDept
+
+pytestmark = pytest.mark.anyio
+
+# 날짜 → 부서별 업무 상태
+DAYS = {
+    "2026-03-01": {"d1": ["done", "inProgress", "notStarted"], "d2": ["notStarted"]},
+    "2026-03-02": {"d1": ["done", "done", "inProgress"],       "d2": ["done"]},
+    "2026-03-03": {"d1": ["done", "done", "done"],             "d2": ["done", "inProgress"]},
+}
+
+
+def _record(day: str, depts: dict) -> DailyRecord:
+    statuses = [s for ss in depts.values() for s in ss]
+    return DailyRecord(
+        id=str(uuid4()), date=day,
+        summary_json={"date": day, "departments": [
+            {"dept_id": d, "tasks": [{"status": s} for s in ss]} for d, ss in depts.items()
+        ]},
+        total_tasks=len(statuses), done_count=statuses.count("done"),
+        in_progress=statuses.count("inProgress"), not_started=statuses.count("notStarted"),
+        dept_count=len(depts),
+    )
+
+
+@pytest.fixture
+async def old_records(db):
+    """부서별 건수 표가 생기기 전에 저장된 보관함"""
+    db.add_all([_record(day, depts) for day, depts in DAYS.items()])
+    await db.commit()
+    async with engine.begin() as conn:
+        await v009.upgrade(conn)
+
+
+async def test_v009_backfills_dept_counts(db, old_records):
+    rows = (await db.execute(
+        select(DailyRecordDept).where(DailyRecordDept.date == "2026-03-01")
+        .order_by(DailyRecordDept.dept_id)
+    )).scalars().all()
+    assert [(r.dept_id, r.total, r.done, r.in_progress, r.not_started) for r in rows] == [
+        ("d1", 3, 1, 1, 1), ("d2", 1, 0, 0, 1),
+    ]
+
+
+async def test_v009_creates_table_and_reads_plain_json(db):
+    """v008 이전 평문 JSON 이 남아 있고 표도 아직 없는 DB (모델 / create_all 에 기대지 않음)"""
+    old = _record("2026-02-28", {"d1": ["done"]})
+    db.add(old)
+    await db.commit()
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP TABLE daily_record_depts"))
+        await conn.execute(text("UPDATE daily_records SET summary_json = :raw WHERE id = :id"),
+                           {"raw": json.dumps(old.summary_json), "id": old.id})
+        await v009.upgrade(conn)
+        rows = (await conn.execute(text(
+            "SELECT dept_id, total, done FROM daily_record_depts WHERE date = '2026-02-28'"
+        ))).all()
+    assert [tuple(r) for r in rows] == [("d1", 1, 1)]
+
+
+async def test_trends_from_backfilled_counts(client, old_records):
+    r = await client.get("/daily-records/trends",
+                         params={"from": "2026-03-01", "to": "2026-03-03", "window": 2})
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["dates"] == list(DAYS)
+    assert body["done"] == [1, 3, 4]
+    assert body["throughput"] == [None, 2, 1]
+    assert body["backlog_delta"] == [None, -2, 0]
+    assert body["completion_rate"] == [0.25, 0.75, 0.8]
+    assert body["rolling_completion_rate"] == [0.25, 0.5, 0.7778]
+    d2 = next(d for d in body["departments"] if d["dept_id"] == "d2")
+    assert d2["done"] == [0, 1, 1] and d2["throughput"] == [None, 1, 0]
+
+
+async def test_trends_rejects_reversed_range(client):
+    r = await client.get("/daily-records/trends", params={"from": "2026-03-03", "to": "2026-03-01"})
+    assert r.status_code == 400